@@ -0,0 +1,268 @@
+# O que faz?
+# Mede o desempenho de cada etapa do gerador e detecta regressões.
+# 1 - run: executa os benchmarks e salva os tempos em um JSON (baseline)
+#   - Etapas isoladas: _normalize_text, ConfigGenerator, _apply_substitutions,
+#     _mix_with_salt, _add_special_chars e PasswordStrength.
+#   - Geração completa para entradas curtas, médias e longas (com Unicode).
+# 2 - compare: compara um baseline com uma nova execução (ou outro JSON)
+#   - Usa o teste de Mann-Whitney (sem dependências externas) sobre as amostras.
+#   - Só aponta regressão se a diferença for estatisticamente significativa
+#     E maior que a tolerância relativa (padrão 5%).
+#
+# Uso:
+#   python benchmark.py run --output baseline.json
+#   python benchmark.py compare baseline.json
+#   python benchmark.py compare baseline.json atual.json
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from modules.config_generator import ConfigGenerator
+from modules.password_generator import PasswordGenerator
+from modules.password_strenght import PasswordStrength
+
+
+# Entradas realistas de tamanhos diferentes
+INPUTS = {
+    "curta": ("Minha senha secreta", "Chave de segurança", "Salt seguro"),
+    "media": ("Uma frase base bem mais longa, com acentuação e pontuação! " * 4,
+              "Frase chave também mais comprida para a tabela",
+              "salt-do-site-exemplo-2024"),
+    "longa_unicode": ("Ação, coração, órgão — 日本語のテキスト, Ærø straße, ñandú. " * 40,
+                      "Çhave ÚNICA com acentos e símbolos ☃ " * 4,
+                      "sãlt ünïcode " * 8),
+}
+
+
+def _generator(size: str, extended_chars: bool = True) -> PasswordGenerator:
+    """Cria um PasswordGenerator para a entrada do tamanho informado."""
+    base_phrase, key_phrase, salt = INPUTS[size]
+    config = ConfigGenerator(key_phrase)
+    return PasswordGenerator(base_phrase, config.get_subst_dict(), salt, 32, extended_chars)
+
+
+def _end_to_end(size: str):
+    """Retorna uma função que executa a geração completa para a entrada informada."""
+    base_phrase, key_phrase, salt = INPUTS[size]
+
+    def run():
+        config = ConfigGenerator(key_phrase)
+        password = PasswordGenerator(base_phrase, config.get_subst_dict(), salt, 32, True).generate_password()
+        PasswordStrength(password).get_password_analysis()
+
+    return run
+
+
+def build_benchmarks() -> dict:
+    """Monta o dicionário nome → função sem argumentos a ser medida."""
+    benchmarks = {}
+
+    for size, (base_phrase, key_phrase, salt) in INPUTS.items():
+        generator = _generator(size)
+        transformed = generator._apply_substitutions(generator.base_phrase)
+        mixed = generator._mix_with_salt(transformed)
+        password = generator._add_special_chars(mixed)
+
+        benchmarks[f"normalize_text/{size}"] = lambda g=generator, t=base_phrase: g._normalize_text(t)
+        benchmarks[f"config_generator/{size}"] = lambda k=key_phrase: ConfigGenerator(k)
+        benchmarks[f"apply_substitutions/{size}"] = lambda g=generator: g._apply_substitutions(g.base_phrase)
+        benchmarks[f"mix_with_salt/{size}"] = lambda g=generator, t=transformed: g._mix_with_salt(t)
+        benchmarks[f"add_special_chars/{size}"] = lambda g=generator, t=mixed: g._add_special_chars(t)
+        benchmarks[f"password_strength/{size}"] = lambda p=password: PasswordStrength(p).get_password_analysis()
+        benchmarks[f"end_to_end/{size}"] = _end_to_end(size)
+
+    return benchmarks
+
+
+def measure(func, repeat: int, min_time: float) -> dict:
+    """
+    Mede uma função: calibra o número de chamadas por amostra para durar pelo menos
+    min_time segundos e coleta `repeat` amostras (tempo por chamada, em segundos).
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "samples": samples,
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def run_benchmarks(repeat: int = 15, min_time: float = 0.02, name_filter: str = None, verbose: bool = True) -> dict:
+    """Executa todos os benchmarks (ou os que contêm name_filter) e retorna o resultado."""
+    results = {}
+    for name, func in build_benchmarks().items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(func, repeat, min_time)
+        if verbose:
+            print(f"{name:<36} {results[name]['median'] * 1e6:>12.2f} µs", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+
+def mann_whitney_p(a: list, b: list) -> float:
+    """
+    Teste de Mann-Whitney U bilateral (aproximação normal com correção de empates).
+    Retorna o p-valor da hipótese de que as duas amostras têm a mesma distribuição.
+    """
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1  # Posto médio dos empates
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    rank_sum_a = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    n = n1 + n2
+    var_u = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return 1.0
+
+    z = (abs(u - mean_u) - 0.5) / math.sqrt(var_u)  # Correção de continuidade
+    return math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def compare(baseline: dict, current: dict, alpha: float = 0.01, threshold: float = 0.05) -> list:
+    """
+    Compara duas execuções. Retorna uma lista de linhas com o status de cada benchmark:
+    "REGRESSÃO", "melhora", "ok" ou "novo"/"removido".
+    """
+    rows = []
+    base_results = baseline["results"]
+    current_results = current["results"]
+
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in current_results:
+            rows.append({"name": name, "status": "removido"})
+            continue
+        if name not in base_results:
+            rows.append({"name": name, "status": "novo", "current": current_results[name]["median"]})
+            continue
+
+        base = base_results[name]
+        cur = current_results[name]
+        change = cur["median"] / base["median"] - 1 if base["median"] else 0.0
+        p_value = mann_whitney_p(base["samples"], cur["samples"])
+
+        status = "ok"
+        if p_value < alpha and abs(change) > threshold:
+            status = "REGRESSÃO" if change > 0 else "melhora"
+
+        rows.append({
+            "name": name,
+            "status": status,
+            "baseline": base["median"],
+            "current": cur["median"],
+            "change": change,
+            "p_value": p_value
+        })
+
+    return rows
+
+
+def print_comparison(rows: list):
+    """Exibe a tabela de comparação."""
+    print(f"{'benchmark':<36} {'baseline':>12} {'atual':>12} {'variação':>9} {'p':>8}  status")
+    for row in rows:
+        if "baseline" not in row:
+            print(f"{row['name']:<36} {'':>12} {'':>12} {'':>9} {'':>8}  {row['status']}")
+            continue
+        print(f"{row['name']:<36} {row['baseline'] * 1e6:>10.2f}µs {row['current'] * 1e6:>10.2f}µs "
+              f"{row['change']:>+8.1%} {row['p_value']:>8.4f}  {row['status']}")
+
+
+def _load(path: str) -> dict:
+    """Carrega um arquivo de resultados de benchmark."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    """Processa os argumentos e executa o subcomando escolhido."""
+    parser = argparse.ArgumentParser(description="Benchmarks do Gerador de Senhas Seguras")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Executa os benchmarks e salva um baseline JSON")
+    run_parser.add_argument("--output", default="baseline.json", help="Arquivo JSON de saída (padrão: baseline.json)")
+    run_parser.add_argument("--repeat", type=int, default=15, help="Amostras por benchmark (padrão: 15)")
+    run_parser.add_argument("--min_time", type=float, default=0.02, help="Duração mínima de cada amostra em segundos (padrão: 0.02)")
+    run_parser.add_argument("--filter", help="Executa apenas os benchmarks cujo nome contém este texto")
+
+    compare_parser = subparsers.add_parser("compare", help="Compara um baseline com a execução atual")
+    compare_parser.add_argument("baseline", help="Arquivo JSON do baseline")
+    compare_parser.add_argument("current", nargs="?", help="Arquivo JSON a comparar (padrão: executa os benchmarks agora)")
+    compare_parser.add_argument("--repeat", type=int, default=15, help="Amostras por benchmark na execução atual (padrão: 15)")
+    compare_parser.add_argument("--min_time", type=float, default=0.02, help="Duração mínima de cada amostra em segundos (padrão: 0.02)")
+    compare_parser.add_argument("--filter", help="Compara apenas os benchmarks cujo nome contém este texto")
+    compare_parser.add_argument("--alpha", type=float, default=0.01, help="Nível de significância (padrão: 0.01)")
+    compare_parser.add_argument("--threshold", type=float, default=0.05, help="Variação relativa mínima para apontar regressão (padrão: 0.05)")
+
+    args = parser.parse_args()
+
+    if args.repeat < 2:
+        parser.error("--repeat deve ser pelo menos 2")
+
+    if args.command == "run":
+        result = run_benchmarks(args.repeat, args.min_time, args.filter)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"Resultados salvos em: {args.output}", file=sys.stderr)
+        return
+
+    baseline = _load(args.baseline)
+    if args.current:
+        current = _load(args.current)
+    else:
+        current = run_benchmarks(args.repeat, args.min_time, args.filter)
+
+    if args.filter:
+        baseline["results"] = {k: v for k, v in baseline["results"].items() if args.filter in k}
+        current["results"] = {k: v for k, v in current["results"].items() if args.filter in k}
+
+    rows = compare(baseline, current, args.alpha, args.threshold)
+    print_comparison(rows)
+
+    if any(row["status"] == "REGRESSÃO" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
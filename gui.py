@@ -6,78 +6,142 @@
 - Uma opção de ativar caracteres especiais.
 - Um botão para gerar a senha.
 - Um campo onde a senha gerada será exibida.
+- Uma prévia ao vivo: a senha é recalculada automaticamente enquanto os campos mudam.
+
+    Como a interface não trava?
+
+- A geração roda em uma thread de trabalho; a janela só recebe o resultado.
+- Os resultados voltam para a thread do Tk por uma fila lida com root.after.
+- A prévia espera o usuário parar de digitar (debounce) antes de recalcular.
+- Cada etapa só é refeita se as entradas dela mudaram: mudar o comprimento ou
+  a opção de caracteres especiais não normaliza nem substitui a frase base de novo.
+- As etapas e a thread de trabalho ficam em modules/live_preview.py (sem Tk);
+  este arquivo é só a janela.
 
 '''
 
+import queue
 import tkinter as tk
 from tkinter import messagebox
-from modules.config_generator import ConfigGenerator
-from modules.password_generator import PasswordGenerator
-from modules.password_strenght import PasswordStrength
+from modules.live_preview import DerivationWorker
 
-def gerar_senha():
-    """Função chamada ao clicar no botão 'Gerar Senha'."""
-    base_phrase = entry_base.get().strip()
-    key_phrase = entry_key.get().strip()
-    salt = entry_salt.get().strip()
-    pwd_length = pwd_length_var.get()
+# Tempo (ms) sem alterações antes de recalcular a prévia
+DEBOUNCE_MS = 300
+# Intervalo (ms) para verificar resultados vindos da thread de trabalho
+POLL_MS = 50
+
+
+worker = DerivationWorker()
+latest_request = 0
+pending_preview = None
+
+
+def ler_campos():
+    """Lê e valida os campos. Retorna a tupla de parâmetros ou levanta ValueError."""
+    base_phrase = base_var.get().strip()
+    key_phrase = key_var.get().strip()
+    salt = salt_var.get().strip()
+    try:
+        pwd_length = pwd_length_var.get()
+    except tk.TclError:
+        raise ValueError("O comprimento da senha deve ser um número.")
     extended_chars = extended_chars_var.get()
 
     # Validação básica
     if not base_phrase or not key_phrase:
-        messagebox.showerror("Erro", "Frase Base e Frase Chave são obrigatórias!")
-        return
-    
+        raise ValueError("Frase Base e Frase Chave são obrigatórias!")
+
     if pwd_length < 8:
-        messagebox.showerror("Erro", "O comprimento da senha deve ser pelo menos 8 caracteres.")
+        raise ValueError("O comprimento da senha deve ser pelo menos 8 caracteres.")
+
+    return base_phrase, key_phrase, salt, pwd_length, extended_chars
+
+
+def solicitar_geracao(params: tuple):
+    """Envia os parâmetros para a thread de trabalho e marca o pedido como o mais recente."""
+    global latest_request
+    latest_request += 1
+    lbl_status.config(text="Gerando...")
+    worker.submit(latest_request, params)
+
+
+def gerar_senha():
+    """Função chamada ao clicar no botão 'Gerar Senha'."""
+    try:
+        params = ler_campos()
+    except ValueError as ve:
+        messagebox.showerror("Erro", str(ve))
+        return
+    solicitar_geracao(params)
+
+
+def atualizar_previa():
+    """Recalcula a prévia depois que o usuário parou de editar os campos."""
+    global pending_preview
+    pending_preview = None
+    try:
+        params = ler_campos()
+    except ValueError as ve:
+        lbl_status.config(text=str(ve))
         return
+    solicitar_geracao(params)
+
 
-    # Geração do dicionário de substituição
-    config = ConfigGenerator(key_phrase)
-    subst_dict = config.get_subst_dict()
+def agendar_previa(*_):
+    """Chamada a cada alteração de campo: adia a prévia até a digitação parar (debounce)."""
+    global pending_preview
+    if pending_preview is not None:
+        root.after_cancel(pending_preview)
+    pending_preview = root.after(DEBOUNCE_MS, atualizar_previa)
 
-    # Geração da senha
-    password_generator = PasswordGenerator(
-        base_phrase=base_phrase,
-        subst_dict=subst_dict,
-        salt=salt,
-        pwd_length=pwd_length,
-        extended_chars=extended_chars
-    )
 
-    generated_password = password_generator.generate_password()
+def verificar_resultados():
+    """Lê os resultados da thread de trabalho (na thread do Tk) e atualiza a interface."""
+    try:
+        while True:
+            request_id, analysis, error = worker.results.get_nowait()
+            if request_id != latest_request:
+                continue  # Resultado de um pedido antigo: ignora
 
-    # Análise da força da senha
-    strength_checker = PasswordStrength(generated_password)
-    analysis = strength_checker.get_password_analysis()
+            if error is not None:
+                lbl_status.config(text=f"Erro ao gerar a senha: {error}")
+                continue
 
-    # Exibir a senha e detalhes na interface
-    entry_password.config(state="normal")
-    entry_password.delete(0, tk.END)
-    entry_password.insert(0, generated_password)
-    entry_password.config(state="readonly")
+            # Exibir a senha e detalhes na interface
+            entry_password.config(state="normal")
+            entry_password.delete(0, tk.END)
+            entry_password.insert(0, analysis["password"])
+            entry_password.config(state="readonly")
+
+            lbl_strength.config(text=f"Força: {analysis['score']} ({analysis['security_level']})")
+            lbl_crack_time.config(text=f"Tempo estimado para quebra: {analysis['crack_time']}")
+            lbl_status.config(text="")
+    except queue.Empty:
+        pass
+    root.after(POLL_MS, verificar_resultados)
 
-    lbl_strength.config(text=f"Força: {analysis['score']} ({analysis['security_level']})")
-    lbl_crack_time.config(text=f"Tempo estimado para quebra: {analysis['crack_time']}")
 
 # Criando a janela principal
 root = tk.Tk()
 root.title("Gerador de Senhas Seguras")
-root.geometry("500x400")
+root.geometry("500x430")
 
 # Frase Base
 tk.Label(root, text="Frase Base:").pack(pady=5)
-entry_base = tk.Entry(root, width=50)
+base_var = tk.StringVar()
+entry_base = tk.Entry(root, width=50, textvariable=base_var)
 entry_base.pack()
 
 # Frase Chave
 tk.Label(root, text="Frase Chave:").pack(pady=5)
-entry_key = tk.Entry(root, width=50)
+key_var = tk.StringVar()
+entry_key = tk.Entry(root, width=50, textvariable=key_var)
 entry_key.pack()
 
 # Salt (opcional)
 tk.Label(root, text="Salt (opcional):").pack(pady=5)
-entry_salt = tk.Entry(root, width=50)
+salt_var = tk.StringVar()
+entry_salt = tk.Entry(root, width=50, textvariable=salt_var)
 entry_salt.pack()
 
 # Comprimento da Senha
@@ -107,5 +171,14 @@ lbl_strength.pack(pady=5)
 lbl_crack_time = tk.Label(root, text="")
 lbl_crack_time.pack(pady=5)
 
+# Label de status da prévia (gerando, erros de validação)
+lbl_status = tk.Label(root, text="", fg="gray")
+lbl_status.pack(pady=5)
+
+# Prévia ao vivo: qualquer alteração agenda um recálculo
+for variable in (base_var, key_var, salt_var, pwd_length_var, extended_chars_var):
+    variable.trace_add("write", agendar_previa)
+
 # Rodar a interface gráfica
+root.after(POLL_MS, verificar_resultados)
 root.mainloop()
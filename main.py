@@ -13,34 +13,306 @@
 # 7 - Usa PasswordStrength para calcular o nível de segurança.
 # 8 - Exibe a senha gerada e a análise
 # 9 - Exibe a senha, força e tempo estimado para quebra.
+# 10 - Modo em lote (--batch)
+#   - Lê vários registros de um arquivo JSONL/CSV (ou stdin) e escreve um JSONL de resultados.
+# 11 - Rotação incremental (--rotate)
+#   - Como o lote, mas só gera as contas cujos dados mudaram desde a última rotação (--rotation_index).
+# 12 - Arquivo de perfis (--profile_store)
+#   - Tabelas de substituição pré-calculadas, lidas via mmap em vez de recalculadas a cada processo.
+# 13 - Política de senha do site (--policy / --policy_file)
+#   - A senha gerada cumpre a política (classes, símbolos, comprimento) em uma única passada.
+# 14 - Auditoria de colisões (--audit_collisions)
+#   - Gera as senhas de um inventário e lista as contas que receberiam a mesma senha.
 
 import argparse
+import json
 import sys
-from modules.config_generator import ConfigGenerator
+from modules import instrumentation
+from modules.batch_processor import BATCH_FORMATS, BatchProcessor, detect_format
+from modules.breach_check import build_bloom_filter, open_corpus
+from modules.collision_audit import DEFAULT_MEMORY_MB, CollisionAuditor
+from modules.config_generator import ConfigCache, ConfigGenerator
+from modules.dense_output import OUTPUT_MODES, validate_alphabet
+from modules.derivation_server import run_server
+from modules.key_stretching import KDF_ALGORITHMS, calibrate, load_params, save_params
+from modules.parallel_engine import ParallelDeriver, open_strength_options
+from modules.password_audit import PasswordAudit
 from modules.password_generator import PasswordGenerator
-from modules.password_strenght import PasswordStrength
+from modules.password_policy import SITE_POLICIES, get_policy, load_policies
+from modules.password_strenght import ATTACKER_PROFILES, DEFAULT_ATTACKER_PROFILE, PasswordStrength
+from modules.pattern_analyzer import open_analyzer
+from modules.profile_store import build_profile_store_from_file, open_store
+from modules.rotation_index import IncrementalRotation, RotationIndex
+from modules.validators import validar_entrada
+from modules.word_index import build_word_index_from_file
 
 
-def validar_entrada(base_phrase, key_phrase, salt, pwd_length):
-    """Verifica se os parâmetros fornecidos são válidos."""
-    
-    if not base_phrase.strip():
-        raise ValueError("A frase base não pode estar vazia.")
+def interpretar_variantes(spec: str) -> list:
+    """
+    Converte a especificação de variantes em uma lista de (comprimento, caracteres especiais).
+    Exemplo: "12,16:ext,20" → [(12, False), (16, True), (20, False)]
+    """
+    variants = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        length_text, _, flag = item.partition(":")
+        try:
+            pwd_length = int(length_text)
+        except ValueError:
+            raise ValueError(f"Variante inválida: '{item}'. Use o formato COMPRIMENTO[:ext].")
+        if flag not in ("", "ext"):
+            raise ValueError(f"Variante inválida: '{item}'. Use o formato COMPRIMENTO[:ext].")
+        if pwd_length < 8:
+            raise ValueError("O comprimento da senha deve ser pelo menos 8 caracteres.")
+        variants.append((pwd_length, flag == "ext"))
 
-    if not key_phrase.strip():
-        raise ValueError("A frase chave não pode estar vazia.")
+    if not variants:
+        raise ValueError("Informe pelo menos uma variante em --variants.")
+    return variants
 
-    if pwd_length < 8:
-        raise ValueError("O comprimento da senha deve ser pelo menos 8 caracteres.")
 
-    if len(base_phrase) < 4:
-        raise ValueError("A frase base deve ter pelo menos 4 caracteres.")
+def calibrar_kdf(args):
+    """Mede esta máquina, escolhe o custo do KDF para a latência alvo e salva os parâmetros."""
+    if not args.kdf_config:
+        raise ValueError("Informe em --kdf_config o arquivo onde os parâmetros calibrados serão salvos.")
 
-    if len(key_phrase) < 4:
-        raise ValueError("A frase chave deve ter pelo menos 4 caracteres.")
+    params = calibrate(args.calibrate_kdf, args.target_ms)
+    save_params(args.kdf_config, params)
 
-    if len(salt) < 2:
-        raise ValueError("O salt deve ter pelo menos 2 caracteres.")
+    print("\n=== Calibração do KDF ===")
+    for key, value in params.items():
+        print(f"{key}: {value}")
+    print(f"Parâmetros salvos em: {args.kdf_config}")
+    print("=========================\n")
+
+
+def abrir_analisador(args):
+    """Retorna o detector de padrões pedido na linha de comando (ou None)."""
+    if args.pattern_check or args.dictionary_index:
+        return open_analyzer(args.dictionary_index)
+    return None
+
+
+def abrir_vazamentos(args):
+    """Retorna o arquivo de senhas vazadas pedido na linha de comando (ou None)."""
+    if args.breach_bloom and not args.breach_corpus:
+        raise ValueError("--breach_bloom precisa de --breach_corpus.")
+    if args.breach_corpus:
+        return open_corpus(args.breach_corpus, args.breach_bloom)
+    return None
+
+
+def compilar_bloom(args):
+    """Compila o filtro de Bloom de --breach_corpus no arquivo --breach_bloom."""
+    if not args.breach_corpus or not args.breach_bloom:
+        raise ValueError("Informe --breach_corpus (arquivo de hashes) e --breach_bloom (filtro a ser salvo).")
+    params = build_bloom_filter(args.breach_corpus, args.breach_bloom)
+    print(f"Filtro de Bloom com {params['bits']} bits e {params['hashes']} hashes "
+          f"({params['entries']} senhas) salvo em: {args.breach_bloom}")
+
+
+def compilar_dicionario(args):
+    """Compila a lista de palavras de --build_dictionary_index no índice --dictionary_index."""
+    if not args.dictionary_index:
+        raise ValueError("Informe em --dictionary_index o arquivo onde o índice será salvo.")
+    count = build_word_index_from_file(args.build_dictionary_index, args.dictionary_index)
+    print(f"Índice com {count} palavras salvo em: {args.dictionary_index}")
+
+
+def compilar_perfis(args):
+    """Grava as frases chave de --build_profile_store (uma por linha) no arquivo --profile_store."""
+    if not args.profile_store:
+        raise ValueError("Informe em --profile_store o arquivo onde os perfis serão salvos.")
+    count = build_profile_store_from_file(args.build_profile_store, args.profile_store)
+    print(f"Arquivo com {count} perfis salvo em: {args.profile_store}")
+
+
+def carregar_configuracao(args) -> ConfigGenerator:
+    """Retorna a configuração da frase chave, lida do arquivo de perfis quando possível."""
+    if args.profile_store:
+        config = open_store(args.profile_store).get(args.key_phrase)
+        if config is not None:
+            return config
+    return ConfigGenerator(args.key_phrase)
+
+
+def iniciar_estatisticas(args):
+    """Liga a instrumentação por etapa se --stats ou --stats_json foi pedido. Retorna o sink (ou None)."""
+    if not (args.stats or args.stats_json):
+        return None
+    sink = instrumentation.HistogramSink()
+    instrumentation.install(sink)
+    return sink
+
+
+def exibir_estatisticas(args, sink):
+    """Exibe (stderr) e/ou salva as latências por etapa acumuladas durante a execução."""
+    if sink is None:
+        return
+    instrumentation.uninstall()
+    if args.stats:
+        print("\n=== Latência por etapa ===", file=sys.stderr)
+        print(sink.format_table(), file=sys.stderr)
+        print("==========================\n", file=sys.stderr)
+    if args.stats_json:
+        sink.dump(args.stats_json)
+
+
+def executar_auditoria(args):
+    """Audita um arquivo grande de senhas (uma por linha) e exibe os histogramas de força."""
+    audit = PasswordAudit(args.audit, checkpoint_path=args.audit_checkpoint,
+                          attacker_profile=args.attacker_profile, pattern_analyzer=abrir_analisador(args),
+                          breach_corpus=abrir_vazamentos(args))
+    resumed = audit.load_checkpoint()
+    start_offset = args.audit_offset if args.audit_offset is not None else audit.offset
+
+    report_stream = None
+    if args.audit_report:
+        if resumed:
+            # Descarta as linhas do relatório escritas depois do último checkpoint
+            report_stream = open(args.audit_report, "a", encoding="utf-8")
+            report_stream.truncate(audit.report_offset)
+        else:
+            report_stream = open(args.audit_report, "w", encoding="utf-8")
+    audit.report_stream = report_stream
+
+    sink = iniciar_estatisticas(args)
+    try:
+        summary = audit.run(start_offset)
+    finally:
+        if report_stream is not None:
+            report_stream.close()
+    exibir_estatisticas(args, sink)
+
+    if resumed:
+        print(f"Auditoria retomada a partir do byte {start_offset}.", file=sys.stderr)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+def carregar_politicas(args) -> dict:
+    """Retorna a biblioteca de políticas: SITE_POLICIES mais as de --policy_file, se informado."""
+    return load_policies(args.policy_file) if args.policy_file else SITE_POLICIES
+
+
+def opcoes_analise(args) -> dict:
+    """Opções da análise de força da linha de comando, em caminhos (ver open_strength_options)."""
+    if args.breach_bloom and not args.breach_corpus:
+        raise ValueError("--breach_bloom precisa de --breach_corpus.")
+    return {
+        "attacker_profile": args.attacker_profile,
+        "pattern_check": args.pattern_check,
+        "dictionary_index": args.dictionary_index,
+        "breach_corpus": args.breach_corpus,
+        "breach_bloom": args.breach_bloom
+    }
+
+
+def criar_processador(args, opcoes_gerador, metrics=None):
+    """Cria o processador do lote: um único processo ou um pool de processos (--workers)."""
+    if args.workers < 0:
+        raise ValueError("O número de processos não pode ser negativo.")
+    policies = carregar_politicas(args)
+    if args.workers == 1:
+        store = open_store(args.profile_store) if args.profile_store else None
+        return BatchProcessor(ConfigCache(store=store), generator_options=opcoes_gerador, policies=policies,
+                              metrics=metrics, strength_options=open_strength_options(opcoes_analise(args)))
+    return ParallelDeriver(workers=args.workers or None, chunk_size=args.chunk_size,
+                           generator_options=opcoes_gerador, profile_store=args.profile_store,
+                           policies=policies, metrics=metrics, strength_options=opcoes_analise(args))
+
+
+def executar_rotacao(args, opcoes_gerador):
+    """Rotação incremental: gera só as contas do inventário que mudaram e escreve a diferença em JSONL."""
+    if not args.rotation_index:
+        raise ValueError("Informe em --rotation_index o arquivo do índice da rotação.")
+    fmt = args.batch_format or detect_format(args.rotate)
+    index = RotationIndex(args.rotation_index, args.rotation_key)
+
+    input_stream = open(args.rotate, "r", encoding="utf-8", newline="")
+    if args.output == "-":
+        output_stream = sys.stdout
+    else:
+        output_stream = open(args.output, "w", encoding="utf-8")
+
+    sink = iniciar_estatisticas(args)
+    try:
+        rotation = IncrementalRotation(index, criar_processador(args, opcoes_gerador), args.chunk_size)
+        summary = rotation.run(input_stream, output_stream, fmt)
+    finally:
+        input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    exibir_estatisticas(args, sink)
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+    if summary["errors"]:
+        sys.exit(1)
+
+
+def auditar_colisoes(args, opcoes_gerador):
+    """Gera as senhas de um inventário e escreve em JSONL os grupos de contas com a mesma senha."""
+    fmt = args.batch_format or detect_format(args.audit_collisions)
+
+    if args.audit_collisions == "-":
+        input_stream = sys.stdin
+    else:
+        input_stream = open(args.audit_collisions, "r", encoding="utf-8", newline="")
+
+    if args.output == "-":
+        output_stream = sys.stdout
+    else:
+        output_stream = open(args.output, "w", encoding="utf-8")
+
+    sink = iniciar_estatisticas(args)
+    try:
+        # Só a senha de cada registro interessa: a análise de força é pulada (metrics=())
+        auditor = CollisionAuditor(criar_processador(args, opcoes_gerador, metrics=()),
+                                   args.collision_memory_mb, args.collision_tmp_dir)
+        summary = auditor.run(input_stream, output_stream, fmt)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    exibir_estatisticas(args, sink)
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+    if summary["collision_groups"] or summary["errors"]:
+        sys.exit(1)
+
+
+def executar_lote(args, opcoes_gerador):
+    """Executa o modo em lote: lê registros de um arquivo (ou stdin) e escreve os resultados em JSONL."""
+    fmt = args.batch_format or detect_format(args.batch)
+
+    if args.batch == "-":
+        input_stream = sys.stdin
+    else:
+        input_stream = open(args.batch, "r", encoding="utf-8", newline="")
+
+    if args.output == "-":
+        output_stream = sys.stdout
+    else:
+        output_stream = open(args.output, "w", encoding="utf-8")
+
+    sink = iniciar_estatisticas(args)
+    try:
+        processor = criar_processador(args, opcoes_gerador)
+        processed, errors = processor.run(input_stream, output_stream, fmt)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    exibir_estatisticas(args, sink)
+
+    cache_info = processor.cache_info()
+    print(f"Lote concluído: {processed} senhas geradas, {errors} erros.", file=sys.stderr)
+    print(f"Cache de configurações: {cache_info['hits']} acertos, {cache_info['misses']} faltas.", file=sys.stderr)
+    if errors:
+        sys.exit(1)
 
 
 def main():
@@ -57,17 +329,162 @@ def main():
     --salt (opcional) → String extra para embaralhar a senha.
     --pwd_length (opcional, padrão 16) → Tamanho da senha.
     --extended_chars (flag) → Se ativado, adiciona caracteres especiais.
+    --batch (opcional) → Arquivo JSONL/CSV (ou "-" para stdin) com vários registros.
+    --batch_format (opcional) → Formato do lote (jsonl ou csv). Deduzido pela extensão.
+    --output (opcional, padrão stdout) → Arquivo JSONL de saída do lote.
+    --workers (opcional, padrão 1) → Processos usados no lote (0 = um por núcleo).
+    --chunk_size (opcional, padrão 1000) → Registros enviados a cada processo por vez.
+    --kdf_config (opcional) → Arquivo JSON com os parâmetros de key stretching (PBKDF2/scrypt).
+    --calibrate_kdf (opcional) → Calibra o KDF para esta máquina e salva em --kdf_config.
+    --target_ms (opcional, padrão 100) → Latência alvo da calibração, em milissegundos.
+    --audit (opcional) → Audita um arquivo de senhas (uma por linha) e exibe histogramas de força.
+    --audit_report (opcional) → Relatório JSONL por linha da auditoria.
+    --audit_checkpoint (opcional) → Checkpoint para retomar uma auditoria interrompida.
+    --audit_offset (opcional) → Byte do arquivo a partir do qual a auditoria começa.
+    --serve (flag) → Inicia o serviço local (HTTP) de geração e análise de senhas.
+    --host / --port (opcional) → Endereço do serviço (padrão 127.0.0.1:8765).
+    --unix_socket (opcional) → Atende em um socket Unix em vez de TCP.
+    --serve_batch_size / --serve_max_wait_ms (opcional) → Agrupamento de requisições do serviço.
+    --variants (opcional) → Gera várias variantes de uma vez, ex.: "12,16:ext,20:ext".
+    --output_mode (opcional, padrão hex) → "dense" usa SHAKE-256 e um alfabeto grande, sem limite de comprimento.
+    --alphabet (opcional) → Alfabeto do modo dense ("alnum", "full" ou os próprios caracteres).
+    --rotate (opcional) → Inventário JSONL/CSV (campo "id" por conta) para a rotação incremental.
+    --rotation_index (opcional) → Índice de impressões digitais usado pela rotação incremental.
+    --rotation_key (opcional) → Arquivo da chave do índice de rotação (padrão: <índice>.key).
+    --profile_store (opcional) → Arquivo de perfis (tabelas de substituição pré-calculadas).
+    --build_profile_store (opcional) → Grava as frases chave de um arquivo (uma por linha) em --profile_store.
+    --policy (opcional) → Política de senha do site (ex.: strict, alnum, web_max20, banking).
+    --policy_file (opcional) → Arquivo JSON com políticas próprias ({"nome": {...}}).
+    --audit_collisions (opcional) → Inventário JSONL/CSV em que se procuram contas com a mesma senha.
+    --collision_memory_mb / --collision_tmp_dir (opcional) → Memória da auditoria de colisões e
+      diretório dos arquivos temporários quando ela passa para a ordenação externa.
     '''
-    parser.add_argument("--base_phrase", required=True, help="Frase base para gerar a senha")
-    parser.add_argument("--key_phrase", required=True, help="Frase chave usada para criar as regras de substituição")
+    parser.add_argument("--base_phrase", help="Frase base para gerar a senha")
+    parser.add_argument("--key_phrase", help="Frase chave usada para criar as regras de substituição")
     parser.add_argument("--salt", default="", help="Salt opcional para aumentar a entropia da senha")
     parser.add_argument("--pwd_length", type=int, default=16, help="Comprimento da senha gerada (padrão: 16 caracteres)")
     parser.add_argument("--extended_chars", action="store_true", help="Usar caracteres especiais na senha")
+    parser.add_argument("--batch", metavar="ARQUIVO", help="Gera senhas em lote a partir de um arquivo JSONL/CSV (use '-' para stdin)")
+    parser.add_argument("--batch_format", choices=BATCH_FORMATS, help="Formato do arquivo de lote (padrão: deduzido pela extensão)")
+    parser.add_argument("--output", default="-", metavar="ARQUIVO", help="Arquivo JSONL de saída do lote (padrão: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="Processos usados no modo em lote (padrão: 1; 0 = um por núcleo)")
+    parser.add_argument("--chunk_size", type=int, default=1000, help="Registros por tarefa no modo paralelo (padrão: 1000)")
+    parser.add_argument("--kdf_config", metavar="ARQUIVO", help="Arquivo JSON com os parâmetros de key stretching (PBKDF2/scrypt)")
+    parser.add_argument("--calibrate_kdf", choices=KDF_ALGORITHMS, help="Calibra o KDF escolhido para esta máquina e salva em --kdf_config")
+    parser.add_argument("--target_ms", type=float, default=100.0, help="Latência alvo por derivação na calibração (padrão: 100 ms)")
+    parser.add_argument("--audit", metavar="ARQUIVO", help="Audita um arquivo de senhas (uma por linha) sem carregá-lo na memória")
+    parser.add_argument("--audit_report", metavar="ARQUIVO", help="Escreve um relatório JSONL por linha da auditoria")
+    parser.add_argument("--audit_checkpoint", metavar="ARQUIVO", help="Checkpoint usado para retomar uma auditoria interrompida")
+    parser.add_argument("--audit_offset", type=int, metavar="BYTES", help="Offset (em bytes) a partir do qual a auditoria começa")
+    parser.add_argument("--serve", action="store_true", help="Inicia o serviço local de geração e análise de senhas")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço do serviço (padrão: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Porta do serviço (padrão: 8765)")
+    parser.add_argument("--unix_socket", metavar="CAMINHO", help="Atende em um socket Unix em vez de TCP")
+    parser.add_argument("--serve_batch_size", type=int, default=64, help="Máximo de requisições por lote no serviço (padrão: 64)")
+    parser.add_argument("--serve_max_wait_ms", type=float, default=2.0, help="Espera máxima para completar um lote quando já há lotes em andamento, em ms (padrão: 2)")
+    parser.add_argument("--variants", metavar="LISTA", help="Gera várias variantes de uma vez, ex.: 12,16:ext,20 (COMPRIMENTO[:ext])")
+    parser.add_argument("--output_mode", choices=OUTPUT_MODES, default="hex", help="Modo de saída: hex (padrão, legado) ou dense (SHAKE-256, alfabeto grande)")
+    parser.add_argument("--alphabet", help="Alfabeto do modo dense: alnum, full ou os próprios caracteres")
+    parser.add_argument("--attacker_profile", choices=ATTACKER_PROFILES, default=DEFAULT_ATTACKER_PROFILE,
+                        help="Perfil de atacante usado no tempo estimado para quebra (padrão: default, 10 milhões/s)")
+    parser.add_argument("--pattern_check", action="store_true", help="Detecta padrões previsíveis (teclado, sequências, repetições, datas)")
+    parser.add_argument("--dictionary_index", metavar="ARQUIVO", help="Índice de palavras para detectar palavras de dicionário (ativa --pattern_check)")
+    parser.add_argument("--breach_corpus", metavar="ARQUIVO", help="Arquivo local de senhas vazadas (SHA-1 ordenado, formato HIBP)")
+    parser.add_argument("--breach_bloom", metavar="ARQUIVO", help="Filtro de Bloom do arquivo de vazamentos (respostas negativas mais rápidas)")
+    parser.add_argument("--build_breach_bloom", action="store_true", help="Compila o filtro de Bloom de --breach_corpus em --breach_bloom")
+    parser.add_argument("--stats", action="store_true", help="Exibe a latência por etapa (p50/p90/p99) ao final do lote ou da auditoria")
+    parser.add_argument("--stats_json", metavar="ARQUIVO", help="Salva a latência por etapa e os histogramas em um arquivo JSON")
+    parser.add_argument("--rotate", metavar="ARQUIVO", help="Rotação incremental: gera só as contas (campo id) cujos dados mudaram")
+    parser.add_argument("--rotation_index", metavar="ARQUIVO", help="Índice de impressões digitais da rotação incremental (criado se não existir)")
+    parser.add_argument("--rotation_key", metavar="ARQUIVO", help="Arquivo da chave do índice de rotação (padrão: <índice>.key, criado se não existir)")
+    parser.add_argument("--profile_store", metavar="ARQUIVO", help="Arquivo de perfis: tabelas de substituição pré-calculadas (lidas via mmap)")
+    parser.add_argument("--build_profile_store", metavar="LISTA", help="Grava as frases chave de um arquivo (uma por linha) em --profile_store")
+    parser.add_argument("--policy", help="Política de senha do site: " + ", ".join(SITE_POLICIES) + " ou uma de --policy_file")
+    parser.add_argument("--policy_file", metavar="ARQUIVO", help="Arquivo JSON com políticas de senha próprias")
+    parser.add_argument("--audit_collisions", metavar="ARQUIVO", help="Procura contas de um inventário JSONL/CSV que recebem a mesma senha (use '-' para stdin)")
+    parser.add_argument("--collision_memory_mb", type=int, default=DEFAULT_MEMORY_MB,
+                        help=f"Memória das impressões digitais na auditoria de colisões (padrão: {DEFAULT_MEMORY_MB} MB)")
+    parser.add_argument("--collision_tmp_dir", metavar="DIRETÓRIO", help="Diretório dos arquivos temporários da auditoria de colisões")
+    parser.add_argument("--build_dictionary_index", metavar="LISTA", help="Compila uma lista de palavras (uma por linha, mais comuns primeiro) em --dictionary_index")
 
     try:
         # Parseia os argumentos fornecidos pelo usuário
         args = parser.parse_args()
 
+        # Calibração do key stretching: só mede e salva os parâmetros
+        if args.calibrate_kdf:
+            calibrar_kdf(args)
+            return
+
+        # Compilação do filtro de Bloom dos vazamentos: só gera o arquivo
+        if args.build_breach_bloom:
+            compilar_bloom(args)
+            return
+
+        # Compilação do índice de palavras: só gera o arquivo
+        if args.build_dictionary_index:
+            compilar_dicionario(args)
+            return
+
+        # Compilação do arquivo de perfis: só gera o arquivo
+        if args.build_profile_store:
+            compilar_perfis(args)
+            return
+
+        # Auditoria de um arquivo de senhas existente
+        if args.audit:
+            executar_auditoria(args)
+            return
+
+        # Parâmetros de key stretching (None mantém o SHA-256 simples)
+        # Opções do PasswordGenerator compartilhadas por todos os modos
+        opcoes_gerador = {
+            "kdf_params": load_params(args.kdf_config) if args.kdf_config else None,
+            "output_mode": args.output_mode,
+            "alphabet": args.alphabet,
+            "policy": get_policy(args.policy, carregar_politicas(args)) if args.policy else None
+        }
+        if args.alphabet is not None and args.output_mode != "dense":
+            raise ValueError("--alphabet só pode ser usado com --output_mode dense.")
+        if args.alphabet is not None:
+            validate_alphabet(args.alphabet)
+
+        # Serviço local: mantém os processos e caches aquecidos entre requisições
+        if args.serve:
+            if args.workers < 0:
+                raise ValueError("O número de processos não pode ser negativo.")
+            run_server(
+                host=args.host,
+                port=args.port,
+                unix_socket=args.unix_socket,
+                workers=args.workers or None,
+                batch_size=args.serve_batch_size,
+                max_wait_ms=args.serve_max_wait_ms,
+                generator_options=opcoes_gerador,
+                strength_options=opcoes_analise(args),
+                profile_store=args.profile_store,
+                policies=carregar_politicas(args)
+            )
+            return
+
+        # Auditoria de colisões: contas do inventário que receberiam a mesma senha
+        if args.audit_collisions:
+            auditar_colisoes(args, opcoes_gerador)
+            return
+
+        # Rotação incremental: só as contas que mudaram desde a última rotação
+        if args.rotate:
+            executar_rotacao(args, opcoes_gerador)
+            return
+
+        # Modo em lote: um único processo (ou um pool de processos) gera todas as senhas
+        if args.batch:
+            executar_lote(args, opcoes_gerador)
+            return
+
+        if args.base_phrase is None or args.key_phrase is None:
+            parser.error("os argumentos --base_phrase e --key_phrase são obrigatórios (ou use --batch)")
+
         # Validação de entrada
         validar_entrada(args.base_phrase, args.key_phrase, args.salt, args.pwd_length)
 
@@ -81,7 +498,7 @@ def main():
         #print("==================================\n")
 
         # Geração do dicionário de substituição
-        config = ConfigGenerator(args.key_phrase)
+        config = carregar_configuracao(args)
         subst_dict = config.get_subst_dict()
 
         # Debug: Garantir que o subst_dict seja sempre o mesmo
@@ -95,12 +512,32 @@ def main():
             subst_dict=subst_dict,
             salt=args.salt,
             pwd_length=args.pwd_length,
-            extended_chars=args.extended_chars
+            extended_chars=args.extended_chars,
+            translation_table=config.get_translation_table(),
+            **opcoes_gerador
         )
+
+        analisador = abrir_analisador(args)
+        vazamentos = abrir_vazamentos(args)
+
+        # Várias variantes a partir de um único hash
+        if args.variants:
+            variants = interpretar_variantes(args.variants)
+            passwords = password_generator.generate_variants(variants)
+
+            print("\n=== Gerador de Senhas Seguras (variantes) ===")
+            for (pwd_length, extended_chars), password in zip(variants, passwords):
+                analysis = PasswordStrength(password, args.attacker_profile, analisador, vazamentos).get_password_analysis()
+                extras = " + especiais" if extended_chars else ""
+                print(f"[{pwd_length}{extras}] {password}  →  {analysis['score']} ({analysis['security_level']}), "
+                      f"quebra: {analysis['crack_time']}")
+            print("=============================================\n")
+            return
+
         generated_password = password_generator.generate_password()
 
         # Análise da força da senha
-        strength_checker = PasswordStrength(generated_password)
+        strength_checker = PasswordStrength(generated_password, args.attacker_profile, analisador, vazamentos)
         analysis = strength_checker.get_password_analysis()
 
         # Exibição dos resultados
@@ -109,8 +546,16 @@ def main():
         print(f"Comprimento da senha: {analysis['length']}")
         print(f"Força da senha (0..100): {analysis['score']} ({analysis['security_level']})")
         print(f"Tempo estimado para quebra: {analysis['crack_time']}")
+        if analysis.get("patterns"):
+            print(f"Padrões encontrados: {', '.join(match['pattern'] for match in analysis['patterns'])}")
+        if analysis.get("breached"):
+            print(f"ATENÇÃO: senha encontrada {analysis['breached']} vezes no arquivo de vazamentos!")
         print("=================================\n")
 
+    except OSError as oe:
+        print(f"\n[ERRO]: Não foi possível acessar o arquivo: {oe}")
+        sys.exit(1)
+
     except ValueError as ve:
         print(f"\n[ERRO]: {ve}")
         sys.exit(1)  # Sai com código de erro
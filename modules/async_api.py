@@ -0,0 +1,161 @@
+# O que faz?
+# API assíncrona (asyncio) para gerar e analisar muitas senhas sem bloquear o event loop.
+# 1 - O trabalho pesado (hash, KDF, análise de força) roda em um executor configurável
+#   - Padrão: o executor de threads do próprio event loop.
+#   - hashlib libera o GIL em entradas grandes e nos KDFs (PBKDF2, scrypt): com threads,
+#     várias derivações lentas rodam de fato em paralelo.
+#   - Para o SHA-256 simples de frases curtas o ganho é só não bloquear o loop;
+#     para vazão máxima nesse caso use o modo em lote com processos (parallel_engine.py).
+# 2 - Concorrência limitada (max_concurrency) por um asyncio.Semaphore compartilhado
+#   - Vale para todas as chamadas do mesmo AsyncDeriver, inclusive de requisições diferentes.
+# 3 - Tempo limite (timeout) por item e cancelamento
+#   - Uma thread do executor não pode ser interrompida: o tempo limite e o cancelamento só param a espera.
+#   - Itens que ainda não começaram no executor são pulados; os que já estão rodando terminam
+#     em segundo plano e o resultado é descartado.
+#   - A vaga do semáforo só é devolvida quando o executor termina de fato: itens abandonados
+#     continuam contando em max_concurrency e o executor nunca recebe mais trabalho que o limite.
+# 4 - Validação, cache de configurações e políticas são os mesmos do modo em lote (BatchProcessor)
+#   - Resolvidos no próprio event loop (rápido e sem concorrência no cache); o hash e a análise
+#     de força vão ao executor.
+
+import asyncio
+import os
+import threading
+from functools import partial
+
+from modules.batch_processor import BatchProcessor, parse_record
+from modules.password_strenght import PasswordStrength
+
+
+TIMEOUT_ERROR = "Tempo limite excedido."
+
+
+class AsyncDeriver:
+    '''
+    Gera e analisa senhas de forma assíncrona, com concorrência limitada.
+
+    Os resultados são os mesmos do BatchProcessor (geração) e do PasswordStrength (análise).
+    '''
+
+    def __init__(self, executor=None, max_concurrency: int = None, timeout: float = None,
+                 generator_options: dict = None, policies: dict = None, strength_options: dict = None,
+                 cache=None):
+        """
+        Inicializa o gerador assíncrono.
+        executor: executor do hash (None = executor padrão do event loop).
+        max_concurrency: derivações/análises em andamento ao mesmo tempo (padrão: um por núcleo).
+        timeout: tempo limite de cada item, em segundos (None = sem limite).
+        generator_options / policies / cache: como no BatchProcessor.
+        strength_options: opções do PasswordStrength em derive() e analyze() (attacker_profile, pattern_analyzer, breach_corpus).
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("O limite de concorrência deve ser pelo menos 1.")
+        self.executor = executor
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.timeout = timeout
+        self.processor = BatchProcessor(cache, generator_options, policies)
+        self.strength_options = strength_options or {}
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+
+    async def _run(self, function):
+        """
+        Executa a função no executor ocupando uma vaga do semáforo.
+        Levanta asyncio.TimeoutError se o tempo limite passar. Em tempo limite ou cancelamento,
+        a vaga só é devolvida quando o executor termina (ou pula) o trabalho.
+        """
+        abandoned = threading.Event()
+
+        def call():
+            if abandoned.is_set():
+                return None  # Abandonado antes de começar: não gasta o executor
+            return function()
+
+        await self._slots.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, call)
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            # shield: a espera pode ser cancelada, mas o futuro continua acompanhando a thread
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        finally:
+            if future.done():
+                self._slots.release()
+            else:
+                abandoned.set()
+                future.add_done_callback(lambda done: self._slots.release())
+
+
+    async def derive(self, raw: dict) -> dict:
+        """
+        Gera a senha e a análise de força de um registro (mesmo formato do modo em lote).
+        A análise usa as opções do gerador (strength_options).
+        Levanta ValueError para registros inválidos e asyncio.TimeoutError se o tempo limite passar.
+        """
+        generator = self.processor.generator_for(parse_record(raw))
+        return await self._run(partial(self._derive_and_analyze, generator))
+
+
+    def _derive_and_analyze(self, generator) -> dict:
+        """Gera a senha e a analisa (roda no executor)."""
+        password = generator.generate_password()
+        return PasswordStrength(password, **self.strength_options).get_password_analysis(self.processor.metrics)
+
+
+    async def analyze(self, password: str, metrics=None) -> dict:
+        """Analisa a força de uma senha com as opções do gerador (strength_options)."""
+        if not isinstance(password, str):
+            raise ValueError("A senha deve ser um texto.")
+        strength = PasswordStrength(password, **self.strength_options)
+        return await self._run(partial(strength.get_password_analysis, metrics))
+
+
+    @staticmethod
+    async def _guarded(coroutine, extra: dict = None) -> dict:
+        """Converte os erros de um item em {"error": ...}, como no modo em lote."""
+        result = dict(extra or {})
+        try:
+            result.update(await coroutine)
+        except ValueError as ve:
+            result["error"] = str(ve)
+        except asyncio.TimeoutError:
+            result["error"] = TIMEOUT_ERROR
+        return result
+
+
+    async def derive_many(self, records) -> list:
+        """
+        Gera as senhas de vários registros ao mesmo tempo (até max_concurrency por vez).
+        Retorna os resultados na ordem de entrada; registros inválidos ou lentos demais viram {"error": ...}.
+        """
+        tasks = []
+        for raw in records:
+            extra = {"id": raw["id"]} if isinstance(raw, dict) and raw.get("id") not in (None, "") else None
+            tasks.append(self._guarded(self.derive(raw), extra))
+        return await asyncio.gather(*tasks)
+
+
+    async def analyze_many(self, passwords, metrics=None) -> list:
+        """Analisa várias senhas ao mesmo tempo. Retorna os resultados na ordem de entrada."""
+        return await asyncio.gather(*(self._guarded(self.analyze(password, metrics)) for password in passwords))
+
+
+    def cache_info(self) -> dict:
+        """Retorna as estatísticas do cache de configurações."""
+        return self.processor.cache_info()
+
+
+async def agenerate_passwords(records, executor=None, max_concurrency: int = None, timeout: float = None,
+                              generator_options: dict = None) -> list:
+    """Atalho: gera as senhas de vários registros de forma assíncrona, na ordem de entrada."""
+    deriver = AsyncDeriver(executor, max_concurrency, timeout, generator_options)
+    return await deriver.derive_many(records)
+
+
+async def aanalyze_passwords(passwords, metrics=None, executor=None, max_concurrency: int = None,
+                             timeout: float = None, strength_options: dict = None) -> list:
+    """Atalho: analisa várias senhas de forma assíncrona, na ordem de entrada."""
+    deriver = AsyncDeriver(executor, max_concurrency, timeout, strength_options=strength_options)
+    return await deriver.analyze_many(passwords, metrics)
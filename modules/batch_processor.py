@@ -0,0 +1,200 @@
+# O que faz?
+# 1 - Lê um fluxo de registros (JSONL ou CSV) de um arquivo ou da entrada padrão
+#   - Cada registro tem: base_phrase, key_phrase, salt, pwd_length, extended_chars
+#     e, opcionalmente, policy (nome de uma política de senha do site, password_policy.py)
+# 2 - Gera a senha de cada registro, um por vez
+#   - Os registros são lidos e processados sob demanda (memória constante).
+#   - Reaproveita um único ConfigGenerator para cada frase chave distinta (cache LRU).
+# 3 - Escreve o resultado de cada registro em JSONL assim que ele fica pronto
+#   - Registros inválidos geram uma linha com "error" e o lote continua.
+
+import csv
+import json
+
+from modules import instrumentation
+from modules.config_generator import ConfigCache, ConfigGenerator
+from modules.password_generator import PasswordGenerator
+from modules.password_policy import SITE_POLICIES, get_policy
+from modules.password_strenght import PasswordStrength
+from modules.validators import validar_entrada
+
+
+BATCH_FORMATS = ("jsonl", "csv")
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "sim", "s", "on"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", "nao", "não", "off", ""}
+
+
+def detect_format(path: str) -> str:
+    """Deduz o formato do lote pela extensão do arquivo (JSONL por padrão)."""
+    if path and path.lower().endswith(".csv"):
+        return "csv"
+    return "jsonl"
+
+
+def _parse_bool(value) -> bool:
+    """Converte valores vindos de JSON ou CSV em booleano."""
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"Valor inválido para extended_chars: '{value}'.")
+
+
+def _parse_int(value, default: int) -> int:
+    """Converte o comprimento da senha em inteiro, aceitando campo vazio."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    if isinstance(value, bool):
+        raise ValueError(f"Valor inválido para pwd_length: '{value}'.")
+    if isinstance(value, float):
+        # JSON aceita 16.0, 16.9 e 1e400 (infinito): só números inteiros finitos valem
+        if not value.is_integer():
+            raise ValueError(f"Valor inválido para pwd_length: '{value}'.")
+        return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Valor inválido para pwd_length: '{value}'.")
+
+
+def parse_record(raw: dict) -> dict:
+    """Valida e normaliza os campos de um registro do lote."""
+    if not isinstance(raw, dict):
+        raise ValueError("Cada registro deve ser um objeto com os campos da senha.")
+
+    for field in ("base_phrase", "key_phrase"):
+        if raw.get(field) is None:
+            raise ValueError(f"Campo obrigatório ausente: {field}.")
+
+    record = {
+        "base_phrase": str(raw["base_phrase"]),
+        "key_phrase": str(raw["key_phrase"]),
+        "salt": "" if raw.get("salt") is None else str(raw["salt"]),
+        "pwd_length": _parse_int(raw.get("pwd_length"), 16),
+        "extended_chars": _parse_bool(raw.get("extended_chars")),
+        "policy": None if raw.get("policy") in (None, "") else str(raw["policy"]),
+    }
+
+    validar_entrada(record["base_phrase"], record["key_phrase"], record["salt"], record["pwd_length"])
+    return record
+
+
+def read_records(stream, fmt: str = "jsonl"):
+    """
+    Lê os registros do fluxo sob demanda.
+    Gera tuplas (número da linha, registro bruto ou exceção de leitura).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ValueError(f"JSON inválido: {e.msg}.")
+    else:
+        raise ValueError(f"Formato de lote desconhecido: '{fmt}'. Use um de: {', '.join(BATCH_FORMATS)}.")
+
+
+class BatchProcessor:
+    '''
+    Processa lotes de registros reaproveitando o estado caro entre eles.
+
+    O ConfigGenerator de cada frase chave distinta é criado uma única vez e
+    reutilizado por todos os registros que compartilham essa frase.
+    '''
+
+    def __init__(self, cache: ConfigCache = None, generator_options: dict = None, policies: dict = None,
+                 metrics=None, strength_options: dict = None):
+        """
+        Inicializa o processador com um cache de configurações (novo, se não for informado).
+        generator_options: opções extras do PasswordGenerator aplicadas a todos os registros
+        (kdf_params, output_mode, alphabet, policy).
+        policies: políticas que os registros podem citar pelo nome (padrão: SITE_POLICIES).
+        metrics: métricas da análise de força de cada resultado (padrão: todas; () = só a senha).
+        strength_options: opções do PasswordStrength (attacker_profile, pattern_analyzer, breach_corpus).
+        """
+        self.configs = cache if cache is not None else ConfigCache()
+        self.generator_options = generator_options or {}
+        self.policies = policies if policies is not None else SITE_POLICIES
+        self.metrics = metrics
+        self.strength_options = strength_options or {}
+        self.processed = 0
+        self.errors = 0
+
+
+    def _get_config(self, key_phrase: str) -> ConfigGenerator:
+        """Retorna o ConfigGenerator da frase chave, criando-o só na primeira vez."""
+        return self.configs.get(key_phrase)
+
+
+    def generator_for(self, record: dict) -> PasswordGenerator:
+        """Monta o PasswordGenerator de um registro já validado (parse_record), sem calcular o hash."""
+        config = self._get_config(record["key_phrase"])
+        options = self.generator_options
+        if record["policy"] is not None:
+            # A política do registro vale mais que a do lote
+            options = {**options, "policy": get_policy(record["policy"], self.policies)}
+
+        return PasswordGenerator(
+            base_phrase=record["base_phrase"],
+            subst_dict=config.get_subst_dict(),
+            salt=record["salt"],
+            pwd_length=record["pwd_length"],
+            extended_chars=record["extended_chars"],
+            translation_table=config.get_translation_table(),
+            **options
+        )
+
+
+    def derive_record(self, raw: dict) -> dict:
+        """Gera a senha e a análise de força de um único registro."""
+        generated_password = self.generator_for(parse_record(raw)).generate_password()
+        return PasswordStrength(generated_password, **self.strength_options).get_password_analysis(self.metrics)
+
+
+    def process(self, records):
+        """
+        Processa um iterável de tuplas (linha, registro) e gera um resultado por registro.
+        Os erros de um registro não interrompem o restante do lote.
+        """
+        for line_no, raw in records:
+            result = {"line": line_no}
+            if isinstance(raw, dict) and raw.get("id") not in (None, ""):
+                result["id"] = raw["id"]
+
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                result.update(self.derive_record(raw))
+                self.processed += 1
+            except ValueError as ve:
+                result["error"] = str(ve)
+                self.errors += 1
+                if instrumentation.sink is not None:
+                    instrumentation.sink.count("batch.error")
+
+            yield result
+
+
+    def cache_info(self) -> dict:
+        """Retorna as estatísticas do cache de configurações."""
+        return self.configs.info()
+
+
+    def run(self, input_stream, output_stream, fmt: str = "jsonl"):
+        """Lê o lote do fluxo de entrada e escreve cada resultado em JSONL na saída."""
+        for result in self.process(read_records(input_stream, fmt)):
+            output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output_stream.flush()
+        return self.processed, self.errors
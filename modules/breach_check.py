@@ -0,0 +1,224 @@
+# O que faz?
+# Verifica, sem internet, se uma senha aparece em um vazamento conhecido.
+# 1 - Usa um arquivo local no formato do HIBP (Have I Been Pwned), ordenado por hash
+#   - Uma linha por senha: SHA1_EM_HEXADECIMAL:OCORRÊNCIAS (a contagem é opcional).
+#   - O arquivo é aberto via mmap e pesquisado por busca binária: nada é carregado na memória
+#     além das páginas tocadas pela busca (~log2(tamanho) páginas).
+# 2 - Filtro de Bloom opcional, compilado uma vez a partir do arquivo
+#   - Responde "não vazada" sem tocar no arquivo grande na maioria das consultas.
+#   - Os índices dos bits saem do próprio SHA-1 (double hashing), sem hashes extras.
+# 3 - Consultas em lote
+#   - Os hashes são ordenados e cada busca começa onde a anterior parou,
+#     então o arquivo é percorrido em um único sentido.
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+
+HASH_LENGTH = 40  # SHA-1 em hexadecimal
+
+BLOOM_MAGIC = b"PWBLOOM\x01"
+_BLOOM_HEADER = struct.Struct("<8sQI")
+
+
+def sha1_hex(password: str) -> bytes:
+    """Retorna o SHA-1 da senha em hexadecimal maiúsculo (formato do HIBP)."""
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper().encode("ascii")
+
+
+def _bit_positions(hash_hex: bytes, bits: int, hashes: int):
+    """Posições dos bits de um hash no filtro de Bloom (double hashing sobre o SHA-1)."""
+    digest = bytes.fromhex(hash_hex[:HASH_LENGTH].decode("ascii"))
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def build_bloom_filter(corpus_path: str, bloom_path: str, false_positive_rate: float = 0.01) -> dict:
+    """
+    Compila o filtro de Bloom de um arquivo de hashes (lido uma única vez, em sequência).
+    Retorna os parâmetros escolhidos: entradas, bits e quantidade de hashes.
+    """
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("A taxa de falsos positivos deve estar entre 0 e 1.")
+
+    with open(corpus_path, "rb") as f:
+        entries = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+    entries = max(entries, 1)
+
+    # Tamanho ótimo: m = -n·ln(p) / ln(2)², k = (m / n)·ln(2)
+    bits = max(8, math.ceil(-entries * math.log(false_positive_rate) / math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / entries * math.log(2)))
+
+    bitmap = bytearray(bits // 8)
+    with open(corpus_path, "rb") as f:
+        for line in f:
+            if len(line) < HASH_LENGTH:
+                continue
+            for position in _bit_positions(line[:HASH_LENGTH], bits, hashes):
+                bitmap[position >> 3] |= 1 << (position & 7)
+
+    # Grava em um arquivo temporário e renomeia: um filtro pela metade nunca é lido
+    tmp_path = bloom_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_BLOOM_HEADER.pack(BLOOM_MAGIC, bits, hashes))
+        f.write(bitmap)
+    os.replace(tmp_path, bloom_path)
+    return {"entries": entries, "bits": bits, "hashes": hashes}
+
+
+class BloomFilter:
+    '''
+    Leitor do filtro de Bloom via mmap.
+
+    Sem falsos negativos: se might_contain() retorna False, o hash não está no arquivo.
+    '''
+
+    def __init__(self, path: str):
+        """Abre e valida o arquivo do filtro."""
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Filtro de Bloom vazio: {path}.")
+
+        if len(self._mmap) < _BLOOM_HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"Filtro de Bloom inválido: {path}.")
+        magic, self.bits, self.hashes = _BLOOM_HEADER.unpack_from(self._mmap)
+        if magic != BLOOM_MAGIC or len(self._mmap) != _BLOOM_HEADER.size + self.bits // 8:
+            self._mmap.close()
+            raise ValueError(f"Filtro de Bloom inválido: {path}.")
+
+
+    def close(self):
+        """Libera o mapeamento do arquivo."""
+        self._mmap.close()
+
+
+    def might_contain(self, hash_hex: bytes) -> bool:
+        """Retorna False se o hash certamente não está no arquivo."""
+        data = self._mmap
+        offset = _BLOOM_HEADER.size
+        for position in _bit_positions(hash_hex, self.bits, self.hashes):
+            if not data[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class BreachCorpus:
+    '''
+    Arquivo de senhas vazadas (SHA-1 ordenado, formato HIBP) pesquisado via mmap.
+
+    As linhas podem ter tamanhos diferentes: a busca binária usa offsets em bytes
+    e volta até o início da linha a cada passo.
+    '''
+
+    def __init__(self, path: str, bloom_path: str = None):
+        """Abre o arquivo de hashes (e o filtro de Bloom, se informado)."""
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Arquivo de senhas vazadas vazio: {path}.")
+        self.size = len(self._mmap)
+
+        # Confere o formato pela primeira linha
+        newline = self._mmap.find(b"\n", 0, 256)
+        first_line = self._mmap[:newline if newline != -1 else 256].strip()
+        try:
+            bytes.fromhex(first_line[:HASH_LENGTH].decode("ascii"))
+        except (UnicodeDecodeError, ValueError):
+            first_line = b""
+        if len(first_line) < HASH_LENGTH or first_line[HASH_LENGTH:HASH_LENGTH + 1] not in (b"", b":"):
+            self._mmap.close()
+            raise ValueError(f"Arquivo de senhas vazadas inválido (esperado SHA1:OCORRÊNCIAS por linha): {path}.")
+        # HIBP usa maiúsculas; listas próprias podem usar minúsculas
+        self._lowercase = first_line[:HASH_LENGTH].islower()
+        # Estimativa da quantidade de senhas no arquivo (tamanho / primeira linha)
+        self.estimated_entries = max(1, self.size // (len(first_line) + 1))
+
+        self.bloom = BloomFilter(bloom_path) if bloom_path else None
+
+
+    def close(self):
+        """Libera os mapeamentos dos arquivos."""
+        self._mmap.close()
+        if self.bloom is not None:
+            self.bloom.close()
+
+
+    def _lower_bound(self, target: bytes, lo: int) -> int:
+        """Offset da primeira linha (a partir do offset lo, início de linha) com hash >= target."""
+        data = self._mmap
+        hi = self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = data.rfind(b"\n", lo, mid) + 1 or lo
+            key = data[line_start:line_start + HASH_LENGTH]
+            if key < target:
+                line_end = data.find(b"\n", line_start)
+                lo = self.size if line_end == -1 else line_end + 1
+            else:
+                hi = line_start
+        return lo
+
+
+    def _count_at(self, offset: int, target: bytes) -> int:
+        """Lê a contagem da linha em offset se o hash dela for target (senão 0)."""
+        data = self._mmap
+        if data[offset:offset + HASH_LENGTH] != target:
+            return 0
+        line_end = data.find(b"\n", offset)
+        line = data[offset:self.size if line_end == -1 else line_end].rstrip()
+        _, _, count = line.partition(b":")
+        try:
+            return int(count) if count else 1
+        except ValueError:
+            return 1
+
+
+    def _target(self, password: str) -> bytes:
+        """Hash da senha na mesma caixa usada pelo arquivo."""
+        target = sha1_hex(password)
+        return target.lower() if self._lowercase else target
+
+
+    def count(self, password: str) -> int:
+        """Retorna quantas vezes a senha aparece no vazamento (0 se não aparece)."""
+        target = self._target(password)
+        if self.bloom is not None and not self.bloom.might_contain(target):
+            return 0
+        return self._count_at(self._lower_bound(target, 0), target)
+
+
+    def count_many(self, passwords) -> list:
+        """
+        Consulta várias senhas de uma vez. Retorna as contagens na mesma ordem das senhas.
+        As buscas são feitas em ordem de hash, sempre avançando no arquivo.
+        """
+        targets = [self._target(password) for password in passwords]
+        counts = [0] * len(targets)
+
+        offset = 0
+        for target, i in sorted((target, i) for i, target in enumerate(targets)):
+            if self.bloom is not None and not self.bloom.might_contain(target):
+                continue
+            offset = self._lower_bound(target, offset)
+            if offset >= self.size:
+                break
+            counts[i] = self._count_at(offset, target)
+        return counts
+
+
+@lru_cache(maxsize=8)
+def open_corpus(path: str, bloom_path: str = None) -> BreachCorpus:
+    """Abre (uma vez por processo) o arquivo de senhas vazadas e o filtro de Bloom."""
+    return BreachCorpus(path, bloom_path)
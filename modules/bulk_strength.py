@@ -0,0 +1,233 @@
+# O que faz?
+# Analisa a força de muitas senhas de uma vez (auditoria de inventários grandes).
+#   - Conta as classes de caracteres com bytes.translate (laço em C, sem laço Python por caractere).
+#   - Senhas não ASCII caem no caminho da classe PasswordStrength.
+#   - Score, nível e tempo de quebra usam as mesmas regras de password_strenght.py,
+#     então o resultado é idêntico ao da análise individual.
+#   - Score e nível são memorizados pelo perfil da senha (comprimento útil e classes presentes).
+#   - O tempo de quebra é memorizado por (conjunto de caracteres, comprimento): senhas com o
+#     mesmo perfil caem no mesmo "balde" e o texto é formatado uma única vez.
+#   - O cálculo é logarítmico (password_strenght.py), então senhas enormes não estouram.
+#   - Os resultados numéricos são devolvidos em colunas (array.array).
+#   - Com um PatternAnalyzer, cada senha passa também pela detecção de padrões
+#     (sem cache: o resultado depende do conteúdo, não só do perfil da senha).
+#   - Com um arquivo de senhas vazadas, cada bloco é consultado de uma vez (count_many),
+#     em ordem de hash, percorrendo o arquivo em um único sentido.
+#   - Cada bloco informa seu tempo total ao sink de instrumentation.py, se houver um instalado.
+
+import math
+import string
+from array import array
+from itertools import islice
+from time import perf_counter_ns
+
+from modules import instrumentation
+from modules.pattern_analyzer import cap_score
+from modules.password_strenght import (
+    CHARSET_SIZES,
+    DEFAULT_ATTACKER_PROFILE,
+    OTHER_CHARSET_SIZE,
+    PasswordStrength,
+    attacker_rate,
+    breached_crack_time_log10,
+    calculate_score,
+    crack_time_log10,
+    format_crack_time,
+    seconds_from_log10,
+    security_level_for,
+)
+
+
+def _complement(keep: str) -> bytes:
+    """Retorna todos os bytes ASCII que NÃO estão em `keep` (tabela de remoção)."""
+    keep_bytes = keep.encode("ascii")
+    return bytes(b for b in range(128) if b not in keep_bytes)
+
+
+# Tabelas de remoção: apagar tudo que não é da classe e medir o que sobrou
+_NOT_UPPER = _complement(string.ascii_uppercase)
+_NOT_LOWER = _complement(string.ascii_lowercase)
+_NOT_DIGITS = _complement(string.digits)
+_NOT_SPECIAL = _complement(string.punctuation)
+
+_UPPER_SIZE = CHARSET_SIZES["uppercase"]
+_LOWER_SIZE = CHARSET_SIZES["lowercase"]
+_DIGITS_SIZE = CHARSET_SIZES["digits"]
+_SPECIAL_SIZE = CHARSET_SIZES["special"]
+
+COLUMNS = ("length", "uppercase", "lowercase", "digits", "special", "score")
+
+
+class BulkPasswordStrength:
+    '''
+    Analisador de força em lote.
+
+    Mantém caches de scores e de tempos de quebra entre chamadas, então o mesmo
+    objeto pode ser reutilizado para vários blocos de um inventário.
+    '''
+
+    def __init__(self, attacker_profile: str = DEFAULT_ATTACKER_PROFILE, pattern_analyzer=None, breach_corpus=None):
+        """Inicializa o analisador com os caches vazios."""
+        self.attacker_profile = attacker_profile
+        self.guesses_per_second = attacker_rate(attacker_profile)
+        self.pattern_analyzer = pattern_analyzer
+        self.breach_corpus = breach_corpus
+        self._score_cache = {}
+        self._crack_time_cache = {}
+
+
+    def _score(self, length: int, upper: int, lower: int, digits: int, special: int, single_class: bool) -> tuple:
+        """Retorna (score, nível), calculando cada perfil de senha uma única vez."""
+        # O score só depende do comprimento até 10 e de quais classes estão presentes
+        key = (min(length, 10), upper > 0, lower > 0, digits > 0, special > 0, single_class)
+        result = self._score_cache.get(key)
+        if result is None:
+            char_types = {"uppercase": upper, "lowercase": lower, "digits": digits, "special": special}
+            score = calculate_score(length, char_types, single_class)
+            result = (score, security_level_for(score))
+            self._score_cache[key] = result
+        return result
+
+
+    def _crack_time(self, charset: int, length: int) -> tuple:
+        """Retorna (segundos, texto) do tempo de quebra, calculando cada perfil uma única vez."""
+        key = (charset, length)
+        result = self._crack_time_cache.get(key)
+        if result is None:
+            log_seconds = crack_time_log10(charset, length, self.guesses_per_second)
+            result = (seconds_from_log10(log_seconds), format_crack_time(log_seconds))
+            self._crack_time_cache[key] = result
+        return result
+
+
+    @staticmethod
+    def _count_types(password: str) -> tuple:
+        """Conta (maiúsculas, minúsculas, dígitos, especiais, apenas uma classe) de uma senha."""
+        if password.isascii():
+            data = password.encode("ascii")
+            length = len(data)
+            upper = len(data.translate(None, _NOT_UPPER))
+            lower = len(data.translate(None, _NOT_LOWER))
+            digits = len(data.translate(None, _NOT_DIGITS))
+            special = len(data.translate(None, _NOT_SPECIAL))
+            single_class = length > 0 and (digits == length or upper + lower == length)
+            return upper, lower, digits, special, single_class
+
+        # Caminho lento: Unicode segue exatamente as regras da classe individual
+        char_types = PasswordStrength(password).char_types
+        single_class = password.isdigit() or password.isalpha()
+        return (char_types["uppercase"], char_types["lowercase"],
+                char_types["digits"], char_types["special"], single_class)
+
+
+    def analyze(self, passwords) -> dict:
+        """
+        Analisa uma sequência de senhas.
+        Retorna um dicionário de colunas: contagens e scores em array.array,
+        níveis de segurança, tempos de quebra e segundos estimados em listas
+        (e os padrões encontrados e as contagens de vazamento, quando ativados).
+        """
+        sink = instrumentation.sink
+        start = perf_counter_ns() if sink is not None else 0
+        columns = {name: array("l") for name in COLUMNS}
+        security_levels = []
+        crack_times = []
+        crack_seconds = []
+        patterns = []
+        pattern_analyzer = self.pattern_analyzer
+        breach_corpus = self.breach_corpus
+        if breach_corpus is not None:
+            passwords = list(passwords)
+            breached = breach_corpus.count_many(passwords)
+        else:
+            breached = None
+
+        length_col = columns["length"]
+        upper_col = columns["uppercase"]
+        lower_col = columns["lowercase"]
+        digits_col = columns["digits"]
+        special_col = columns["special"]
+        score_col = columns["score"]
+
+        for i, password in enumerate(passwords):
+            upper, lower, digits, special, single_class = self._count_types(password)
+            length = len(password)
+            score, security_level = self._score(length, upper, lower, digits, special, single_class)
+
+            length_col.append(length)
+            upper_col.append(upper)
+            lower_col.append(lower)
+            digits_col.append(digits)
+            special_col.append(special)
+            # Mesmo cálculo de charset_size(), sem montar um dicionário por senha
+            charset = ((upper > 0) * _UPPER_SIZE + (lower > 0) * _LOWER_SIZE +
+                       (digits > 0) * _DIGITS_SIZE + (special > 0) * _SPECIAL_SIZE +
+                       (length > upper + lower + digits + special) * OTHER_CHARSET_SIZE)
+
+            if pattern_analyzer is None and not (breached and breached[i]):
+                seconds, crack_time = self._crack_time(charset, length)
+            else:
+                log_seconds = crack_time_log10(charset, length, self.guesses_per_second)
+                if pattern_analyzer is not None:
+                    guesses, matches = pattern_analyzer.analyze(password, charset)
+                    log_seconds = min(log_seconds, guesses - math.log10(self.guesses_per_second))
+                    if matches:
+                        score = cap_score(score, guesses)
+                    patterns.append([{key: value for key, value in match.items() if key != "guesses_log10"}
+                                     for match in matches])
+                if breached and breached[i]:
+                    score = 0
+                    log_seconds = min(log_seconds, breached_crack_time_log10(breach_corpus, self.guesses_per_second))
+                security_level = security_level_for(score)
+                seconds, crack_time = seconds_from_log10(log_seconds), format_crack_time(log_seconds)
+
+            score_col.append(score)
+            security_levels.append(security_level)
+            crack_times.append(crack_time)
+            crack_seconds.append(seconds)
+
+        columns["security_level"] = security_levels
+        columns["crack_time"] = crack_times
+        columns["crack_seconds"] = crack_seconds
+        if pattern_analyzer is not None:
+            columns["patterns"] = patterns
+        if breached is not None:
+            columns["breached"] = breached
+        if sink is not None:
+            sink.lap("bulk.analyze", start)
+            sink.count("bulk.passwords", len(length_col))
+        return columns
+
+
+    def iter_analyses(self, passwords, chunk_size: int = 4096):
+        """
+        Gera, para cada senha, o mesmo dicionário de PasswordStrength.get_password_analysis().
+        As senhas são analisadas em blocos de chunk_size, sem carregar a entrada inteira.
+        """
+        iterator = iter(passwords)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+
+            columns = self.analyze(chunk)
+            for i, password in enumerate(chunk):
+                analysis = {
+                    "password": password,
+                    "length": columns["length"][i],
+                    "score": columns["score"][i],
+                    "security_level": columns["security_level"][i],
+                    "crack_time": columns["crack_time"][i],
+                    "crack_seconds": columns["crack_seconds"][i]
+                }
+                if "patterns" in columns:
+                    analysis["patterns"] = columns["patterns"][i]
+                if "breached" in columns:
+                    analysis["breached"] = columns["breached"][i]
+                yield analysis
+
+
+def analyze_passwords(passwords, attacker_profile: str = DEFAULT_ATTACKER_PROFILE, pattern_analyzer=None,
+                      breach_corpus=None) -> dict:
+    """Atalho: analisa uma sequência de senhas e retorna as colunas de resultado."""
+    return BulkPasswordStrength(attacker_profile, pattern_analyzer, breach_corpus).analyze(passwords)
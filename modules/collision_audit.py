@@ -0,0 +1,431 @@
+# O que faz?
+# Auditoria de colisões: encontra contas de um inventário que recebem a mesma senha.
+# A senha é um prefixo do hash e a frase chave vira só uma rotação das 26 letras,
+# então entradas diferentes podem gerar senhas iguais; a auditoria as acha antes da implantação.
+# 1 - Gera as senhas com o mesmo processador do modo em lote (BatchProcessor ou ParallelDeriver)
+#   - Sem a análise de força (metrics=()): só a senha de cada registro interessa.
+# 2 - Cada senha vira uma impressão digital de 8 bytes (BLAKE2b com chave aleatória da auditoria)
+#   - As senhas nunca são escritas no relatório.
+#   - Impressões iguais são só candidatas: falsos positivos ~n²/2^65 (menos de 0,001 para 100 milhões).
+# 3 - Enquanto cabe no limite de memória, as impressões ficam em uma tabela hash com endereçamento
+#   aberto sobre array("Q") (16 bytes por posição, ocupação máxima de 50%, sem objetos Python por item)
+#   - As linhas repetidas também contam para o limite: um inventário cheio de repetições passa
+#     para a ordenação externa como um inventário grande.
+# 4 - Acima do limite, passa para ordenação externa
+#   - Pares (impressão digital, linha) são ordenados em blocos e gravados em arquivos temporários.
+#   - Os blocos são intercalados (heapq.merge) e impressões iguais ficam vizinhas.
+#   - A memória fica limitada pelo tamanho do bloco, qualquer que seja o tamanho do inventário.
+# 5 - Confirmação: só os registros das linhas candidatas são relidos e têm a senha gerada de novo
+#   - Os grupos são separados pela senha completa: falsos positivos da impressão digital nunca
+#     chegam ao relatório.
+#   - Os grupos chegam um a um (da tabela ou da intercalação) e são confirmados em lotes de até
+#     confirm_lines linhas, uma releitura da entrada por lote: só as senhas do lote ficam em memória.
+#   - Os relatórios de cada lote vão para um arquivo temporário e são intercalados pela primeira linha
+#     (as senhas nunca vão para o disco).
+#   - Entradas sem volta ao início (stdin em pipe) são copiadas antes para um arquivo temporário.
+# 6 - Relatório: um grupo por senha repetida, com as linhas (e os ids) das contas
+#   - same_input indica se a entrada do hash é a mesma (frases iguais após normalização e substituição)
+#     ou se a colisão veio do corte do hash.
+
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from array import array
+
+from modules.batch_processor import BatchProcessor, parse_record, read_records
+
+
+DEFAULT_MEMORY_MB = 512
+KEY_SIZE = 16
+
+_LINE_BITS = 64
+_LINE_MASK = (1 << _LINE_BITS) - 1
+_PAIR_SIZE = 16           # Impressão digital + linha, big-endian: a ordem dos bytes é a ordem numérica
+_SORT_ENTRY_BYTES = 64    # Custo aproximado de cada par (int de 128 bits + ponteiro da lista) na ordenação
+_DUPLICATE_BYTES = 64     # Custo aproximado de cada linha repetida no modo em memória (int + lista + dict)
+_CONFIRM_BYTES = 256      # Custo aproximado de cada linha em confirmação (senha, id e entrada do hash)
+_IO_PAIRS = 4096          # Pares lidos/escritos por vez nos arquivos temporários
+MERGE_FANIN = 64          # Máximo de arquivos intercalados de uma vez
+
+
+class FingerprintSet:
+    '''
+    Conjunto de impressões digitais de 64 bits com a linha da primeira ocorrência.
+
+    Endereçamento aberto (sondagem linear) sobre dois array("Q"): 16 bytes por posição.
+    A impressão 0 marca posição livre e nunca é inserida.
+    '''
+
+    def __init__(self, slots: int = 1 << 16):
+        """Cria a tabela vazia (slots deve ser potência de 2)."""
+        self.slots = slots
+        self.count = 0
+        self.keys = array("Q", [0]) * slots
+        self.lines = array("Q", [0]) * slots
+
+
+    def __len__(self) -> int:
+        """Quantidade de impressões digitais na tabela."""
+        return self.count
+
+
+    def add(self, fingerprint: int, line: int) -> int:
+        """Insere a impressão digital. Retorna a linha da primeira ocorrência se ela já existia, senão 0."""
+        keys = self.keys
+        mask = self.slots - 1
+        slot = fingerprint & mask  # A impressão já é uniforme: os bits baixos servem de posição
+        while True:
+            stored = keys[slot]
+            if stored == fingerprint:
+                return self.lines[slot]
+            if stored == 0:
+                keys[slot] = fingerprint
+                self.lines[slot] = line
+                self.count += 1
+                return 0
+            slot = (slot + 1) & mask
+
+
+    def needs_grow(self) -> bool:
+        """True quando a ocupação passa de 50%."""
+        return 2 * self.count > self.slots
+
+
+    def grow_bytes(self) -> int:
+        """Memória usada durante o crescimento (tabela atual + tabela com o dobro de posições)."""
+        return 3 * self.slots * _PAIR_SIZE
+
+
+    def grow(self):
+        """Dobra a quantidade de posições e reinsere as impressões digitais."""
+        old_keys, old_lines = self.keys, self.lines
+        self.slots *= 2
+        self.count = 0
+        self.keys = array("Q", [0]) * self.slots
+        self.lines = array("Q", [0]) * self.slots
+        for fingerprint, line in zip(old_keys, old_lines):
+            if fingerprint:
+                self.add(fingerprint, line)
+
+
+    def items(self):
+        """Gera os pares (impressão digital, linha) da tabela."""
+        for fingerprint, line in zip(self.keys, self.lines):
+            if fingerprint:
+                yield fingerprint, line
+
+
+def _read_run(path: str):
+    """Lê um arquivo temporário ordenado, gerando os pares como inteiros (impressão << 64 | linha)."""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_PAIR_SIZE * _IO_PAIRS)
+            if not block:
+                return
+            for start in range(0, len(block), _PAIR_SIZE):
+                yield int.from_bytes(block[start:start + _PAIR_SIZE], "big")
+
+
+def _write_run(path: str, values):
+    """Grava pares já ordenados em um arquivo temporário."""
+    with open(path, "wb") as f:
+        block = []
+        for value in values:
+            block.append(value.to_bytes(_PAIR_SIZE, "big"))
+            if len(block) >= _IO_PAIRS:
+                f.write(b"".join(block))
+                block.clear()
+        f.write(b"".join(block))
+
+
+def _read_reports(path: str):
+    """Lê um arquivo temporário de relatórios (JSONL, em ordem da primeira linha)."""
+    with open(path, encoding="utf-8") as f:
+        for text in f:
+            yield json.loads(text)
+
+
+def _write_reports(path: str, reports):
+    """Grava relatórios já ordenados pela primeira linha em um arquivo temporário."""
+    with open(path, "w", encoding="utf-8") as f:
+        for report in reports:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+
+def _first_line(report: dict) -> int:
+    """Chave de ordenação dos relatórios (cada linha está em no máximo um grupo)."""
+    return report["lines"][0]
+
+
+class CollisionAuditor:
+    '''
+    Procura senhas repetidas em um inventário de entradas de derivação.
+
+    Usa o processador do modo em lote para gerar as senhas e guarda só impressões
+    digitais de 8 bytes: em memória até memory_mb, depois em arquivos temporários ordenados.
+    '''
+
+    def __init__(self, processor, memory_mb: int = DEFAULT_MEMORY_MB, tmp_dir: str = None):
+        """
+        processor: BatchProcessor ou ParallelDeriver (de preferência com metrics=()).
+        memory_mb: limite aproximado de memória das impressões digitais.
+        tmp_dir: diretório dos arquivos temporários da ordenação externa (padrão: o do sistema).
+        """
+        if memory_mb < 1:
+            raise ValueError("O limite de memória da auditoria deve ser pelo menos 1 MB.")
+        self.processor = processor
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self.tmp_dir = tmp_dir
+        self.key = os.urandom(KEY_SIZE)
+        # Metade da memória para o bloco em ordenação: a tabela ainda existe enquanto é descarregada
+        self.run_entries = max(self.memory_bytes // (2 * _SORT_ENTRY_BYTES), _IO_PAIRS)
+        # Linhas candidatas confirmadas por releitura da entrada (a outra metade da memória)
+        self.confirm_lines = max(self.memory_bytes // (2 * _CONFIRM_BYTES), _IO_PAIRS)
+        # Só para confirmar e descrever as colisões candidatas (mesmas opções do processador)
+        self._inspector = BatchProcessor(generator_options=getattr(processor, "generator_options", None),
+                                         policies=getattr(processor, "policies", None))
+
+        self.total = 0
+        self.errors = 0
+        self._table = FingerprintSet()
+        self._duplicates = {}  # Impressão digital → linhas (modo em memória)
+        self._duplicate_count = 0
+        self._buffer = []
+        self._runs = []
+        self._run_count = 0
+        self._report_count = 0
+        self._work_dir = None
+
+
+    def _fingerprint(self, password: str) -> int:
+        """Impressão digital de 64 bits da senha (nunca 0)."""
+        digest = hashlib.blake2b(password.encode("utf-8"), digest_size=8, key=self.key).digest()
+        return int.from_bytes(digest, "big") or 1
+
+
+    def _add(self, fingerprint: int, line: int):
+        """Registra uma senha: na tabela em memória ou no bloco da ordenação externa."""
+        table = self._table
+        if table is not None:
+            first = table.add(fingerprint, line)
+            duplicate_bytes = self._duplicate_count * _DUPLICATE_BYTES
+            if first:
+                self._duplicates.setdefault(fingerprint, [first]).append(line)
+                self._duplicate_count += 1
+                if table.slots * _PAIR_SIZE + duplicate_bytes + _DUPLICATE_BYTES > self.memory_bytes:
+                    self._spill()
+            elif table.needs_grow():
+                if table.grow_bytes() + duplicate_bytes <= self.memory_bytes:
+                    table.grow()
+                else:
+                    self._spill()
+            return
+
+        self._buffer.append(fingerprint << _LINE_BITS | line)
+        if len(self._buffer) >= self.run_entries:
+            self._flush_run()
+
+
+    def _spill(self):
+        """Passa para a ordenação externa: descarrega a tabela (e as repetições já vistas) em blocos."""
+        table, duplicates = self._table, self._duplicates
+        self._table, self._duplicates, self._duplicate_count = None, {}, 0
+        for fingerprint, line in table.items():
+            self._add(fingerprint, line)
+        del table
+        for fingerprint, lines in duplicates.items():
+            for line in lines[1:]:  # A primeira ocorrência já estava na tabela
+                self._add(fingerprint, line)
+
+
+    def _temp_path(self, name: str) -> str:
+        """Caminho de um arquivo temporário (cria o diretório de trabalho na primeira vez)."""
+        if self._work_dir is None:
+            self._work_dir = tempfile.mkdtemp(prefix="collision-audit-", dir=self.tmp_dir)
+        return os.path.join(self._work_dir, name)
+
+
+    def _new_run_path(self) -> str:
+        """Caminho do próximo arquivo temporário de pares."""
+        path = self._temp_path(f"run-{self._run_count:06d}.bin")
+        self._run_count += 1
+        self._runs.append(path)
+        return path
+
+
+    def _flush_run(self):
+        """Ordena o bloco atual e o grava em um arquivo temporário."""
+        self._buffer.sort()
+        _write_run(self._new_run_path(), self._buffer)
+        self._buffer = []
+
+
+    def _new_report_path(self) -> str:
+        """Caminho do próximo arquivo temporário de relatórios."""
+        path = self._temp_path(f"reports-{self._report_count:06d}.jsonl")
+        self._report_count += 1
+        return path
+
+
+    def _reduce_runs(self, runs: list, read, write, new_path, key=None) -> list:
+        """Intercala os arquivos em passadas de MERGE_FANIN até sobrarem menos que MERGE_FANIN."""
+        while len(runs) >= MERGE_FANIN:
+            group, runs = runs[:MERGE_FANIN], runs[MERGE_FANIN:]
+            path = new_path()
+            write(path, heapq.merge(*map(read, group), key=key))
+            for done in group:
+                os.remove(done)
+            runs.append(path)
+        return runs
+
+
+    def _merged(self):
+        """Intercala os arquivos temporários (em várias passadas se forem muitos) e o último bloco."""
+        runs, self._runs = self._runs, []
+        runs = self._reduce_runs(runs, _read_run, _write_run, self._new_run_path)
+        self._buffer.sort()
+        return heapq.merge(*map(_read_run, runs), iter(self._buffer))
+
+
+    def _collisions(self):
+        """Gera um a um os grupos de linhas com a mesma impressão digital (cada grupo em ordem crescente)."""
+        if self._table is not None:
+            duplicates = self._duplicates
+            self._table, self._duplicates = None, {}  # A tabela não é mais necessária na confirmação
+            yield from duplicates.values()
+            return
+
+        current = None
+        lines = []
+        for value in self._merged():
+            fingerprint = value >> _LINE_BITS
+            if fingerprint != current:
+                if len(lines) > 1:
+                    yield lines
+                current = fingerprint
+                lines = []
+            lines.append(value & _LINE_MASK)
+        if len(lines) > 1:
+            yield lines
+
+
+    def _derivation_input(self, generator) -> bytes:
+        """Impressão digital da entrada do hash (frase transformada, salt e parâmetros da saída)."""
+        inputs = [generator.base_phrase.translate(generator.translation_table), generator.salt,
+                  generator.pwd_length, generator.extended_chars,
+                  generator.policy.to_dict() if generator.policy is not None else None]
+        data = json.dumps(inputs, ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16, key=self.key).digest()
+
+
+    def _confirm(self, groups, input_stream, fmt: str):
+        """
+        Confirma os grupos candidatos em lotes de até confirm_lines linhas (um grupo maior
+        que o lote é confirmado sozinho). Retorna os relatórios em ordem da primeira linha.
+        """
+        runs = []
+        batch = []
+        batch_lines = 0
+        for lines in groups:
+            batch.append(lines)
+            batch_lines += len(lines)
+            if batch_lines >= self.confirm_lines:
+                path = self._new_report_path()
+                _write_reports(path, self._confirm_batch(batch, input_stream, fmt))
+                runs.append(path)
+                batch = []
+                batch_lines = 0
+        last = self._confirm_batch(batch, input_stream, fmt)
+        if not runs:
+            return iter(last)
+
+        runs = self._reduce_runs(runs, _read_reports, _write_reports, self._new_report_path, key=_first_line)
+        return heapq.merge(*map(_read_reports, runs), iter(last), key=_first_line)
+
+
+    def _confirm_batch(self, groups: list, input_stream, fmt: str) -> list:
+        """
+        Relê só os registros das linhas candidatas do lote e gera as senhas de novo.
+        Separa cada grupo pela senha completa (descartando falsos positivos da impressão digital)
+        e monta o relatório com os ids e a causa de cada colisão.
+        """
+        if not groups:
+            return []
+
+        flagged = {line for lines in groups for line in lines}
+        details = {}
+        input_stream.seek(0)
+        for line_no, raw in read_records(input_stream, fmt):
+            if line_no in flagged:
+                generator = self._inspector.generator_for(parse_record(raw))
+                details[line_no] = (generator.generate_password(), raw.get("id"), self._derivation_input(generator))
+
+        reports = []
+        for lines in groups:
+            by_password = {}
+            for line in lines:
+                by_password.setdefault(details[line][0], []).append(line)
+            for confirmed in by_password.values():
+                if len(confirmed) < 2:
+                    continue
+                report = {"lines": confirmed, "records": len(confirmed)}
+                ids = [details[line][1] for line in confirmed]
+                if any(account not in (None, "") for account in ids):
+                    report["ids"] = ids
+                report["same_input"] = len({details[line][2] for line in confirmed}) == 1
+                reports.append(report)
+        reports.sort(key=_first_line)
+        return reports
+
+
+    def _audit(self, input_stream, output_stream, fmt: str) -> dict:
+        """Procura as colisões em uma entrada que permite voltar ao início (ver run)."""
+        try:
+            for result in self.processor.process(read_records(input_stream, fmt)):
+                self.total += 1
+                if "error" in result:
+                    self.errors += 1  # Registros inválidos não entram na auditoria
+                    continue
+                self._add(self._fingerprint(result["password"]), result["line"])
+
+            spilled = self._table is None
+            sort_runs = self._run_count + (1 if self._buffer else 0)
+
+            collision_groups = 0
+            colliding_records = 0
+            for report in self._confirm(self._collisions(), input_stream, fmt):
+                output_stream.write(json.dumps(report, ensure_ascii=False) + "\n")
+                collision_groups += 1
+                colliding_records += report["records"]
+            output_stream.flush()
+        finally:
+            if self._work_dir is not None:
+                shutil.rmtree(self._work_dir, ignore_errors=True)
+
+        return {
+            "records": self.total,
+            "errors": self.errors,
+            "audited": self.total - self.errors,
+            "collision_groups": collision_groups,
+            "colliding_records": colliding_records,
+            "external_sort": spilled,
+            "sort_runs": sort_runs
+        }
+
+
+    def run(self, input_stream, output_stream, fmt: str = "jsonl") -> dict:
+        """
+        Gera as senhas do inventário e escreve em JSONL um grupo por senha repetida.
+        Retorna o resumo da auditoria.
+        """
+        if input_stream.seekable():
+            return self._audit(input_stream, output_stream, fmt)
+
+        # A confirmação relê as linhas candidatas: copia a entrada (stdin em pipe) para o disco
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="", dir=self.tmp_dir) as spool:
+            shutil.copyfileobj(input_stream, spool)
+            spool.seek(0)
+            return self._audit(spool, output_stream, fmt)
@@ -9,10 +9,22 @@
 #       - Remove acentos, espaços duplicados e pontuações para garantir que a entrada seja consistente.
 # 4 - Garante que todas as letras do alfabeto tenham substituições únicas
 #       - Se a key_phrase não for longa o suficiente, podemos completar com caracteres aleatórios.
+# 5 - Pré-compila uma tabela de tradução (str.maketrans)
+#       - A substituição vira uma única chamada a str.translate.
+# 6 - Mantém um cache LRU de configurações (ConfigCache / get_config)
+#       - Frases chave repetidas reaproveitam a configuração já calculada.
+#       - Acertos, falhas e o tempo de criação vão para o sink de instrumentation.py, se houver.
+#       - Com um arquivo de perfis (profile_store.py), as falhas são resolvidas pelo arquivo
+#         antes de recalcular a tabela.
 
 import string
-import unicodedata
 import hashlib
+from collections import OrderedDict
+from time import perf_counter_ns
+
+from modules import instrumentation
+
+from modules.text_normalizer import normalize_cached
 
 class ConfigGenerator:
 
@@ -21,18 +33,28 @@ class ConfigGenerator:
         """Inicializa a classe com a frase chave e gera o dicionário de substituições."""
         self.key_phrase = self._normalize_text(key_phrase)
         self.subst_dict = self._generate_subst_dict()
+        self.translation_table = str.maketrans(self.subst_dict)
+
 
+    # Monta a configuração a partir de uma tabela já calculada (ex.: arquivo de perfis)
+    # Não recalcula nada: só normaliza a frase (chave do cache) e compila a tabela de tradução
+    @classmethod
+    def from_subst_dict(cls, key_phrase: str, subst_dict: dict) -> "ConfigGenerator":
+        """Cria a configuração com um dicionário de substituições pré-calculado."""
+        config = cls.__new__(cls)
+        config.key_phrase = cls._normalize_text(key_phrase)
+        config.subst_dict = dict(subst_dict)
+        config.translation_table = str.maketrans(config.subst_dict)
+        return config
 
-    # Remove acentos usando unicodedata.normalize()
-    # Converte para minúsculas
-    # Remove espaços duplicados e pontuação
+
+    # Remove acentos, converte para minúsculas e remove espaços e pontuação
     # Exemplo: "Máximo Segurança!!" → "maximoseguranca"
-    def _normalize_text(self, text: str) -> str:
+    # Usa o normalizador compartilhado (com cache para frases chave repetidas)
+    @staticmethod
+    def _normalize_text(text: str) -> str:
         """Normaliza o texto removendo acentos, espaços e transformando tudo em minúsculas."""
-        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
-        text = text.lower()
-        text = ''.join(c for c in text if c.isalnum())  # Remove pontuação
-        return text
+        return normalize_cached(text)
 
 
     # Cria um alfabeto base (a-z)
@@ -67,6 +89,109 @@ class ConfigGenerator:
         """Retorna o dicionário de substituições gerado."""
         return self.subst_dict
 
+
+    # Retorna a tabela pronta para str.translate.
+    def get_translation_table(self) -> dict:
+        """Retorna a tabela de tradução pré-compilada a partir do dicionário de substituições."""
+        return self.translation_table
+
+
+class ConfigCache:
+    '''
+    Cache LRU limitado de instâncias de ConfigGenerator.
+
+    A chave é a frase chave normalizada, então variações de acento, caixa ou
+    pontuação da mesma frase compartilham a mesma configuração.
+    '''
+
+    def __init__(self, maxsize: int = 128, store=None):
+        """
+        Inicializa o cache com o tamanho máximo informado.
+        store: arquivo de perfis (ProfileStore) consultado antes de calcular uma configuração.
+        """
+        if maxsize < 1:
+            raise ValueError("O tamanho do cache deve ser pelo menos 1.")
+        self.maxsize = maxsize
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self._entries = OrderedDict()
+
+
+    def get(self, key_phrase: str) -> ConfigGenerator:
+        """Retorna a configuração da frase chave, criando-a apenas se não estiver no cache."""
+        key = ConfigGenerator._normalize_text(key_phrase)
+        config = self._entries.get(key)
+        sink = instrumentation.sink
+
+        if config is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if sink is not None:
+                sink.count("config_cache.hit")
+            return config
+
+        self.misses += 1
+        start = perf_counter_ns() if sink is not None else 0
+        config = self.store.get(key_phrase) if self.store is not None else None
+        if config is not None:
+            self.store_hits += 1
+            if sink is not None:
+                sink.lap("config.store", start)
+                sink.count("config_cache.store_hit")
+        else:
+            config = ConfigGenerator(key_phrase)
+            if sink is not None:
+                sink.lap("config.build", start)
+        if sink is not None:
+            sink.count("config_cache.miss")
+        self._entries[key] = config
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)  # Descarta a configuração menos usada
+        return config
+
+
+    def add(self, config: ConfigGenerator):
+        """Insere uma configuração já calculada (por exemplo, recebida de outro processo)."""
+        self._entries[config.key_phrase] = config
+        self._entries.move_to_end(config.key_phrase)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+    def info(self) -> dict:
+        """Retorna as estatísticas de uso do cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "store_hits": self.store_hits,
+            "maxsize": self.maxsize,
+            "currsize": len(self._entries)
+        }
+
+
+    def clear(self):
+        """Esvazia o cache e zera as estatísticas."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+
+
+# Cache compartilhado pelo processo
+_default_cache = ConfigCache()
+
+
+def get_config(key_phrase: str) -> ConfigGenerator:
+    """Retorna um ConfigGenerator do cache compartilhado do processo."""
+    return _default_cache.get(key_phrase)
+
+
+def config_cache_info() -> dict:
+    """Retorna as estatísticas do cache compartilhado (hits, misses, tamanho)."""
+    return _default_cache.info()
+
 '''
     Teste
 
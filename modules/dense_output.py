@@ -0,0 +1,64 @@
+# O que faz?
+# Modo de saída "dense": senha de qualquer comprimento sobre um alfabeto grande.
+# 1 - Usa SHAKE-256 (função de saída extensível) no lugar do hexdigest do SHA-256
+#   - Gera exatamente os bytes necessários em uma única passada, sem limite de 64 caracteres.
+# 2 - Mapeia os bytes no alfabeto sem viés (amostragem por rejeição)
+#   - Bytes >= 256 - (256 % tamanho do alfabeto) são descartados.
+#   - Os bytes aceitos viram alfabeto[byte % tamanho].
+# 3 - O resultado de um comprimento menor é sempre prefixo do de um comprimento maior
+#   - Por isso várias variantes saem do mesmo fluxo de bytes.
+# Com o alfabeto completo (94 símbolos) cada caractere carrega ~6,5 bits, contra 4 bits do hexadecimal.
+
+import math
+import string
+
+
+SPECIAL_CHARS = "!#$%&()*+-;<=>?@^_{|}~"
+
+ALPHABETS = {
+    "alnum": string.ascii_letters + string.digits,
+    "full": string.ascii_letters + string.digits + SPECIAL_CHARS,
+}
+
+OUTPUT_MODES = ("hex", "dense")
+
+
+def validate_alphabet(alphabet: str) -> str:
+    """Valida um alfabeto personalizado (ou o nome de um alfabeto pronto) e o retorna."""
+    alphabet = ALPHABETS.get(alphabet, alphabet)
+    if len(set(alphabet)) != len(alphabet):
+        raise ValueError("O alfabeto não pode ter caracteres repetidos.")
+    if not 2 <= len(alphabet) <= 256:
+        raise ValueError("O alfabeto deve ter entre 2 e 256 caracteres.")
+    if any(char.isspace() or not char.isprintable() for char in alphabet):
+        # Espaços e caracteres de controle não podem ser digitados nem copiados com segurança
+        raise ValueError("O alfabeto só pode ter caracteres visíveis (sem espaços nem caracteres de controle).")
+    return alphabet
+
+
+def map_to_alphabet(xof, length: int, alphabet: str) -> str:
+    """
+    Lê do XOF (ex.: hashlib.shake_256) os bytes necessários e os converte em
+    `length` caracteres do alfabeto, sem viés.
+    """
+    size = len(alphabet)
+    limit = 256 - (256 % size)  # Bytes aceitos: 0 .. limit-1
+
+    # Estimativa com folga para quase sempre bastar uma leitura
+    needed = math.ceil(length * 256 / limit) + 16
+
+    if alphabet.isascii():
+        # Tabela de tradução byte → caractere; os bytes rejeitados são removidos em C
+        table = bytes(ord(alphabet[b % size]) if b < limit else 0 for b in range(256))
+        rejected = bytes(range(limit, 256))
+        while True:
+            mapped = xof.digest(needed).translate(table, rejected)
+            if len(mapped) >= length:
+                return mapped[:length].decode("ascii")
+            needed *= 2
+
+    while True:
+        mapped = [alphabet[b % size] for b in xof.digest(needed) if b < limit]
+        if len(mapped) >= length:
+            return ''.join(mapped[:length])
+        needed *= 2
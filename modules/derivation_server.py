@@ -0,0 +1,411 @@
+# O que faz?
+# Serviço local (asyncio) de geração de senhas e análise de força.
+# 1 - Atende HTTP em localhost ou em um socket Unix
+#   - POST /derive   → {"base_phrase", "key_phrase", "salt", "pwd_length", "extended_chars"} (ou uma lista)
+#   - POST /strength → {"password": "...", "metrics": [...]} ou {"passwords": [...]}
+#   - GET  /metrics  → latência (p50/p90/p99), vazão e tamanho médio dos lotes
+#   - GET  /health   → {"status": "ok"}
+# 2 - Agrupa requisições concorrentes em lotes (até batch_size itens)
+#   - Com o pool ocioso, o lote sai assim que a fila esvazia: uma requisição sozinha não espera.
+#   - Com lotes em andamento, espera até max_wait_ms por mais itens; enquanto todos os processos
+#     estão ocupados, as requisições que chegam entram no próximo lote.
+# 3 - Envia o trabalho pesado para um pool de processos
+#   - O event loop nunca executa hashing; só recebe, agrupa e responde.
+#   - Cada processo mantém o cache de ConfigGenerator aquecido entre requisições.
+#   - A análise de força usa as opções do serviço (perfil de atacante, detecção de padrões,
+#     senhas vazadas); o índice de palavras e o arquivo de vazamentos são abertos uma única vez
+#     em cada processo.
+#   - Políticas nomeadas (--policy_file) e o arquivo de perfis valem como na CLI e no modo em lote.
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from modules.config_generator import ConfigGenerator
+from modules.parallel_engine import _derive_chunk, _init_worker, open_strength_options
+from modules.password_strenght import PasswordStrength
+
+
+MAX_BODY_SIZE = 1024 * 1024
+MAX_HEADER_LINES = 100
+
+HTTP_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+# Opções do PasswordStrength em cada processo de trabalho (criadas pelo initializer)
+_worker_strength_options = {}
+
+
+def _init_service_worker(configs: list, cache_size: int, generator_options: dict, strength_options: dict,
+                         profile_store: str = None, policies: dict = None):
+    """Prepara o processo de trabalho: caches de geração e opções da análise de força."""
+    global _worker_strength_options
+    _init_worker(configs, cache_size, generator_options, False, profile_store, policies, None, strength_options)
+    _worker_strength_options = open_strength_options(strength_options)  # Os arquivos são abertos uma vez por processo
+
+
+def _analyze_passwords(items: list) -> list:
+    """Analisa um lote de (senha, métricas) no processo de trabalho."""
+    results = []
+    for password, metrics in items:
+        try:
+            results.append(PasswordStrength(password, **_worker_strength_options).get_password_analysis(metrics))
+        except ValueError as ve:
+            results.append({"error": str(ve)})
+    return results
+
+
+def _derive_records(records: list) -> list:
+    """Gera as senhas de um lote de registros no processo de trabalho."""
+    results = _derive_chunk(list(enumerate(records)))[0]
+    for result in results:
+        result.pop("line", None)
+    return results
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Retorna o percentil de uma lista já ordenada (método do vizinho mais próximo)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class DerivationService:
+    '''
+    Núcleo do serviço: fila de requisições, agrupamento em lotes e métricas.
+
+    Independe do protocolo: o servidor HTTP apenas chama derive() e analyze().
+    '''
+
+    def __init__(self, workers: int = None, batch_size: int = 64, max_wait_ms: float = 2.0,
+                 generator_options: dict = None, key_phrases=(), latency_window: int = 10_000,
+                 strength_options: dict = None, profile_store: str = None, policies: dict = None):
+        """
+        Inicializa o serviço (o pool de processos só é criado em start()).
+        profile_store / policies: como no ParallelDeriver (arquivo de perfis e políticas nomeadas).
+        """
+        if batch_size < 1:
+            raise ValueError("O tamanho do lote deve ser pelo menos 1.")
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.generator_options = generator_options or {}
+        # Opções da análise de força: attacker_profile, pattern_check, dictionary_index, breach_corpus, breach_bloom
+        self.strength_options = strength_options or {}
+        self.profile_store = profile_store
+        self.policies = policies
+        self.configs = [ConfigGenerator(key_phrase) for key_phrase in dict.fromkeys(key_phrases)]
+
+        self._executor = None
+        self._queue = None
+        self._batcher = None
+        self._slots = None
+        self._tasks = set()
+
+        # Métricas
+        self._latencies = deque(maxlen=latency_window)
+        self._started_at = time.monotonic()
+        self.requests = 0
+        self.batches = 0
+        self.batched_items = 0
+
+
+    async def start(self):
+        """Cria o pool de processos e a tarefa que agrupa as requisições."""
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_service_worker,
+            initargs=(self.configs, 128, self.generator_options, self.strength_options,
+                      self.profile_store, self.policies)
+        )
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers * 2)  # Lotes em andamento ao mesmo tempo
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._started_at = time.monotonic()
+
+
+    async def close(self):
+        """Encerra a tarefa de agrupamento e o pool de processos."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+    async def _submit(self, kind: str, payload):
+        """Coloca um item na fila e aguarda o resultado do lote em que ele entrar."""
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await self._queue.put((kind, payload, future))
+        try:
+            return await future
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+            self.requests += 1
+
+
+    async def derive(self, record: dict) -> dict:
+        """Gera a senha de um registro (agrupado com outras requisições concorrentes)."""
+        return await self._submit("derive", record)
+
+
+    async def analyze(self, password: str, metrics=None) -> dict:
+        """Analisa a força de uma senha (agrupada com outras requisições concorrentes)."""
+        return await self._submit("strength", (password, tuple(metrics) if metrics else None))
+
+
+    def _drain(self, batch: list):
+        """Move para o lote os itens que já estão na fila, sem esperar (até batch_size)."""
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+
+    async def _batch_loop(self):
+        """
+        Junta itens da fila em lotes de até batch_size e os despacha.
+        Com o pool ocioso, o lote sai assim que a fila esvazia; só com lotes em andamento
+        espera até max_wait por mais itens.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+
+            if self._tasks and self.max_wait > 0:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                    self._drain(batch)
+
+            await self._slots.acquire()
+            self._drain(batch)  # Itens que chegaram enquanto todos os processos estavam ocupados
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+
+    async def _run_batch(self, batch: list):
+        """Executa um lote no pool de processos e entrega cada resultado à sua requisição."""
+        loop = asyncio.get_running_loop()
+        try:
+            for kind, worker in (("derive", _derive_records), ("strength", _analyze_passwords)):
+                items = [(payload, future) for item_kind, payload, future in batch if item_kind == kind]
+                if not items:
+                    continue
+
+                self.batches += 1
+                self.batched_items += len(items)
+                try:
+                    results = await loop.run_in_executor(self._executor, worker, [payload for payload, _ in items])
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+    def metrics(self) -> dict:
+        """Retorna latência (ms) por percentil, vazão e estatísticas dos lotes."""
+        latencies = sorted(self._latencies)
+        uptime = time.monotonic() - self._started_at
+        return {
+            "requests": self.requests,
+            "uptime_s": round(uptime, 3),
+            "throughput_rps": round(self.requests / uptime, 3) if uptime > 0 else 0.0,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_items / self.batches, 3) if self.batches else 0.0,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+                "p90": round(_percentile(latencies, 0.90) * 1000, 3),
+                "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0
+            }
+        }
+
+
+class HttpError(Exception):
+    """Erro HTTP com código de status e mensagem."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_request(reader) -> tuple:
+    """Lê uma requisição HTTP/1.1. Retorna (método, caminho, cabeçalhos, corpo) ou None no fim da conexão."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    try:
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Linha de requisição inválida.")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Cabeçalhos demais.")
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HttpError(400, "Content-Length inválido.")
+    if length > MAX_BODY_SIZE:
+        raise HttpError(413, "Corpo da requisição grande demais.")
+
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], headers, body
+
+
+def _parse_json(body: bytes):
+    """Decodifica o corpo JSON da requisição."""
+    try:
+        return json.loads(body or b"null")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise HttpError(400, "Corpo JSON inválido.")
+
+
+async def _route(service: DerivationService, method: str, path: str, body: bytes) -> tuple:
+    """Encaminha a requisição para o serviço. Retorna (status, objeto JSON)."""
+    if path == "/health":
+        return 200, {"status": "ok"}
+
+    if path == "/metrics":
+        if method != "GET":
+            raise HttpError(405, "Use GET em /metrics.")
+        return 200, service.metrics()
+
+    if path == "/derive":
+        if method != "POST":
+            raise HttpError(405, "Use POST em /derive.")
+        payload = _parse_json(body)
+        if isinstance(payload, list):
+            return 200, list(await asyncio.gather(*(service.derive(record) for record in payload)))
+        result = await service.derive(payload)
+        return (400 if "error" in result else 200), result
+
+    if path == "/strength":
+        if method != "POST":
+            raise HttpError(405, "Use POST em /strength.")
+        payload = _parse_json(body)
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Envie um objeto com 'password' ou 'passwords'.")
+        metrics = payload.get("metrics")
+        if isinstance(payload.get("passwords"), list):
+            return 200, list(await asyncio.gather(
+                *(service.analyze(str(password), metrics) for password in payload["passwords"])))
+        if not isinstance(payload.get("password"), str):
+            raise HttpError(400, "Campo obrigatório ausente: password.")
+        result = await service.analyze(payload["password"], metrics)
+        return (400 if "error" in result else 200), result
+
+    raise HttpError(404, f"Rota desconhecida: {path}")
+
+
+async def handle_connection(service: DerivationService, reader, writer):
+    """Atende uma conexão HTTP (com keep-alive) até o cliente fechar."""
+    try:
+        while True:
+            keep_alive = True
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await _route(service, method, path, body)
+            except HttpError as he:
+                status, payload = he.status, {"error": str(he)}
+                keep_alive = False
+            except asyncio.IncompleteReadError:
+                break
+            except Exception as e:
+                status, payload = 500, {"error": f"Ocorreu um erro inesperado: {e}"}
+
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_STATUS.get(status, 'OK')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(service: DerivationService, host: str = "127.0.0.1", port: int = 8765, unix_socket: str = None):
+    """Inicia o serviço e atende até ser interrompido."""
+    await service.start()
+
+    def handler(reader, writer):
+        return handle_connection(service, reader, writer)
+
+    if unix_socket:
+        server = await asyncio.start_unix_server(handler, path=unix_socket)
+        address = unix_socket
+    else:
+        server = await asyncio.start_server(handler, host=host, port=port)
+        address = f"http://{host}:{port}"
+
+    print(f"Serviço de senhas ouvindo em {address}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8765, unix_socket: str = None, **service_options):
+    """Atalho síncrono: cria o serviço e atende até Ctrl+C."""
+    service = DerivationService(**service_options)
+    try:
+        asyncio.run(serve(service, host, port, unix_socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,248 @@
+# O que faz?
+# Instrumentação leve por etapa (normalização, substituição, hash, especiais, score...).
+# 1 - Um "sink" recebe os tempos (em nanossegundos) e contadores de cada etapa
+#   - CallbackSink: chama uma função a cada evento.
+#   - HistogramSink: acumula histogramas em memória (p50/p90/p99 por etapa) e exporta em JSON.
+#   - JsonSink: escreve cada evento como uma linha JSON em um arquivo.
+# 2 - Desligada por padrão: sem sink instalado, cada etapa custa só uma leitura de variável
+#   e um "is not None" (nenhuma medição de tempo, nenhuma chamada extra).
+# 3 - Uso no código instrumentado:
+#       sink = instrumentation.sink
+#       start = perf_counter_ns() if sink is not None else 0
+#       ... etapa ...
+#       if sink is not None:
+#           start = sink.lap("generator.hash", start)
+# 4 - O sink vale para o processo inteiro (install/uninstall). Processos de trabalho
+#   acumulam em um HistogramSink próprio e o processo principal junta os resultados (merge).
+
+import json
+from abc import ABC, abstractmethod
+from time import perf_counter_ns
+
+
+# Sink ativo no processo (None = instrumentação desligada)
+sink = None
+
+# Cada potência de 2 é dividida em 8 faixas: erro máximo de ~12% nos percentis
+_SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+def install(new_sink):
+    """Instala o sink do processo e retorna o anterior."""
+    global sink
+    previous = sink
+    sink = new_sink
+    return previous
+
+
+def uninstall():
+    """Desliga a instrumentação e retorna o sink que estava instalado."""
+    return install(None)
+
+
+def bucket_index(nanoseconds: int) -> int:
+    """Índice da faixa do histograma (log-linear) de uma duração."""
+    if nanoseconds < _SUB_BUCKETS:
+        return max(nanoseconds, 0)
+    bits = nanoseconds.bit_length()
+    top = nanoseconds >> (bits - _SUB_BUCKET_BITS - 1)  # Os 4 bits mais altos: 8..15
+    return (bits - _SUB_BUCKET_BITS) * _SUB_BUCKETS + top - _SUB_BUCKETS
+
+
+def bucket_bounds(index: int) -> tuple:
+    """Retorna (início, fim) em nanossegundos da faixa do histograma."""
+    if index < _SUB_BUCKETS:
+        return index, index + 1
+    bits = index // _SUB_BUCKETS + _SUB_BUCKET_BITS
+    top = index % _SUB_BUCKETS + _SUB_BUCKETS
+    width = 1 << (bits - _SUB_BUCKET_BITS - 1)
+    return top * width, (top + 1) * width
+
+
+class Sink(ABC):
+    '''
+    Interface dos sinks: record() para tempos e count() para contadores.
+    Um sink que não implementa os dois falha já ao ser criado.
+    '''
+
+    @abstractmethod
+    def record(self, stage: str, nanoseconds: int):
+        """Registra a duração de uma execução da etapa."""
+
+
+    @abstractmethod
+    def count(self, name: str, value: int = 1):
+        """Soma value ao contador."""
+
+
+    def lap(self, stage: str, start: int) -> int:
+        """Registra o tempo desde start e retorna o instante atual (início da próxima etapa)."""
+        now = perf_counter_ns()
+        self.record(stage, now - start)
+        return now
+
+
+    def merge(self, snapshot: dict):
+        """Junta um snapshot de HistogramSink (ex.: de outro processo) repetindo seus eventos."""
+        for stage, data in snapshot.get("stages", {}).items():
+            for index, hits in data["buckets"].items():
+                low, high = bucket_bounds(int(index))
+                for _ in range(hits):
+                    self.record(stage, (low + high) // 2)
+        for name, value in snapshot.get("counters", {}).items():
+            self.count(name, value)
+
+
+class CallbackSink(Sink):
+    '''
+    Repassa cada evento para uma função: callback(tipo, nome, valor),
+    com tipo "time" (valor em nanossegundos) ou "count".
+    '''
+
+    def __init__(self, callback):
+        """Inicializa o sink com a função que recebe os eventos."""
+        self.callback = callback
+
+
+    def record(self, stage: str, nanoseconds: int):
+        """Repassa a duração da etapa."""
+        self.callback("time", stage, nanoseconds)
+
+
+    def count(self, name: str, value: int = 1):
+        """Repassa o contador."""
+        self.callback("count", name, value)
+
+
+class HistogramSink(Sink):
+    '''
+    Acumula, por etapa, um histograma log-linear das durações e os contadores.
+
+    Memória constante por etapa (no máximo algumas centenas de faixas),
+    independentemente da quantidade de eventos.
+    '''
+
+    def __init__(self):
+        """Inicializa o sink vazio."""
+        self.stages = {}
+        self.counters = {}
+
+
+    def record(self, stage: str, nanoseconds: int):
+        """Registra a duração na faixa correspondente do histograma da etapa."""
+        data = self.stages.get(stage)
+        if data is None:
+            data = self.stages[stage] = {"count": 0, "total": 0, "max": 0, "buckets": {}}
+        data["count"] += 1
+        data["total"] += nanoseconds
+        if nanoseconds > data["max"]:
+            data["max"] = nanoseconds
+        index = bucket_index(nanoseconds)
+        buckets = data["buckets"]
+        buckets[index] = buckets.get(index, 0) + 1
+
+
+    def count(self, name: str, value: int = 1):
+        """Soma value ao contador."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+
+    def merge(self, snapshot: dict):
+        """Junta um snapshot (de snapshot()) somando faixas e contadores, sem perda de precisão."""
+        for stage, other in snapshot.get("stages", {}).items():
+            data = self.stages.get(stage)
+            if data is None:
+                data = self.stages[stage] = {"count": 0, "total": 0, "max": 0, "buckets": {}}
+            data["count"] += other["count"]
+            data["total"] += other["total"]
+            data["max"] = max(data["max"], other["max"])
+            for index, hits in other["buckets"].items():
+                index = int(index)
+                data["buckets"][index] = data["buckets"].get(index, 0) + hits
+        for name, value in snapshot.get("counters", {}).items():
+            self.count(name, value)
+
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """Retorna o estado bruto (serializável); reset=True zera o sink."""
+        state = {
+            "stages": {stage: {**data, "buckets": dict(data["buckets"])} for stage, data in self.stages.items()},
+            "counters": dict(self.counters)
+        }
+        if reset:
+            self.stages = {}
+            self.counters = {}
+        return state
+
+
+    @staticmethod
+    def _percentile(data: dict, fraction: float) -> float:
+        """Percentil aproximado (meio da faixa, limitado à máxima) a partir do histograma."""
+        buckets = data["buckets"]
+        target = max(1, round(fraction * data["count"]))
+        seen = 0
+        for index in sorted(buckets):
+            seen += buckets[index]
+            if seen >= target:
+                low, high = bucket_bounds(index)
+                return min((low + high) / 2, data["max"])
+        return 0.0
+
+
+    def summary(self) -> dict:
+        """Retorna, por etapa, quantidade, total (ms) e latências (µs): média, p50, p90, p99 e máxima."""
+        stages = {}
+        for stage in sorted(self.stages):
+            data = self.stages[stage]
+            stages[stage] = {
+                "count": data["count"],
+                "total_ms": round(data["total"] / 1e6, 3),
+                "mean_us": round(data["total"] / data["count"] / 1e3, 3),
+                "p50_us": round(self._percentile(data, 0.50) / 1e3, 3),
+                "p90_us": round(self._percentile(data, 0.90) / 1e3, 3),
+                "p99_us": round(self._percentile(data, 0.99) / 1e3, 3),
+                "max_us": round(data["max"] / 1e3, 3)
+            }
+        return {"stages": stages, "counters": dict(sorted(self.counters.items()))}
+
+
+    def format_table(self) -> str:
+        """Retorna o resumo como tabela de texto (uma linha por etapa)."""
+        summary = self.summary()
+        lines = [f"{'etapa':<24} {'n':>9} {'média µs':>10} {'p50 µs':>10} {'p90 µs':>10} {'p99 µs':>10} {'máx µs':>10}"]
+        for stage, data in summary["stages"].items():
+            lines.append(f"{stage:<24} {data['count']:>9} {data['mean_us']:>10.2f} {data['p50_us']:>10.2f} "
+                         f"{data['p90_us']:>10.2f} {data['p99_us']:>10.2f} {data['max_us']:>10.2f}")
+        for name, value in summary["counters"].items():
+            lines.append(f"{name:<24} {value:>9}")
+        return "\n".join(lines)
+
+
+    def dump(self, path: str):
+        """Salva o resumo e o histograma bruto em um arquivo JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**self.summary(), "raw": self.snapshot()}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+class JsonSink(Sink):
+    '''
+    Escreve cada evento como uma linha JSON no fluxo informado.
+
+    Útil para análises externas; para volumes grandes prefira o HistogramSink.
+    '''
+
+    def __init__(self, stream):
+        """Inicializa o sink com o fluxo de saída (aberto em modo texto)."""
+        self.stream = stream
+
+
+    def record(self, stage: str, nanoseconds: int):
+        """Escreve o evento de tempo."""
+        self.stream.write(json.dumps({"stage": stage, "ns": nanoseconds}) + "\n")
+
+
+    def count(self, name: str, value: int = 1):
+        """Escreve o evento de contador."""
+        self.stream.write(json.dumps({"counter": name, "value": value}) + "\n")
@@ -0,0 +1,141 @@
+# O que faz?
+# 1 - Oferece um modo opcional de "key stretching" para a mistura com o salt
+#   - Em vez de um único SHA-256, usa PBKDF2-HMAC-SHA256 ou scrypt (hashlib).
+#   - Cada tentativa de um atacante passa a custar o mesmo tempo que a geração.
+# 2 - Os parâmetros de custo são explícitos e ficam salvos em um arquivo JSON
+#   - Exemplo: {"algorithm": "pbkdf2_sha256", "iterations": 600000}
+#   - Exemplo: {"algorithm": "scrypt", "n": 16384, "r": 8, "p": 1}
+#   - Com os mesmos parâmetros, a senha gerada é sempre a mesma.
+# 3 - Calibra o custo para esta máquina
+#   - Mede o tempo de uma derivação e escolhe o custo que atinge a latência alvo (ex.: 100 ms).
+
+import hashlib
+import json
+import time
+
+
+KDF_ALGORITHMS = ("pbkdf2_sha256", "scrypt")
+
+# Tamanho da chave derivada: 32 bytes → 64 caracteres hexadecimais, como no SHA-256
+DERIVED_KEY_LENGTH = 32
+
+
+def _scrypt_maxmem(n: int, r: int, p: int) -> int:
+    """Calcula o limite de memória necessário para o scrypt com folga."""
+    return 128 * r * (n + p + 2) + 1024 * 1024
+
+
+def _int_param(params: dict, name: str) -> int:
+    """Lê um parâmetro de custo inteiro do dicionário de parâmetros."""
+    if name not in params:
+        raise ValueError(f"Parâmetro de KDF ausente: {name}.")
+    value = params[name]
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"O parâmetro {name} do KDF deve ser um número inteiro.")
+    return value
+
+
+def validate_params(params: dict) -> dict:
+    """Valida os parâmetros do KDF e retorna uma cópia normalizada."""
+    if not isinstance(params, dict):
+        raise ValueError("Os parâmetros do KDF devem ser um objeto JSON.")
+
+    algorithm = params.get("algorithm")
+    if algorithm not in KDF_ALGORITHMS:
+        raise ValueError(f"Algoritmo de KDF desconhecido: '{algorithm}'. Use um de: {', '.join(KDF_ALGORITHMS)}.")
+
+    if algorithm == "pbkdf2_sha256":
+        iterations = _int_param(params, "iterations")
+        if iterations < 1:
+            raise ValueError("O número de iterações do PBKDF2 deve ser pelo menos 1.")
+        return {"algorithm": algorithm, "iterations": iterations}
+
+    n, r, p = _int_param(params, "n"), _int_param(params, "r"), _int_param(params, "p")
+    if n < 2 or n & (n - 1):
+        raise ValueError("O parâmetro n do scrypt deve ser uma potência de 2 maior que 1.")
+    if r < 1 or p < 1:
+        raise ValueError("Os parâmetros r e p do scrypt devem ser pelo menos 1.")
+    return {"algorithm": algorithm, "n": n, "r": r, "p": p}
+
+
+def derive_key(password, salt, params: dict) -> bytes:
+    """
+    Deriva a chave (DERIVED_KEY_LENGTH bytes) a partir de buffers já codificados em UTF-8.
+    Aceita bytes, bytearray ou memoryview, sem cópias extras (secure_derivation.py).
+    """
+    if params["algorithm"] == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password, salt, params["iterations"], DERIVED_KEY_LENGTH)
+    n, r, p = params["n"], params["r"], params["p"]
+    return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p,
+                          maxmem=_scrypt_maxmem(n, r, p), dklen=DERIVED_KEY_LENGTH)
+
+
+def stretch(text: str, salt: str, params: dict) -> str:
+    """Deriva a chave da frase transformada e do salt. Retorna 64 caracteres hexadecimais."""
+    return derive_key(text.encode("utf-8"), salt.encode("utf-8"), params).hex()
+
+
+def _measure_ms(params: dict, repeat: int = 3) -> float:
+    """Mede o menor tempo (ms) de uma derivação com os parâmetros informados."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stretch("calibracao", "salt", params)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def calibrate(algorithm: str = "pbkdf2_sha256", target_ms: float = 100.0) -> dict:
+    """
+    Escolhe o custo que faz uma derivação levar aproximadamente target_ms nesta máquina.
+    Retorna os parâmetros prontos para salvar, com o tempo medido em "measured_ms".
+    """
+    if target_ms <= 0:
+        raise ValueError("A latência alvo deve ser maior que zero.")
+
+    if algorithm == "pbkdf2_sha256":
+        # Mede uma amostra grande o suficiente para o tempo ser confiável e extrapola
+        iterations = 10_000
+        elapsed = _measure_ms({"algorithm": algorithm, "iterations": iterations})
+        while elapsed < 20 and elapsed < target_ms:
+            iterations *= 2
+            elapsed = _measure_ms({"algorithm": algorithm, "iterations": iterations})
+
+        iterations = max(1, int(iterations * target_ms / max(elapsed, 1e-6)))
+        params = {"algorithm": algorithm, "iterations": iterations}
+
+    elif algorithm == "scrypt":
+        # O custo do scrypt cresce em potências de 2: dobra n até passar do alvo
+        # e fica com o valor mais próximo dele
+        params = {"algorithm": algorithm, "n": 2 ** 10, "r": 8, "p": 1}
+        elapsed = _measure_ms(params)
+        while elapsed < target_ms:
+            candidate = dict(params, n=params["n"] * 2)
+            candidate_elapsed = _measure_ms(candidate)
+            if abs(candidate_elapsed - target_ms) > abs(elapsed - target_ms):
+                break
+            params, elapsed = candidate, candidate_elapsed
+
+    else:
+        raise ValueError(f"Algoritmo de KDF desconhecido: '{algorithm}'. Use um de: {', '.join(KDF_ALGORITHMS)}.")
+
+    params = validate_params(params)
+    params["measured_ms"] = round(_measure_ms(params), 2)
+    return params
+
+
+def save_params(path: str, params: dict):
+    """Salva os parâmetros do KDF em um arquivo JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(params, f, indent=2)
+        f.write("\n")
+
+
+def load_params(path: str) -> dict:
+    """Carrega e valida os parâmetros do KDF de um arquivo JSON."""
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            params = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Arquivo de KDF inválido: {e.msg}.")
+    return validate_params(params)
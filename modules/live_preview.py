@@ -0,0 +1,103 @@
+# O que faz?
+# Prévia ao vivo da senha, usada pela interface gráfica (gui.py), sem depender do Tk.
+# 1 - PreviewPipeline guarda o resultado de cada etapa da geração e só recalcula o necessário
+#   - Mudar o comprimento ou a opção de caracteres especiais não normaliza nem substitui
+#     a frase base de novo, nem recalcula o hash.
+#   - A senha é sempre igual à de PasswordGenerator.generate_password() com os mesmos campos.
+# 2 - DerivationWorker executa a geração e a análise de força em uma thread de trabalho
+#   - A interface só envia pedidos (submit) e lê a fila de resultados (results).
+#   - Só o pedido mais recente importa: pedidos antigos ainda na fila são descartados.
+
+import queue
+import threading
+
+from modules.config_generator import get_config
+from modules.password_generator import PasswordGenerator
+from modules.password_strenght import PasswordStrength
+
+
+class PreviewPipeline:
+    '''
+    Guarda o resultado de cada etapa da geração e só recalcula o necessário.
+
+    Etapas e suas entradas:
+    1 - Frase base normalizada e substituída → (frase base, frase chave)
+    2 - Hash com o salt                       → (etapa 1, salt)
+    3 - Corte no comprimento e especiais      → (etapa 2, comprimento, caracteres especiais)
+    '''
+
+    def __init__(self):
+        """Inicializa o pipeline sem nenhuma etapa calculada."""
+        self._subst_key = None
+        self._generator = None
+        self._transformed = None
+        self._digest_key = None
+        self._digest = None
+
+
+    def compute(self, base_phrase: str, key_phrase: str, salt: str, pwd_length: int, extended_chars: bool) -> str:
+        """Gera a senha reaproveitando as etapas cujas entradas não mudaram."""
+        # Etapa 1: normalização e substituição da frase base
+        if self._subst_key != (base_phrase, key_phrase):
+            config = get_config(key_phrase)
+            self._generator = PasswordGenerator(
+                base_phrase=base_phrase,
+                subst_dict=config.get_subst_dict(),
+                salt=salt,
+                pwd_length=pwd_length,
+                extended_chars=extended_chars,
+                translation_table=config.get_translation_table()
+            )
+            self._transformed = self._generator._apply_substitutions(self._generator.base_phrase)
+            self._subst_key = (base_phrase, key_phrase)
+            self._digest_key = None
+
+        generator = self._generator
+
+        # Etapa 2: hash com o salt (independe do comprimento)
+        if self._digest_key != salt:
+            generator.salt = generator._normalize_text(salt)
+            self._digest = generator._hash_with_salt(self._transformed)
+            self._digest_key = salt
+
+        # Etapa 3: corte e caracteres especiais (baratos)
+        generator.pwd_length = pwd_length
+        generator.extended_chars = extended_chars
+        return generator._add_special_chars(self._digest[:pwd_length])
+
+
+class DerivationWorker:
+    '''
+    Thread de trabalho que executa a geração fora da thread do Tk.
+
+    Só o pedido mais recente importa: pedidos antigos ainda na fila são descartados.
+    '''
+
+    def __init__(self):
+        """Inicia a thread de trabalho."""
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pipeline = PreviewPipeline()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+
+    def submit(self, request_id: int, params: tuple):
+        """Envia um pedido de geração (request_id identifica o pedido mais recente)."""
+        self.requests.put((request_id, params))
+
+
+    def _run(self):
+        """Laço da thread: processa sempre o pedido mais recente."""
+        while True:
+            request = self.requests.get()
+            while not self.requests.empty():
+                request = self.requests.get_nowait()
+
+            request_id, params = request
+            try:
+                password = self.pipeline.compute(*params)
+                analysis = PasswordStrength(password).get_password_analysis()
+                self.results.put((request_id, analysis, None))
+            except Exception as e:
+                self.results.put((request_id, None, e))
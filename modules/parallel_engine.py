@@ -0,0 +1,193 @@
+# O que faz?
+# 1 - Distribui a geração de senhas em lote entre vários processos
+#   - Usa um ProcessPoolExecutor com um processo por núcleo (padrão).
+# 2 - Agrupa os registros em blocos de tamanho configurável (chunk_size)
+#   - Cada bloco é uma única tarefa, o que reduz o custo de comunicação.
+# 3 - Envia as tabelas de substituição uma única vez para cada processo
+#   - As frases chave conhecidas são pré-calculadas e entregues no initializer.
+#   - As demais são calculadas no próprio processo e ficam no cache dele.
+#   - As tarefas carregam apenas os registros, nunca as tabelas.
+# 4 - Devolve os resultados na mesma ordem da entrada
+#   - Mantém um número limitado de blocos em andamento (memória limitada).
+# 5 - Com um arquivo de perfis (profile_store), cada processo o abre via mmap e resolve
+#   as frases chave por ele antes de calcular as tabelas.
+# 6 - Com a instrumentação ligada no processo principal, cada processo de trabalho
+#   acumula um HistogramSink próprio e o devolve junto com cada bloco (merge no principal).
+# 7 - As opções da análise de força viajam como caminhos de arquivo (open_strength_options):
+#   cada processo abre uma única vez o índice de palavras e o arquivo de vazamentos (mmap).
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from modules import instrumentation
+from modules.batch_processor import BatchProcessor, read_records
+from modules.breach_check import open_corpus
+from modules.config_generator import ConfigCache, ConfigGenerator
+from modules.pattern_analyzer import open_analyzer
+from modules.profile_store import open_store
+
+
+# Estado de cada processo de trabalho (criado pelo initializer)
+_worker_processor = None
+
+
+def open_strength_options(spec: dict) -> dict:
+    """
+    Converte as opções da análise de força em caminhos (attacker_profile, pattern_check,
+    dictionary_index, breach_corpus, breach_bloom) nos argumentos do PasswordStrength.
+    """
+    options = dict(spec or {})
+    if options.pop("pattern_check", False) or options.get("dictionary_index"):
+        options["pattern_analyzer"] = open_analyzer(options.get("dictionary_index"))
+    options.pop("dictionary_index", None)
+    if options.get("breach_corpus"):
+        options["breach_corpus"] = open_corpus(options["breach_corpus"], options.pop("breach_bloom", None))
+    else:
+        options.pop("breach_corpus", None)
+        options.pop("breach_bloom", None)
+    return options
+
+
+def _init_worker(configs: list, cache_size: int, generator_options: dict, collect_stats: bool = False,
+                 profile_store: str = None, policies: dict = None, metrics=None, strength_options: dict = None):
+    """Prepara o processo de trabalho com as configurações pré-calculadas."""
+    global _worker_processor
+    # Um sink herdado do processo principal (fork) nunca seria lido: cada processo tem o seu
+    instrumentation.install(instrumentation.HistogramSink() if collect_stats else None)
+    store = open_store(profile_store) if profile_store else None
+    cache = ConfigCache(max(cache_size, len(configs), 1), store)
+    for config in configs:
+        cache.add(config)
+    _worker_processor = BatchProcessor(cache, generator_options, policies, metrics,
+                                       open_strength_options(strength_options))
+
+
+def _derive_chunk(chunk: list) -> tuple:
+    """
+    Processa um bloco de registros no processo de trabalho.
+    Retorna (resultados, acertos do cache, falhas do cache, estatísticas da instrumentação ou None).
+    """
+    info_before = _worker_processor.configs.info()
+    results = list(_worker_processor.process(chunk))
+    info_after = _worker_processor.configs.info()
+    sink = instrumentation.sink
+    return (
+        results,
+        info_after["hits"] - info_before["hits"],
+        info_after["misses"] - info_before["misses"],
+        sink.snapshot(reset=True) if sink is not None else None
+    )
+
+
+def _chunked(iterable, size: int):
+    """Agrupa um iterável em listas de até `size` itens."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ParallelDeriver:
+    '''
+    Motor de geração paralela de senhas com saída ordenada.
+
+    Recebe os mesmos registros do BatchProcessor e produz os mesmos resultados,
+    na mesma ordem, usando vários núcleos.
+    '''
+
+    def __init__(self, workers: int = None, chunk_size: int = 1000, key_phrases=(), cache_size: int = 128,
+                 generator_options: dict = None, profile_store: str = None, policies: dict = None,
+                 metrics=None, strength_options: dict = None):
+        """
+        Inicializa o motor.
+        key_phrases: frases chave cujas tabelas são enviadas aos processos no início.
+        generator_options: opções extras do PasswordGenerator (kdf_params, output_mode, alphabet, policy).
+        profile_store: caminho do arquivo de perfis aberto por cada processo (opcional).
+        policies: políticas que os registros podem citar pelo nome (padrão: SITE_POLICIES).
+        metrics: métricas da análise de força de cada resultado (padrão: todas; () = só a senha).
+        strength_options: opções da análise de força em caminhos, abertas em cada processo
+        (attacker_profile, pattern_check, dictionary_index, breach_corpus, breach_bloom; ver open_strength_options).
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("O número de processos deve ser pelo menos 1.")
+        if chunk_size < 1:
+            raise ValueError("O tamanho do bloco deve ser pelo menos 1.")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.generator_options = generator_options or {}
+        self.profile_store = profile_store
+        self.policies = policies
+        self.metrics = metrics
+        self.strength_options = strength_options or {}
+        self.configs = [ConfigGenerator(key_phrase) for key_phrase in dict.fromkeys(key_phrases)]
+        self.processed = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+    def process(self, records):
+        """
+        Processa um iterável de tuplas (linha, registro) em paralelo.
+        Gera os resultados na ordem de entrada, mantendo poucos blocos em memória.
+        """
+        max_pending = self.workers * 2
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.configs, self.cache_size, self.generator_options, instrumentation.sink is not None,
+                      self.profile_store, self.policies, self.metrics, self.strength_options)
+        ) as executor:
+            pending = deque()
+
+            for chunk in _chunked(records, self.chunk_size):
+                pending.append(executor.submit(_derive_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield from self._collect(pending.popleft())
+
+            while pending:
+                yield from self._collect(pending.popleft())
+
+
+    def _collect(self, future):
+        """Aguarda um bloco e atualiza as estatísticas com o resultado dele."""
+        results, hits, misses, stats = future.result()
+        self.cache_hits += hits
+        self.cache_misses += misses
+        if stats is not None and instrumentation.sink is not None:
+            instrumentation.sink.merge(stats)
+
+        for result in results:
+            if "error" in result:
+                self.errors += 1
+            else:
+                self.processed += 1
+            yield result
+
+
+    def cache_info(self) -> dict:
+        """Retorna as estatísticas somadas dos caches dos processos."""
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
+
+
+    def run(self, input_stream, output_stream, fmt: str = "jsonl"):
+        """Lê o lote do fluxo de entrada e escreve cada resultado em JSONL na saída."""
+        for result in self.process(read_records(input_stream, fmt)):
+            output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output_stream.flush()
+        return self.processed, self.errors
+
+
+def derive_parallel(records, workers: int = None, chunk_size: int = 1000, key_phrases=(), generator_options: dict = None):
+    """Atalho: gera os resultados de um iterável de dicionários em paralelo, na ordem de entrada."""
+    deriver = ParallelDeriver(workers=workers, chunk_size=chunk_size, key_phrases=key_phrases,
+                              generator_options=generator_options)
+    yield from deriver.process(enumerate(records, start=1))
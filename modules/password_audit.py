@@ -0,0 +1,202 @@
+# O que faz?
+# Audita arquivos grandes de senhas (uma por linha) sem carregá-los na memória.
+# 1 - Lê o arquivo via mmap, linha a linha, em um pipeline de geradores
+#   - Só os blocos em processamento ficam em memória; o restante fica no cache de páginas.
+# 2 - Analisa as senhas em blocos com o BulkPasswordStrength
+# 3 - Acumula histogramas de nível de segurança, score e faixa de tempo de quebra
+# 4 - Opcionalmente escreve um relatório JSONL por linha (sem a senha, apenas o offset)
+# 5 - Permite retomar uma auditoria interrompida
+#   - Salva periodicamente um checkpoint JSON com o offset (em bytes) e os histogramas.
+#   - Ao retomar, continua do offset salvo com os histogramas acumulados.
+#   - O checkpoint guarda também o tamanho do relatório: ao retomar, as linhas
+#     escritas depois do último checkpoint são descartadas (report_offset).
+# 6 - O tempo de quebra usa o perfil de atacante escolhido (attacker_profile)
+#   - O perfil fica no checkpoint: retomar com outro perfil misturaria os histogramas.
+# 7 - Opcionalmente detecta padrões previsíveis (pattern_analyzer); o relatório lista só o tipo de cada padrão
+# 8 - Opcionalmente conta as senhas encontradas em um arquivo de vazamentos (breach_corpus)
+
+import json
+import mmap
+import os
+from collections import Counter
+from itertools import islice
+
+from modules.bulk_strength import BulkPasswordStrength
+from modules.password_strenght import DEFAULT_ATTACKER_PROFILE
+
+
+def crack_time_bucket(crack_time: str) -> str:
+    """Agrupa o texto do tempo de quebra pela unidade (minutos, horas, dias, anos, séculos)."""
+    if crack_time.startswith("Menos"):
+        return crack_time
+    return crack_time.rsplit(" ", 1)[-1]
+
+
+def iter_lines(path: str, start_offset: int = 0):
+    """
+    Percorre o arquivo via mmap a partir de start_offset.
+    Gera tuplas (offset do início da linha, offset do fim da linha, senha).
+    Linhas vazias são ignoradas.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if start_offset < 0 or start_offset > size:
+            raise ValueError(f"Offset inválido: {start_offset} (o arquivo tem {size} bytes).")
+        if size == 0 or start_offset == size:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start_offset
+            while pos < size:
+                newline = mm.find(b"\n", pos)
+                end = size if newline == -1 else newline + 1
+                line = mm[pos:end].rstrip(b"\r\n")
+                if line:
+                    yield pos, end, line.decode("utf-8", errors="replace")
+                pos = end
+
+
+class PasswordAudit:
+    '''
+    Auditoria em streaming de um arquivo de senhas.
+
+    Os histogramas ficam em Counters, então o custo de memória depende só da
+    quantidade de valores distintos, nunca do tamanho do arquivo.
+    '''
+
+    def __init__(self, path: str, report_stream=None, checkpoint_path: str = None,
+                 chunk_size: int = 4096, checkpoint_every: int = 100_000,
+                 attacker_profile: str = DEFAULT_ATTACKER_PROFILE, pattern_analyzer=None, breach_corpus=None):
+        """Inicializa a auditoria do arquivo informado."""
+        if chunk_size < 1:
+            raise ValueError("O tamanho do bloco deve ser pelo menos 1.")
+        self.path = path
+        self.report_stream = report_stream
+        self.checkpoint_path = checkpoint_path
+        self.chunk_size = chunk_size
+        self.checkpoint_every = checkpoint_every
+        self.attacker_profile = attacker_profile
+        self.analyzer = BulkPasswordStrength(attacker_profile, pattern_analyzer, breach_corpus)
+        self.check_breaches = breach_corpus is not None
+
+        self.offset = 0
+        self.report_offset = 0
+        self.lines = 0
+        self.breached = 0
+        self.security_levels = Counter()
+        self.scores = Counter()
+        self.crack_times = Counter()
+
+
+    def load_checkpoint(self) -> bool:
+        """Carrega o checkpoint salvo, se existir. Retorna True se a auditoria foi retomada."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            try:
+                state = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Checkpoint inválido: {e.msg}.")
+
+        profile = state.get("attacker_profile", DEFAULT_ATTACKER_PROFILE)
+        if profile != self.attacker_profile:
+            raise ValueError(f"O checkpoint foi criado com o perfil de atacante '{profile}', "
+                             f"não '{self.attacker_profile}'.")
+
+        self.offset = state["offset"]
+        self.report_offset = state.get("report_offset", 0)
+        self.lines = state["lines"]
+        self.breached = state.get("breached", 0)
+        self.security_levels = Counter(state["security_level"])
+        self.scores = Counter({int(score): count for score, count in state["score"].items()})
+        self.crack_times = Counter(state["crack_time"])
+        return True
+
+
+    def save_checkpoint(self):
+        """Salva o estado atual de forma atômica (arquivo temporário + rename)."""
+        if not self.checkpoint_path:
+            return
+
+        state = self.summary()
+        if self.report_stream is not None:
+            self.report_stream.flush()  # O relatório precisa estar em disco antes do checkpoint
+            state["report_offset"] = self.report_stream.tell()
+
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+    def summary(self) -> dict:
+        """Retorna os histogramas acumulados e a posição atual da auditoria."""
+        summary = {
+            "path": self.path,
+            "offset": self.offset,
+            "lines": self.lines,
+            "attacker_profile": self.attacker_profile,
+            "security_level": dict(self.security_levels),
+            "score": {str(score): self.scores[score] for score in sorted(self.scores)},
+            "crack_time": dict(self.crack_times)
+        }
+        if self.check_breaches:
+            summary["breached"] = self.breached  # Senhas encontradas no arquivo de vazamentos
+        return summary
+
+
+    def run(self, start_offset: int = None) -> dict:
+        """
+        Executa a auditoria a partir de start_offset (ou do offset atual/checkpoint).
+        Retorna o resumo final.
+        """
+        if start_offset is not None:
+            self.offset = start_offset
+
+        lines = iter_lines(self.path, self.offset)
+        since_checkpoint = 0
+
+        while True:
+            chunk = list(islice(lines, self.chunk_size))
+            if not chunk:
+                break
+
+            columns = self.analyzer.analyze([password for _, _, password in chunk])
+            self.security_levels.update(columns["security_level"])
+            self.scores.update(columns["score"])
+            self.crack_times.update(crack_time_bucket(crack_time) for crack_time in columns["crack_time"])
+            if self.check_breaches:
+                self.breached += sum(1 for count in columns["breached"] if count)
+
+            if self.report_stream is not None:
+                for i, (line_start, _, _) in enumerate(chunk):
+                    entry = {
+                        "offset": line_start,
+                        "length": columns["length"][i],
+                        "score": columns["score"][i],
+                        "security_level": columns["security_level"][i],
+                        "crack_time": columns["crack_time"][i],
+                        "crack_seconds": columns["crack_seconds"][i]
+                    }
+                    if "patterns" in columns:
+                        # Só o tipo de cada padrão: o relatório nunca contém trechos da senha
+                        entry["patterns"] = [match["pattern"] for match in columns["patterns"][i]]
+                    if "breached" in columns:
+                        entry["breached"] = columns["breached"][i]
+                    self.report_stream.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+            self.lines += len(chunk)
+            self.offset = chunk[-1][1]
+            since_checkpoint += len(chunk)
+
+            if since_checkpoint >= self.checkpoint_every:
+                self.save_checkpoint()
+                since_checkpoint = 0
+
+        # O gerador chegou ao fim: o arquivo inteiro foi processado (inclusive linhas vazias finais)
+        self.offset = max(self.offset, os.path.getsize(self.path))
+        if self.report_stream is not None:
+            self.report_stream.flush()
+        self.save_checkpoint()
+        return self.summary()
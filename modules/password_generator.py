@@ -1,18 +1,39 @@
 # O que faz?
 # 1 - Normaliza a frase base e o salt
-#   - Remove acentos e caracteres não alfanuméricos.
+#   - Remove acentos e caracteres não alfanuméricos (text_normalizer.py).
 # 2 - Aplica substituições da frase chave
 #   - Usa o subst_dict para trocar caracteres da frase base.
+#   - A troca é feita com str.translate sobre uma tabela pré-compilada.
 # 3 - Mistura a senha com o salt
 #   - Isso dificulta ataques previsíveis.
+#   - Opcionalmente usa um KDF lento (PBKDF2 ou scrypt) com custo explícito (kdf_params).
 # 4 - Garante o comprimento da senha
 #   - Corta ou preenche até atingir pwd_length.
 # 5 - Adiciona caracteres especiais, se ativado
 #   - Para aumentar a força da senha.
+# 6 - Gera várias variantes (comprimento, caracteres especiais) de uma vez
+#   - Normalização, substituição e hash são feitos uma única vez e reaproveitados.
+# 7 - Modo de saída "dense" (opcional, output_mode="dense")
+#   - SHAKE-256 + alfabeto grande, sem limite de comprimento (dense_output.py).
+#   - O modo "hex" (padrão) mantém as senhas já geradas.
+# 8 - Política de senha do site (opcional, policy)
+#   - A senha cumpre a política por construção, a partir do mesmo SHAKE-256 do modo dense
+#     (password_policy.py). Nenhuma tentativa extra com outros salts.
+# 9 - Cada etapa informa seu tempo ao sink de instrumentation.py, se houver um instalado.
+# 10 - Versões assíncronas (agenerate_password, agenerate_variants) para serviços asyncio
+#   - O hash roda em um executor (padrão: o do event loop), nunca no event loop.
 
+import asyncio
 import string
 import hashlib
-import unicodedata
+from functools import partial
+from time import perf_counter_ns
+
+from modules import instrumentation
+from modules.dense_output import ALPHABETS, OUTPUT_MODES, map_to_alphabet, validate_alphabet
+from modules.key_stretching import stretch, validate_params
+from modules.password_policy import get_policy
+from modules.text_normalizer import normalize_cached, normalize_text
 
 class PasswordGenerator:
     '''
@@ -27,32 +48,73 @@ class PasswordGenerator:
     A senha final agora é sempre a mesma para as mesmas entradas.
     '''
 
-    def __init__(self, base_phrase: str, subst_dict: dict, salt: str = "", pwd_length: int = 16, extended_chars: bool = False):
+    def __init__(self, base_phrase: str, subst_dict: dict, salt: str = "", pwd_length: int = 16, extended_chars: bool = False,
+                 translation_table: dict = None, kdf_params: dict = None, output_mode: str = "hex",
+                 alphabet: str = None, policy=None):
         """Inicializa a classe com os parâmetros necessários para gerar a senha."""
-        self.base_phrase = self._normalize_text(base_phrase)
-        self.salt = self._normalize_text(salt)
+        sink = instrumentation.sink
+        start = perf_counter_ns() if sink is not None else 0
+        self.base_phrase = self._normalize_text(base_phrase)  # Sem cache: a frase base é única e secreta
+        self.salt = normalize_cached(salt)  # Salts costumam se repetir entre contas
+        if sink is not None:
+            sink.lap("generator.normalize", start)
         self.subst_dict = subst_dict
+        # Reaproveita a tabela do ConfigGenerator quando fornecida
+        self.translation_table = translation_table if translation_table is not None else str.maketrans(subst_dict)
+        # Parâmetros do KDF (None mantém o SHA-256 simples e as senhas já existentes)
+        self.kdf_params = validate_params(kdf_params) if kdf_params is not None else None
         self.pwd_length = pwd_length
         self.extended_chars = extended_chars
 
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Modo de saída desconhecido: '{output_mode}'. Use um de: {', '.join(OUTPUT_MODES)}.")
+        if alphabet is not None and output_mode != "dense":
+            raise ValueError("Um alfabeto personalizado só pode ser usado no modo de saída 'dense'.")
+        self.output_mode = output_mode
+        # Alfabeto do modo dense (None usa "full" ou "alnum", conforme extended_chars)
+        self.alphabet = validate_alphabet(alphabet) if alphabet is not None else None
+        # Política do site (PasswordPolicy, nome de SITE_POLICIES ou dicionário); define o próprio alfabeto
+        if policy is not None and alphabet is not None:
+            raise ValueError("Use uma política ou um alfabeto personalizado, não os dois.")
+        self.policy = get_policy(policy) if policy is not None else None
+
 
     def _normalize_text(self, text: str) -> str:
         """Normaliza o texto removendo acentos e pontuações, deixando apenas letras e números."""
-        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
-        text = text.lower()
-        text = ''.join(c for c in text if c.isalnum())  # Remove pontuação
-        return text
+        return normalize_text(text)
 
 
     def _apply_substitutions(self, text: str) -> str:
         """Substitui os caracteres da base_phrase de acordo com subst_dict."""
-        return ''.join(self.subst_dict.get(char, char) for char in text)
+        return text.translate(self.translation_table)
+
+
+    def _hash_with_salt(self, text: str) -> str:
+        """Calcula o hash completo (64 caracteres hexadecimais) da frase transformada com o salt."""
+        if self.kdf_params is not None:
+            return stretch(text, self.salt, self.kdf_params)
+
+        hash_input = (text + self.salt).encode("utf-8")
+        return hashlib.sha256(hash_input).hexdigest()  # Gera um hash da entrada
+
+
+    def _salted_xof(self, text: str):
+        """Cria o SHAKE-256 da frase transformada com o salt (ou da chave derivada pelo KDF)."""
+        if self.kdf_params is not None:
+            return hashlib.shake_256(bytes.fromhex(stretch(text, self.salt, self.kdf_params)))
+        return hashlib.shake_256((text + self.salt).encode("utf-8"))
+
+
+    def _dense_alphabet(self, extended_chars: bool) -> str:
+        """Retorna o alfabeto do modo dense: o personalizado ou o padrão conforme extended_chars."""
+        if self.alphabet is not None:
+            return self.alphabet
+        return ALPHABETS["full"] if extended_chars else ALPHABETS["alnum"]
 
 
     def _mix_with_salt(self, text: str) -> str:
         """Mistura a frase base transformada com o salt de forma determinística."""
-        hash_input = (text + self.salt).encode("utf-8")
-        hashed = hashlib.sha256(hash_input).hexdigest()  # Gera um hash da entrada
+        hashed = self._hash_with_salt(text)
         return hashed[:self.pwd_length]  # Usa os primeiros caracteres do hash como senha base
 
 
@@ -60,7 +122,11 @@ class PasswordGenerator:
         """Adiciona caracteres especiais de forma determinística."""
         if not self.extended_chars:
             return text
+        return self._inject_special_chars(text)
+
 
+    def _inject_special_chars(self, text: str) -> str:
+        """Substitui posições do texto por caracteres especiais escolhidos pelo hash MD5."""
         special_chars = "!#$%&()*+-;<=>?@^_{|}~"
         hash_input = text.encode("utf-8")
         hashed = hashlib.md5(hash_input).hexdigest()  # Usa um hash MD5 para previsibilidade
@@ -75,11 +141,110 @@ class PasswordGenerator:
 
     def generate_password(self) -> str:
         """Gera a senha segura aplicando todas as transformações de forma determinística."""
+        sink = instrumentation.sink
+        start = perf_counter_ns() if sink is not None else 0
         transformed = self._apply_substitutions(self.base_phrase)
+        if sink is not None:
+            start = sink.lap("generator.substitute", start)
+
+        if self.policy is not None:
+            # Os caracteres especiais e o comprimento vêm da política
+            xof = self._salted_xof(transformed)
+            if sink is not None:
+                start = sink.lap("generator.hash", start)
+            password = self.policy.generate(xof, self.pwd_length)
+            if sink is not None:
+                sink.lap("generator.policy", start)
+            return password
+
+        if self.output_mode == "dense":
+            # O alfabeto já inclui os caracteres especiais quando extended_chars está ativo
+            xof = self._salted_xof(transformed)
+            if sink is not None:
+                start = sink.lap("generator.hash", start)
+            password = map_to_alphabet(xof, self.pwd_length, self._dense_alphabet(self.extended_chars))
+            if sink is not None:
+                sink.lap("generator.dense_map", start)
+            return password
+
         mixed = self._mix_with_salt(transformed)
+        if sink is not None:
+            start = sink.lap("generator.hash", start)
         final_password = self._add_special_chars(mixed)
+        if sink is not None:
+            sink.lap("generator.special_chars", start)
         return final_password
 
+
+    def generate_variants(self, variants) -> list:
+        """
+        Gera várias variantes da senha a partir de um único hash.
+        variants: iterável de tuplas (pwd_length, extended_chars).
+        Retorna as senhas na mesma ordem das variantes; cada uma é igual à de generate_password()
+        com o mesmo pwd_length e extended_chars.
+        Com política, o extended_chars de cada variante é ignorado (os caracteres vêm da política),
+        assim como no modo dense com alfabeto personalizado.
+        """
+        variants = list(variants)
+        sink = instrumentation.sink
+        start = perf_counter_ns() if sink is not None else 0
+        transformed = self._apply_substitutions(self.base_phrase)
+        if sink is not None:
+            start = sink.lap("generator.substitute", start)
+
+        if self.policy is not None:
+            # Um único XOF para todas as variantes; extended_chars é ignorado (a política decide)
+            xof = self._salted_xof(transformed)
+            if sink is not None:
+                start = sink.lap("generator.hash", start)
+            passwords = [self.policy.generate(xof, pwd_length) for pwd_length, _ in variants]
+            if sink is not None:
+                sink.lap("generator.policy", start)
+            return passwords
+
+        if self.output_mode == "dense":
+            # Cada comprimento é prefixo do maior: mapeia uma vez por alfabeto e corta
+            xof = self._salted_xof(transformed)
+            if sink is not None:
+                start = sink.lap("generator.hash", start)
+            longest = {}
+            for pwd_length, extended_chars in variants:
+                alphabet = self._dense_alphabet(extended_chars)
+                longest[alphabet] = max(longest.get(alphabet, 0), pwd_length)
+            mapped = {alphabet: map_to_alphabet(xof, length, alphabet) for alphabet, length in longest.items()}
+            passwords = [mapped[self._dense_alphabet(extended_chars)][:pwd_length] for pwd_length, extended_chars in variants]
+            if sink is not None:
+                sink.lap("generator.dense_map", start)
+            return passwords
+
+        hashed = self._hash_with_salt(transformed)
+        if sink is not None:
+            start = sink.lap("generator.hash", start)
+
+        passwords = []
+        for pwd_length, extended_chars in variants:
+            mixed = hashed[:pwd_length]
+            passwords.append(self._inject_special_chars(mixed) if extended_chars else mixed)
+        if sink is not None:
+            sink.lap("generator.special_chars", start)
+        return passwords
+
+
+    async def agenerate_password(self, executor=None, timeout: float = None) -> str:
+        """
+        Igual a generate_password, mas executa o hash no executor (None = executor padrão do loop).
+        Levanta asyncio.TimeoutError se timeout (segundos) passar; cancelar a espera descarta o resultado.
+        O tempo limite não interrompe o hash que já começou: ele termina em segundo plano no executor.
+        """
+        future = asyncio.get_running_loop().run_in_executor(executor, self.generate_password)
+        return await asyncio.wait_for(future, timeout)
+
+
+    async def agenerate_variants(self, variants, executor=None, timeout: float = None) -> list:
+        """Igual a generate_variants, mas executa o hash no executor (ver agenerate_password)."""
+        future = asyncio.get_running_loop().run_in_executor(executor, partial(self.generate_variants, list(variants)))
+        return await asyncio.wait_for(future, timeout)
+
 '''
     Teste
 
@@ -0,0 +1,230 @@
+# O que faz?
+# Políticas de senha de sites ("pelo menos uma maiúscula, um dígito, um símbolo deste conjunto,
+# no máximo 20, sem < >") atendidas por construção, em uma única passada determinística.
+# 1 - Uma política define
+#   - Comprimento mínimo e máximo (o comprimento pedido é ajustado para o intervalo).
+#   - Classes permitidas (maiúsculas, minúsculas, dígitos, símbolos) e o mínimo de cada uma.
+#   - O conjunto de símbolos aceitos e os caracteres proibidos.
+# 2 - Geração sem tentativas
+#   - Os bytes vêm de um único SHAKE-256 (o mesmo fluxo do modo dense, com o salt ou o KDF).
+#   - Primeiro são sorteados os caracteres obrigatórios de cada classe, depois o restante no
+#     alfabeto permitido, e no fim as posições são embaralhadas (Fisher-Yates).
+#   - Todos os sorteios são sem viés (amostragem por rejeição), então a senha sempre cumpre a
+#     política e nunca é preciso trocar o salt e gerar de novo.
+# 3 - Biblioteca de políticas nomeadas (SITE_POLICIES), extensível por um arquivo JSON.
+
+import json
+import string
+
+from modules.dense_output import SPECIAL_CHARS
+
+
+CHARACTER_CLASSES = ("uppercase", "lowercase", "digits", "special")
+
+_CLASS_CHARS = {
+    "uppercase": string.ascii_uppercase,
+    "lowercase": string.ascii_lowercase,
+    "digits": string.digits,
+}
+
+
+class _XofReader:
+    '''
+    Lê números sem viés de um XOF (ex.: hashlib.shake_256), em sequência.
+
+    O XOF devolve sempre o mesmo prefixo, então ler mais bytes só estende o fluxo.
+    '''
+
+    def __init__(self, xof, size: int = 64):
+        """Inicializa o leitor com um primeiro bloco de bytes."""
+        self.xof = xof
+        self.size = size
+        self.buffer = xof.digest(size)
+        self.pos = 0
+
+
+    def _take(self, count: int) -> int:
+        """Lê os próximos `count` bytes como inteiro."""
+        if self.pos + count > len(self.buffer):
+            self.size *= 2
+            self.buffer = self.xof.digest(self.size)
+        value = int.from_bytes(self.buffer[self.pos:self.pos + count], "big")
+        self.pos += count
+        return value
+
+
+    def below(self, n: int) -> int:
+        """Número uniforme em [0, n)."""
+        # Bytes suficientes para n valores (1 até 256, 2 até 65536...): a rejeição sempre termina
+        width = max(1, ((n - 1).bit_length() + 7) // 8)
+        span = 1 << (8 * width)
+        limit = span - span % n  # Valores >= limit são descartados
+        while True:
+            value = self._take(width)
+            if value < limit:
+                return value % n
+
+
+    def choice(self, chars: str) -> str:
+        """Caractere uniforme de chars."""
+        return chars[self.below(len(chars))]
+
+
+class PasswordPolicy:
+    '''
+    Política de senha de um site.
+
+    required: mínimo de caracteres de cada classe, ex.: {"uppercase": 1, "digits": 1, "special": 1}.
+    allowed_classes: classes que podem aparecer (padrão: todas).
+    specials: símbolos aceitos pelo site; forbidden: caracteres que nunca podem aparecer.
+    '''
+
+    def __init__(self, name: str = "", min_length: int = 8, max_length: int = 64, required: dict = None,
+                 allowed_classes=CHARACTER_CLASSES, specials: str = SPECIAL_CHARS, forbidden: str = ""):
+        """Valida a política e pré-calcula os conjuntos de caracteres de cada classe."""
+        self.name = name
+        self.min_length = min_length
+        self.max_length = max_length
+        self.specials = specials
+        self.forbidden = forbidden
+
+        required = required or {}
+        for value in (min_length, max_length):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError("Os comprimentos da política devem ser números inteiros.")
+        if not isinstance(required, dict) or not isinstance(specials, str) or not isinstance(forbidden, str):
+            raise ValueError("Política inválida: required deve ser um objeto; specials e forbidden, textos.")
+        unknown = [cls for cls in list(allowed_classes) + list(required) if cls not in CHARACTER_CLASSES]
+        if unknown:
+            raise ValueError(f"Classe de caracteres desconhecida: '{unknown[0]}'. "
+                             f"Use uma de: {', '.join(CHARACTER_CLASSES)}.")
+        # Ordem fixa (a de CHARACTER_CLASSES): a senha não depende da ordem das chaves do JSON
+        self.allowed_classes = tuple(cls for cls in CHARACTER_CLASSES if cls in allowed_classes)
+        self.required = {cls: required[cls] for cls in CHARACTER_CLASSES if required.get(cls)}
+
+        if any(char.isalnum() or char.isspace() for char in specials) or len(set(specials)) != len(specials):
+            raise ValueError("Os símbolos da política não podem ter letras, números, espaços ou repetições.")
+
+        self.class_sets = {}
+        for cls in self.allowed_classes:
+            chars = "".join(char for char in _CLASS_CHARS.get(cls, specials) if char not in forbidden)
+            if chars:
+                self.class_sets[cls] = chars
+        self.alphabet = "".join(self.class_sets.values())
+
+        for cls, count in self.required.items():
+            if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+                raise ValueError(f"O mínimo da classe {cls} deve ser um inteiro não negativo.")
+            if cls not in self.class_sets:
+                raise ValueError(f"A política exige {cls}, mas não sobra nenhum caractere permitido dessa classe.")
+        if len(self.alphabet) < 2:
+            raise ValueError("A política deve permitir pelo menos 2 caracteres.")
+        if min_length < 1 or max_length < min_length:
+            raise ValueError("Os comprimentos da política devem satisfazer 1 <= mínimo <= máximo.")
+        if sum(self.required.values()) > max_length:
+            raise ValueError("Os mínimos de cada classe somam mais que o comprimento máximo da política.")
+
+
+    def length_for(self, pwd_length: int) -> int:
+        """Ajusta o comprimento pedido ao intervalo da política (e aos mínimos das classes)."""
+        return min(max(pwd_length, self.min_length, sum(self.required.values())), self.max_length)
+
+
+    def generate(self, xof, pwd_length: int) -> str:
+        """Gera, a partir do XOF, uma senha que cumpre a política (sempre a mesma para o mesmo XOF)."""
+        length = self.length_for(pwd_length)
+        reader = _XofReader(xof)
+
+        chars = []
+        for cls, count in self.required.items():
+            chars.extend(reader.choice(self.class_sets[cls]) for _ in range(count))
+        chars.extend(reader.choice(self.alphabet) for _ in range(length - len(chars)))
+
+        # Embaralha para que os obrigatórios não fiquem sempre no início
+        for i in range(length - 1, 0, -1):
+            j = reader.below(i + 1)
+            chars[i], chars[j] = chars[j], chars[i]
+        return "".join(chars)
+
+
+    def check(self, password: str) -> list:
+        """Retorna as regras da política que a senha não cumpre (lista vazia = senha válida)."""
+        problems = []
+        if not self.min_length <= len(password) <= self.max_length:
+            problems.append(f"comprimento fora de {self.min_length}..{self.max_length}")
+        if any(char not in self.alphabet for char in password):
+            problems.append("caracteres não permitidos")
+        for cls, count in self.required.items():
+            if sum(1 for char in password if char in self.class_sets[cls]) < count:
+                problems.append(f"menos de {count} caractere(s) de {cls}")
+        return problems
+
+
+    def to_dict(self) -> dict:
+        """Retorna a política em um dicionário serializável (formato do arquivo de políticas)."""
+        return {
+            "min_length": self.min_length,
+            "max_length": self.max_length,
+            "required": dict(self.required),
+            "allowed_classes": list(self.allowed_classes),
+            "specials": self.specials,
+            "forbidden": self.forbidden
+        }
+
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "PasswordPolicy":
+        """Cria a política a partir de um dicionário (ex.: lido de JSON)."""
+        if not isinstance(data, dict):
+            raise ValueError(f"A política '{name}' deve ser um objeto JSON.")
+        fields = {"min_length", "max_length", "required", "allowed_classes", "specials", "forbidden"}
+        unknown = sorted(set(data) - fields)
+        if unknown:
+            raise ValueError(f"Campo desconhecido na política '{name}': {unknown[0]}.")
+        return cls(name=name, **data)
+
+
+SITE_POLICIES = {
+    # Uma de cada classe, qualquer símbolo do conjunto padrão
+    "strict": PasswordPolicy("strict", 12, 64, {"uppercase": 1, "lowercase": 1, "digits": 1, "special": 1}),
+    # Sites que não aceitam símbolos
+    "alnum": PasswordPolicy("alnum", 8, 64, {"uppercase": 1, "lowercase": 1, "digits": 1},
+                            allowed_classes=("uppercase", "lowercase", "digits")),
+    # Formulários antigos: no máximo 20 caracteres e sem caracteres de marcação
+    "web_max20": PasswordPolicy("web_max20", 8, 20, {"uppercase": 1, "lowercase": 1, "digits": 1, "special": 1},
+                                forbidden="<>&"),
+    # Bancos: até 16 caracteres e poucos símbolos aceitos
+    "banking": PasswordPolicy("banking", 8, 16, {"uppercase": 1, "lowercase": 1, "digits": 2, "special": 1},
+                              specials="!@#$%&*"),
+}
+
+
+def load_policies(path: str) -> dict:
+    """
+    Lê um arquivo JSON de políticas ({"nome": {campos da política}}).
+    Retorna SITE_POLICIES acrescido (ou sobrescrito) pelas políticas do arquivo.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Arquivo de políticas inválido: {e.msg}.")
+    if not isinstance(data, dict):
+        raise ValueError("O arquivo de políticas deve ser um objeto JSON: {\"nome\": {...}}.")
+
+    policies = dict(SITE_POLICIES)
+    for name, spec in data.items():
+        policies[name] = PasswordPolicy.from_dict(name, spec)
+    return policies
+
+
+def get_policy(policy, policies: dict = None) -> PasswordPolicy:
+    """Resolve uma política: instância, nome (em policies ou SITE_POLICIES) ou dicionário de campos."""
+    if isinstance(policy, PasswordPolicy):
+        return policy
+    if isinstance(policy, dict):
+        return PasswordPolicy.from_dict("", policy)
+    library = policies if policies is not None else SITE_POLICIES
+    if policy not in library:
+        raise ValueError(f"Política desconhecida: '{policy}'. Use uma de: {', '.join(library)}.")
+    return library[policy]
@@ -10,22 +10,295 @@
 #           61-80 → "Forte"
 #           81-100 → "Muito Forte"
 #   - Estima o tempo para quebra da senha por força bruta
-#   - Baseado no número de combinações possíveis.
+#   - Baseado no número de combinações possíveis (tamanho do conjunto de caracteres ^ comprimento).
+#   - Calculado em escala logarítmica: não estoura para senhas longas.
+#   - A velocidade do ataque depende do perfil de atacante (ATTACKER_PROFILES).
+#   - Opcionalmente detecta padrões previsíveis (dicionário, teclado, datas...) com um
+#     PatternAnalyzer (pattern_analyzer.py): o score é limitado e o tempo de quebra usa
+#     a estimativa de tentativas dos padrões quando ela é menor que a da força bruta.
+#   - Opcionalmente consulta um arquivo local de senhas vazadas (breach_check.py):
+#     senha vazada tem score 0 e o tempo de quebra de quem testa o arquivo inteiro.
+# Cada etapa (contagem de classes, padrões, vazamentos, score, tempo de quebra) informa seu tempo
+# ao sink de instrumentation.py, se houver um instalado; as dependências são calculadas antes,
+# então cada etapa mede só o próprio trabalho.
+# As regras de score, nível e tempo de quebra ficam em funções do módulo,
+# compartilhadas com a análise em lote (bulk_strength.py).
+# aanalyze() é a versão assíncrona de get_password_analysis(): a análise roda em um executor,
+# fora do event loop (útil com detecção de padrões e arquivo de vazamentos).
+# As métricas são calculadas sob demanda (no primeiro acesso) e guardadas em __slots__,
+# então quem só precisa do score não paga pela formatação do tempo de quebra.
 
+import asyncio
 import string
 import math
+from functools import partial
+from time import perf_counter_ns
+
+from modules import instrumentation
+from modules.pattern_analyzer import cap_score
+
+
+SPECIAL_CHARS = frozenset(string.punctuation)
+
+# Métricas que podem ser pedidas em get_password_analysis(metrics=...)
+METRICS = ("length", "score", "security_level", "crack_time", "crack_seconds", "patterns", "breached")
+# Métricas retornadas por padrão ("patterns" e "breached" só entram quando a verificação está ativa)
+DEFAULT_METRICS = ("length", "score", "security_level", "crack_time", "crack_seconds")
+
+# Tamanho de cada classe de caracteres (usado no cálculo das combinações)
+CHARSET_SIZES = {
+    "uppercase": 26,
+    "lowercase": 26,
+    "digits": 10,
+    "special": len(string.punctuation)
+}
+# Estimativa para caracteres fora das classes acima (espaço, símbolos Unicode, outros alfabetos)
+OTHER_CHARSET_SIZE = 100
+
+# Tentativas por segundo de cada perfil de atacante
+ATTACKER_PROFILES = {
+    "online_throttled": 100 / 3600,      # Serviço online com limite de ~100 tentativas por hora
+    "online": 10,                        # Serviço online sem limite de tentativas
+    "default": 10_000_000,               # Suposição histórica do projeto: 10 milhões por segundo
+    "single_gpu_md5": 1.6e11,            # Uma GPU moderna contra hashes MD5
+    "single_gpu_sha256": 2.2e10,         # Uma GPU moderna contra hashes SHA-256
+    "single_gpu_bcrypt": 1.8e5,          # Uma GPU moderna contra bcrypt (custo 5)
+    "gpu_cluster_md5": 1.6e13,           # Cluster com 100 GPUs contra MD5
+    "gpu_cluster_sha256": 2.2e12,        # Cluster com 100 GPUs contra SHA-256
+}
+DEFAULT_ATTACKER_PROFILE = "default"
+
+SECONDS_PER_YEAR = 31_536_000
+MAX_FLOAT_LOG10 = math.log10(2.0 ** 1023)  # Limite seguro para converter 10^x em float
+_LOG_MINUTE = math.log10(60)
+_LOG_HOUR = math.log10(3600)
+_LOG_DAY = math.log10(86400)
+_LOG_YEAR = math.log10(SECONDS_PER_YEAR)
+# Corte histórico de "séculos" (3.154e8 s): mantido para que os rótulos não mudem
+_LOG_CENTURY = math.log10(3.154e8)
+
+
+def calculate_score(length: int, char_types: dict, single_class: bool) -> int:
+    """
+    Calcula um score de 0 a 100 baseado no comprimento e variedade da senha.
+    single_class indica se a senha tem apenas números ou apenas letras.
+    """
+    score = 0
+
+    # Comprimento
+    score += min(length * 4, 40)  # Máximo 40 pontos por comprimento
+
+    # Diversidade de caracteres
+    if char_types["uppercase"] > 0:
+        score += 10
+    if char_types["lowercase"] > 0:
+        score += 10
+    if char_types["digits"] > 0:
+        score += 15
+    if char_types["special"] > 0:
+        score += 25
+
+    # Penalidades por repetições e padrões simples
+    if single_class:
+        score -= 20  # Apenas números ou apenas letras são penalizados
+
+    return max(0, min(score, 100))  # Garante que o score esteja entre 0 e 100
+
+
+def security_level_for(score: int) -> str:
+    """
+    Define a classificação da senha baseada no score.
+    """
+    if score < 20:
+        return "Muito Fraca"
+    elif score < 40:
+        return "Fraca"
+    elif score < 60:
+        return "Moderada"
+    elif score < 80:
+        return "Forte"
+    else:
+        return "Muito Forte"
+
+
+def charset_size(char_types: dict, length: int) -> int:
+    """
+    Tamanho do conjunto de caracteres que um ataque de força bruta precisa testar:
+    soma o tamanho de cada classe presente na senha (não a quantidade de caracteres).
+    """
+    size = sum(CHARSET_SIZES[name] for name, count in char_types.items() if count > 0)
+    if length > sum(char_types.values()):
+        size += OTHER_CHARSET_SIZE  # Espaços, símbolos Unicode, outros alfabetos
+    return size
+
+
+def crack_time_log10(charset: int, length: int, guesses_per_second: float) -> float:
+    """
+    Retorna log10 dos segundos para testar todas as combinações.
+    Calculado em escala logarítmica: tempo constante e sem overflow para qualquer comprimento.
+    """
+    log_combinations = length * math.log10(charset) if charset > 1 else 0.0
+    return log_combinations - math.log10(guesses_per_second)
+
+
+def seconds_from_log10(log_seconds: float):
+    """Converte log10 dos segundos em segundos (None se não couber em um float)."""
+    if log_seconds > MAX_FLOAT_LOG10:
+        return None
+    return 10 ** log_seconds
+
+
+def format_crack_time(log_seconds: float) -> str:
+    """
+    Converte o tempo estimado (em log10 de segundos) para formato legível.
+    """
+    if log_seconds < _LOG_MINUTE:
+        return "Menos de 1 minuto"
+    elif log_seconds < _LOG_HOUR:
+        return f"{int(10 ** log_seconds // 60)} minutos"
+    elif log_seconds < _LOG_DAY:
+        return f"{int(10 ** log_seconds // 3600)} horas"
+    elif log_seconds < _LOG_YEAR:
+        return f"{int(10 ** log_seconds // 86400)} dias"
+    elif log_seconds < _LOG_CENTURY:
+        return f"{int(10 ** log_seconds // SECONDS_PER_YEAR)} anos"
+
+    log_centuries = log_seconds - _LOG_CENTURY
+    if log_centuries < 12:
+        return f"Aproximadamente {int(10 ** log_centuries)} séculos"
+    return f"Aproximadamente 10^{int(log_centuries)} séculos"  # Número grande demais para escrever por extenso
+
+
+def attacker_rate(profile: str) -> float:
+    """Retorna a taxa de tentativas por segundo do perfil de atacante."""
+    try:
+        return ATTACKER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Perfil de atacante desconhecido: '{profile}'. Use um de: {', '.join(ATTACKER_PROFILES)}.")
+
+
+def breached_crack_time_log10(breach_corpus, guesses_per_second: float) -> float:
+    """Tempo (log10 dos segundos) para testar todas as senhas do arquivo de vazamentos."""
+    return math.log10(breach_corpus.estimated_entries) - math.log10(guesses_per_second)
+
 
 class PasswordStrength:
 
-    # Recebe a senha e chama os métodos para análise.
-    def __init__(self, password: str):
-        """Inicializa a classe com a senha e calcula sua força."""
+    __slots__ = ("password", "length", "guesses_per_second", "pattern_analyzer", "breach_corpus", "_char_types",
+                 "_score", "_security_level", "_crack_time_log10", "_crack_time", "_pattern_analysis", "_breached")
+
+    # Recebe a senha; as métricas só são calculadas quando acessadas.
+    # attacker_profile escolhe a velocidade do ataque (chave de ATTACKER_PROFILES).
+    # pattern_analyzer (opcional) ativa a detecção de padrões previsíveis.
+    # breach_corpus (opcional) ativa a consulta ao arquivo de senhas vazadas.
+    def __init__(self, password: str, attacker_profile: str = DEFAULT_ATTACKER_PROFILE, pattern_analyzer=None,
+                 breach_corpus=None):
+        """Inicializa a classe com a senha. A força é calculada sob demanda."""
         self.password = password
         self.length = len(password)
-        self.char_types = self._analyze_character_types()
-        self.score = self._calculate_score()
-        self.security_level = self._get_security_level()
-        self.crack_time = self._estimate_crack_time()
+        self.guesses_per_second = attacker_rate(attacker_profile)
+        self.pattern_analyzer = pattern_analyzer
+        self._pattern_analysis = None
+        self.breach_corpus = breach_corpus
+        self._breached = None
+        self._char_types = None
+        self._score = None
+        self._security_level = None
+        self._crack_time_log10 = None
+        self._crack_time = None
+
+
+    @property
+    def char_types(self) -> dict:
+        """Contagem de cada tipo de caractere (calculada no primeiro acesso)."""
+        if self._char_types is None:
+            sink = instrumentation.sink
+            start = perf_counter_ns() if sink is not None else 0
+            self._char_types = self._analyze_character_types()
+            if sink is not None:
+                sink.lap("strength.char_types", start)
+        return self._char_types
+
+
+    @property
+    def score(self) -> int:
+        """Score de 0 a 100 (calculado no primeiro acesso)."""
+        if self._score is None:
+            self._score = self._calculate_score()
+        return self._score
+
+
+    @property
+    def security_level(self) -> str:
+        """Nível de segurança (calculado no primeiro acesso)."""
+        if self._security_level is None:
+            self._security_level = self._get_security_level()
+        return self._security_level
+
+
+    @property
+    def crack_time_log10(self) -> float:
+        """log10 dos segundos estimados para quebra (calculado no primeiro acesso)."""
+        if self._crack_time_log10 is None:
+            self._crack_time_log10 = self._estimate_crack_time()
+        return self._crack_time_log10
+
+
+    @property
+    def crack_seconds(self):
+        """Segundos estimados para quebra (None se o número não couber em um float)."""
+        return seconds_from_log10(self.crack_time_log10)
+
+
+    @property
+    def crack_time(self) -> str:
+        """Tempo estimado para quebra, em texto (formatado no primeiro acesso)."""
+        if self._crack_time is None:
+            log_seconds = self.crack_time_log10
+            sink = instrumentation.sink
+            start = perf_counter_ns() if sink is not None else 0
+            self._crack_time = format_crack_time(log_seconds)
+            if sink is not None:
+                sink.lap("strength.format", start)
+        return self._crack_time
+
+
+    @property
+    def pattern_analysis(self):
+        """(log10 das tentativas, padrões encontrados), ou None sem PatternAnalyzer."""
+        if self._pattern_analysis is None and self.pattern_analyzer is not None:
+            charset = charset_size(self.char_types, self.length)
+            sink = instrumentation.sink
+            start = perf_counter_ns() if sink is not None else 0
+            self._pattern_analysis = self.pattern_analyzer.analyze(self.password, charset)
+            if sink is not None:
+                sink.lap("strength.patterns", start)
+        return self._pattern_analysis
+
+
+    @property
+    def patterns(self) -> list:
+        """Padrões previsíveis encontrados na senha (vazio sem PatternAnalyzer)."""
+        if self.pattern_analysis is None:
+            return []
+        return [{key: value for key, value in match.items() if key != "guesses_log10"}
+                for match in self.pattern_analysis[1]]
+
+
+    @property
+    def breached(self) -> int:
+        """Quantas vezes a senha aparece no vazamento (0 se não aparece ou sem breach_corpus)."""
+        if self._breached is None:
+            if self.breach_corpus is None:
+                self._breached = 0
+            else:
+                sink = instrumentation.sink
+                start = perf_counter_ns() if sink is not None else 0
+                self._breached = self.breach_corpus.count(self.password)
+                if sink is not None:
+                    sink.lap("strength.breach", start)
+                    sink.count("strength.breached", int(self._breached > 0))
+        return self._breached
 
 
     # Conta letras maiúsculas, minúsculas, números e caracteres especiais.
@@ -40,7 +313,7 @@ class PasswordStrength:
             "digits": 0,
             "special": 0
         }
-        special_chars = set(string.punctuation)
+        special_chars = SPECIAL_CHARS
 
         for char in self.password:
             if char.isupper():
@@ -61,26 +334,20 @@ class PasswordStrength:
         """
         Calcula um score de 0 a 100 baseado no comprimento e variedade da senha.
         """
-        score = 0
-
-        # Comprimento
-        score += min(self.length * 4, 40)  # Máximo 40 pontos por comprimento
+        if self.breached:
+            return 0  # Senha vazada: está nas listas que os atacantes testam primeiro
+        char_types = self.char_types
+        pattern_analysis = self.pattern_analysis
 
-        # Diversidade de caracteres
-        if self.char_types["uppercase"] > 0:
-            score += 10
-        if self.char_types["lowercase"] > 0:
-            score += 10
-        if self.char_types["digits"] > 0:
-            score += 15
-        if self.char_types["special"] > 0:
-            score += 25
-
-        # Penalidades por repetições e padrões simples
-        if self.password.isdigit() or self.password.isalpha():
-            score -= 20  # Apenas números ou apenas letras são penalizados
-
-        return max(0, min(score, 100))  # Garante que o score esteja entre 0 e 100
+        sink = instrumentation.sink
+        start = perf_counter_ns() if sink is not None else 0
+        single_class = self.password.isdigit() or self.password.isalpha()
+        score = calculate_score(self.length, char_types, single_class)
+        if pattern_analysis is not None and pattern_analysis[1]:
+            score = cap_score(score, pattern_analysis[0])  # Padrões previsíveis limitam o score
+        if sink is not None:
+            sink.lap("strength.score", start)
+        return score
 
 
     # Retorna "Muito Fraca", "Fraca", "Moderada", "Forte", ou "Muito Forte".
@@ -88,56 +355,65 @@ class PasswordStrength:
         """
         Define a classificação da senha baseada no score.
         """
-        if self.score < 20:
-            return "Muito Fraca"
-        elif self.score < 40:
-            return "Fraca"
-        elif self.score < 60:
-            return "Moderada"
-        elif self.score < 80:
-            return "Forte"
-        else:
-            return "Muito Forte"
+        return security_level_for(self.score)
 
 
     # Calcula o tempo necessário para quebrar a senha usando força bruta.
-    def _estimate_crack_time(self) -> str:
+    def _estimate_crack_time(self) -> float:
         """
-        Estima o tempo necessário para quebrar a senha por força bruta.
+        Estima o tempo necessário para quebrar a senha por força bruta (log10 dos segundos).
         """
-        num_symbols = sum(self.char_types.values())  # Quantidade de símbolos distintos usados
-        num_combinations = math.pow(num_symbols, self.length)  # Número total de combinações possíveis
-
-        # Assume que um ataque de força bruta pode testar 10 milhões de senhas por segundo
-        crack_seconds = num_combinations / 10_000_000
-
-        # Converte tempo para formato legível
-        if crack_seconds < 60:
-            return "Menos de 1 minuto"
-        elif crack_seconds < 3600:
-            return f"{int(crack_seconds // 60)} minutos"
-        elif crack_seconds < 86400:
-            return f"{int(crack_seconds // 3600)} horas"
-        elif crack_seconds < 31536000:
-            return f"{int(crack_seconds // 86400)} dias"
-        elif crack_seconds < 3.154e+8:
-            return f"{int(crack_seconds // 31536000)} anos"
+        char_types = self.char_types
+        pattern_analysis = self.pattern_analysis
+        breached = self.breached
+
+        sink = instrumentation.sink
+        start = perf_counter_ns() if sink is not None else 0
+        charset = charset_size(char_types, self.length)
+        log_seconds = crack_time_log10(charset, self.length, self.guesses_per_second)
+        if pattern_analysis is not None:
+            # Um atacante que testa os padrões primeiro pode ser mais rápido que a força bruta
+            log_seconds = min(log_seconds, pattern_analysis[0] - math.log10(self.guesses_per_second))
+        if breached:
+            log_seconds = min(log_seconds, breached_crack_time_log10(self.breach_corpus, self.guesses_per_second))
+        if sink is not None:
+            sink.lap("strength.crack_time", start)
+        return log_seconds
+
+
+    # Retorna um dicionário com a análise completa (ou só com as métricas pedidas).
+    # Exemplo: get_password_analysis(metrics=("score",)) → {"password": ..., "score": 65}
+    def get_password_analysis(self, metrics=None) -> dict:
+        """
+        Retorna um dicionário com a análise da senha.
+        metrics: métricas desejadas (padrão: todas). Só elas são calculadas.
+        """
+        if metrics is None:
+            metrics = DEFAULT_METRICS
+            if self.pattern_analyzer is not None:
+                metrics += ("patterns",)
+            if self.breach_corpus is not None:
+                metrics += ("breached",)
         else:
-            return f"Aproximadamente {int(crack_seconds // 3.154e+8)} séculos"
+            unknown = [metric for metric in metrics if metric not in METRICS]
+            if unknown:
+                raise ValueError(f"Métrica desconhecida: {', '.join(unknown)}. Use uma de: {', '.join(METRICS)}.")
+
+        analysis = {"password": self.password}
+        for metric in METRICS:
+            if metric in metrics:
+                analysis[metric] = getattr(self, metric)
+        return analysis
 
 
-    # Retorna um dicionário com a análise completa.
-    def get_password_analysis(self) -> dict:
+    # Versão assíncrona: a análise roda no executor (None = executor padrão do event loop).
+    async def aanalyze(self, metrics=None, executor=None, timeout: float = None) -> dict:
         """
-        Retorna um dicionário com a análise completa da senha.
+        Igual a get_password_analysis, mas sem bloquear o event loop.
+        Levanta asyncio.TimeoutError se timeout (segundos) passar (a análise já começada termina no executor).
         """
-        return {
-            "password": self.password,
-            "length": self.length,
-            "score": self.score,
-            "security_level": self.security_level,
-            "crack_time": self.crack_time
-        }
+        future = asyncio.get_running_loop().run_in_executor(executor, partial(self.get_password_analysis, metrics))
+        return await asyncio.wait_for(future, timeout)
 
 '''
     Teste
@@ -0,0 +1,365 @@
+# O que faz?
+# Detecta padrões previsíveis na senha (no estilo do zxcvbn) e estima quantas tentativas
+# um atacante "esperto" precisaria, em vez de supor força bruta pura.
+# 1 - Padrões detectados
+#   - Palavras de dicionário (índice em disco, word_index.py), inclusive com l33t (p@ssw0rd).
+#   - Sequências de teclado (qwerty, asdf, 1qaz).
+#   - Repetições (aaaa, abcabc).
+#   - Sequências (abcd, 4321).
+#   - Datas (1987, 25/12/1990, 19900101).
+# 2 - Cada padrão tem uma estimativa de tentativas (em log10)
+#   - Os trechos sem padrão contam como força bruta sobre o conjunto de caracteres da senha.
+# 3 - Escolhe a combinação de padrões que cobre a senha com menos tentativas (programação dinâmica)
+# 4 - O score da senha é limitado conforme as tentativas estimadas (cap_score)
+#   - "Password123!" deixa de ser "Forte" quando "password" está no dicionário.
+
+import math
+import re
+from datetime import date
+from functools import lru_cache
+
+from modules.word_index import WordIndex
+
+
+# Comprimento mínimo de sequências, repetições e caminhos no teclado
+MIN_PATTERN_LENGTH = 3
+
+# Substituições l33t mais comuns (caractere → letra original)
+L33T_TABLE = str.maketrans({
+    "4": "a", "@": "a", "8": "b", "(": "c", "3": "e", "6": "g", "1": "i", "!": "i",
+    "|": "l", "0": "o", "$": "s", "5": "s", "7": "t", "+": "t", "2": "z"
+})
+
+# Teclado qwerty: linhas sem e com shift (mesma posição → mesma tecla)
+KEYBOARD_ROWS = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+KEYBOARD_SHIFTED_ROWS = ("~!@#$%^&*()_+", "QWERTYUIOP{}|", 'ASDFGHJKL:"', "ZXCVBNM<>?")
+
+# Sequências óbvias começam nestes caracteres
+OBVIOUS_SEQUENCE_STARTS = frozenset("aAzZ019")
+
+REFERENCE_YEAR = date.today().year
+MIN_YEAR_SPACE = 20
+
+# Limite de score por faixa de tentativas estimadas (log10): abaixo de 10^3 → no máximo 19, ...
+SCORE_CAPS = ((3, 19), (6, 39), (8, 59), (10, 79))
+
+_DATE_WITH_SEPARATOR = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+_REPEAT_LAZY = re.compile(r"(.+?)\1+", re.DOTALL)
+_REPEAT_GREEDY = re.compile(r"(.+)\1+", re.DOTALL)
+_YEAR = re.compile(r"19\d\d|20\d\d")
+
+
+def _keyboard_positions() -> dict:
+    """Mapeia cada caractere para (linha, coluna, com shift) no teclado qwerty."""
+    positions = {}
+    for shifted, rows in ((False, KEYBOARD_ROWS), (True, KEYBOARD_SHIFTED_ROWS)):
+        for row, keys in enumerate(rows):
+            for col, key in enumerate(keys):
+                positions[key] = (row, col, shifted)
+    return positions
+
+
+KEYBOARD_POSITIONS = _keyboard_positions()
+
+
+def keyboard_direction(a: str, b: str):
+    """
+    Retorna a direção (linha, coluna) de a para b se as teclas são vizinhas, senão None.
+    As linhas são deslocadas: a tecla acima fica na mesma coluna ou uma à direita.
+    """
+    pos_a = KEYBOARD_POSITIONS.get(a)
+    pos_b = KEYBOARD_POSITIONS.get(b)
+    if pos_a is None or pos_b is None:
+        return None
+    d_row = pos_b[0] - pos_a[0]
+    d_col = pos_b[1] - pos_a[1]
+    if (d_row == 0 and d_col in (-1, 1)) or (d_row == -1 and d_col in (0, 1)) or (d_row == 1 and d_col in (-1, 0)):
+        return d_row, d_col
+    return None
+
+
+def _average_keyboard_degree() -> float:
+    """Média de vizinhos por tecla (usada na estimativa dos caminhos no teclado)."""
+    keys = [key for row in KEYBOARD_ROWS for key in row]
+    return sum(sum(keyboard_direction(a, b) is not None for b in keys) for a in keys) / len(keys)
+
+
+KEYBOARD_STARTS = len(KEYBOARD_POSITIONS)
+KEYBOARD_DEGREE = _average_keyboard_degree()
+
+
+def _variations_log10(count: int, others: int) -> float:
+    """log10 do número de formas de escolher até `count` posições especiais entre count + others."""
+    if count == 0:
+        return 0.0
+    if others == 0:
+        return math.log10(2)  # Tudo variado (ex.: tudo maiúsculo): só uma alternativa a mais
+    total = sum(math.comb(count + others, i) for i in range(1, min(count, others) + 1))
+    return math.log10(total)
+
+
+def _uppercase_log10(token: str) -> float:
+    """Tentativas extras pelas maiúsculas de uma palavra (Password, PASSWORD, pAssWord)."""
+    upper = sum(char.isupper() for char in token)
+    lower = sum(char.islower() for char in token)
+    if upper == 0:
+        return 0.0
+    if upper == 1 and (token[0].isupper() or token[-1].isupper()):
+        return math.log10(2)  # Só a primeira ou a última maiúscula: muito comum
+    return _variations_log10(upper, lower)
+
+
+def _valid_date(day: int, month: int, year: int) -> bool:
+    """Confere se (dia, mês, ano) formam uma data plausível (anos de 2 ou 4 dígitos)."""
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return False
+    return year < 100 or 1000 <= year <= REFERENCE_YEAR + 50
+
+
+def _date_from_parts(parts: list):
+    """Retorna o ano da data se alguma ordem (d-m-a, m-d-a, a-m-d) for válida, senão None."""
+    first, middle, last = (int(part) for part in parts)
+    short_first, short_middle, short_last = (len(part) <= 2 for part in parts)
+    if (short_first and short_middle and len(parts[2]) in (2, 4)
+            and (_valid_date(first, middle, last) or _valid_date(middle, first, last))):
+        return last
+    if short_middle and short_last and len(parts[0]) in (2, 4) and _valid_date(last, middle, first):
+        return first
+    return None
+
+
+def _date_guesses_log10(year: int, separator: bool) -> float:
+    """Tentativas para uma data: 365 dias × anos a partir do ano de referência."""
+    if year < 100:
+        year += 1900 if year > REFERENCE_YEAR % 100 else 2000
+    guesses = 365 * max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+    if separator:
+        guesses *= 4
+    return math.log10(guesses)
+
+
+class PatternAnalyzer:
+    '''
+    Detector de padrões com índice de palavras opcional.
+
+    Sem índice, detecta apenas teclado, repetições, sequências e datas.
+    O mesmo objeto pode ser compartilhado por muitas análises (é só leitura).
+    '''
+
+    def __init__(self, index: WordIndex = None):
+        """Inicializa o detector com o índice de palavras (ou None)."""
+        self.index = index
+
+
+    def _dictionary_matches(self, password: str) -> list:
+        """Palavras do índice contidas na senha (também depois de desfazer o l33t)."""
+        if self.index is None:
+            return []
+
+        lowered = password.lower()
+        if len(lowered) != len(password):
+            # Alguns caracteres Unicode viram dois em minúsculas: mantém as posições alinhadas
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in password)
+        unleeted = lowered.translate(L33T_TABLE)
+        found = {}
+        for text, l33t in ((lowered, False), (unleeted, True)):
+            if l33t and text == lowered:
+                break
+            for start in range(len(text)):
+                for end, rank in self.index.matches_from(text, start):
+                    if end - start < MIN_PATTERN_LENGTH or (start, end) in found:
+                        continue
+                    token = password[start:end]
+                    substituted = sum(a != b for a, b in zip(lowered[start:end], text[start:end]))
+                    guesses = math.log10(rank) + _uppercase_log10(token)
+                    if substituted:
+                        guesses += _variations_log10(substituted, end - start - substituted)
+                    found[(start, end)] = {
+                        "pattern": "dictionary", "token": token, "start": start, "end": end,
+                        "guesses_log10": guesses, "word": text[start:end], "rank": rank, "l33t": bool(substituted)
+                    }
+        return list(found.values())
+
+
+    @staticmethod
+    def _keyboard_matches(password: str) -> list:
+        """Caminhos de teclas vizinhas (qwerty, zxcvbn, 1qaz2wsx)."""
+        matches = []
+        start = 0
+        n = len(password)
+        while start < n - 1:
+            end = start + 1
+            turns = 0
+            direction = None
+            while end < n:
+                step = keyboard_direction(password[end - 1], password[end])
+                if step is None:
+                    break
+                if step != direction:
+                    turns += 1
+                    direction = step
+                end += 1
+
+            if end - start >= MIN_PATTERN_LENGTH:
+                token = password[start:end]
+                shifted = sum(KEYBOARD_POSITIONS[char][2] for char in token)
+                guesses = (math.log10(KEYBOARD_STARTS * (end - start)) + turns * math.log10(KEYBOARD_DEGREE)
+                           + _variations_log10(shifted, len(token) - shifted))
+                matches.append({"pattern": "keyboard", "token": token, "start": start, "end": end,
+                                "guesses_log10": guesses, "turns": turns})
+            start = end if end - start >= MIN_PATTERN_LENGTH else start + 1
+        return matches
+
+
+    @staticmethod
+    def _sequence_matches(password: str) -> list:
+        """Sequências de letras ou dígitos com passo +1 ou -1 (abcd, 9876)."""
+        matches = []
+        start = 0
+        n = len(password)
+        while start < n - 1:
+            delta = ord(password[start + 1]) - ord(password[start])
+            end = start + 1
+            if delta in (-1, 1):
+                while (end < n and ord(password[end]) - ord(password[end - 1]) == delta
+                       and password[end].isalnum() and password[end].isascii()):
+                    end += 1
+
+            token = password[start:end]
+            if end - start >= MIN_PATTERN_LENGTH and token.isalnum() and token.isascii():
+                if token[0] in OBVIOUS_SEQUENCE_STARTS:
+                    base = 4
+                elif token[0].isdigit():
+                    base = 10
+                else:
+                    base = 26
+                guesses = math.log10(base * len(token) * (2 if delta < 0 else 1))
+                matches.append({"pattern": "sequence", "token": token, "start": start, "end": end,
+                                "guesses_log10": guesses})
+                start = end - 1
+            else:
+                start += 1
+        return matches
+
+
+    def _repeat_matches(self, password: str, charset: int) -> list:
+        """
+        Trechos repetidos (aaaa, abcabc): tentativas do bloco base × repetições.
+        Tenta cada posição inicial: a busca da esquerda para a direita pararia na primeira
+        repetição curta ("aa" em "aabcabc") e perderia "abcabc".
+        """
+        matches = []
+        last_end = 0
+        for start in range(len(password) - MIN_PATTERN_LENGTH + 1):
+            # A versão gulosa acha blocos longos (abcabc); a preguiçosa, muitas cópias de um bloco curto (aaaaa)
+            found = [match for match in (_REPEAT_GREEDY.match(password, start), _REPEAT_LAZY.match(password, start))
+                     if match is not None]
+            if not found:
+                continue
+            end = max(match.end() for match in found)
+            if end - start < MIN_PATTERN_LENGTH or end <= last_end:
+                continue  # Curto demais ou contido em uma repetição já encontrada
+            last_end = end
+            token = password[start:end]
+            base = _REPEAT_LAZY.fullmatch(token).group(1)  # Menor bloco que gera o trecho inteiro
+            count = len(token) // len(base)
+            base_guesses, _ = self.analyze(base, charset)
+            matches.append({"pattern": "repeat", "token": token, "start": start, "end": end,
+                            "guesses_log10": base_guesses + math.log10(count), "base": base, "count": count})
+        return matches
+
+
+    @staticmethod
+    def _date_matches(password: str) -> list:
+        """Datas com separador (25/12/1990), só com dígitos (19900101) e anos isolados (1987)."""
+        matches = []
+        for match in _DATE_WITH_SEPARATOR.finditer(password):
+            year = _date_from_parts([match.group(1), match.group(3), match.group(4)])
+            if year is not None:
+                matches.append({"pattern": "date", "token": match.group(0), "start": match.start(),
+                                "end": match.end(), "guesses_log10": _date_guesses_log10(year, True)})
+
+        n = len(password)
+        for start in range(n):
+            for length in range(4, 9):
+                end = start + length
+                if end > n:
+                    break
+                token = password[start:end]
+                if not token.isdigit() or not token.isascii():
+                    break
+                year = None
+                if length == 4 and _YEAR.fullmatch(token):
+                    year = int(token)
+                else:
+                    # Tenta todas as divisões em três partes (dia/mês com 1-2 dígitos, ano com 2 ou 4)
+                    for i in range(1, length - 1):
+                        for j in range(i + 1, length):
+                            parts = [token[:i], token[i:j], token[j:]]
+                            if all(len(part) in (1, 2, 4) for part in parts):
+                                year = _date_from_parts(parts)
+                                if year is not None:
+                                    break
+                        if year is not None:
+                            break
+                if year is not None:
+                    matches.append({"pattern": "date", "token": token, "start": start, "end": end,
+                                    "guesses_log10": _date_guesses_log10(year, False)})
+        return matches
+
+
+    def find_patterns(self, password: str, charset: int) -> list:
+        """Retorna todos os padrões encontrados (podem se sobrepor)."""
+        return (self._dictionary_matches(password) + self._keyboard_matches(password) +
+                self._sequence_matches(password) + self._repeat_matches(password, charset) +
+                self._date_matches(password))
+
+
+    def analyze(self, password: str, charset: int) -> tuple:
+        """
+        Retorna (log10 das tentativas, padrões usados) para a melhor cobertura da senha.
+        Os caracteres fora de qualquer padrão custam log10(charset) cada (força bruta).
+        """
+        n = len(password)
+        char_guesses = math.log10(charset) if charset > 1 else 0.0
+
+        ending_at = [[] for _ in range(n + 1)]
+        for match in self.find_patterns(password, charset):
+            ending_at[match["end"]].append(match)
+
+        # best[i]: menor log10 de tentativas para os i primeiros caracteres
+        best = [0.0] * (n + 1)
+        choice = [None] * (n + 1)
+        for end in range(1, n + 1):
+            best[end] = best[end - 1] + char_guesses
+            for match in ending_at[end]:
+                guesses = best[match["start"]] + match["guesses_log10"]
+                if guesses < best[end]:
+                    best[end] = guesses
+                    choice[end] = match
+
+        patterns = []
+        position = n
+        while position > 0:
+            match = choice[position]
+            if match is None:
+                position -= 1
+            else:
+                patterns.append(match)
+                position = match["start"]
+        patterns.reverse()
+        return best[n], patterns
+
+
+def cap_score(score: int, guesses_log10: float) -> int:
+    """Limita o score conforme as tentativas estimadas (senhas com padrões previsíveis)."""
+    for limit, max_score in SCORE_CAPS:
+        if guesses_log10 < limit:
+            return min(score, max_score)
+    return score
+
+
+@lru_cache(maxsize=8)
+def open_analyzer(index_path: str = None) -> PatternAnalyzer:
+    """Abre (uma vez por processo) o detector com o índice de palavras informado."""
+    return PatternAnalyzer(WordIndex(index_path) if index_path else None)
@@ -0,0 +1,197 @@
+# O que faz?
+# Arquivo de perfis de substituição pré-calculados (ConfigGenerator) compartilhado entre processos.
+# 1 - Cada perfil guarda a tabela de substituição das 26 letras de uma frase chave
+#   - E os parâmetros usados para calculá-la: versão do algoritmo e deslocamento aplicado.
+#   - O perfil é indexado pela impressão digital (BLAKE2b com o salt do arquivo) da frase chave
+#     normalizada. A frase chave em si nunca é gravada.
+#   - Atenção: a tabela revela as letras distintas da frase; o arquivo é tão sensível quanto ela.
+# 2 - Formato binário de registros fixos (inteiros little-endian)
+#   - Cabeçalho (72 bytes): MAGIC, versão, quantidade de posições, perfis gravados, salt.
+#   - Registros (128 bytes): impressão digital, versão, deslocamento, 26 code points.
+#   - Tabela hash com endereçamento aberto (sondagem linear), ocupação máxima de 50%.
+# 3 - O arquivo é aberto via mmap: nada é lido nem reconstruído ao iniciar o processo
+#   - A posição inicial vem direto dos bits da impressão digital: busca O(1), sem hash extra.
+#   - Com a frase no arquivo, o processo pula o cálculo da tabela (ConfigGenerator.from_subst_dict).
+
+import hashlib
+import mmap
+import os
+import string
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+from modules.config_generator import ConfigGenerator
+from modules.text_normalizer import normalize_cached
+
+
+STORE_MAGIC = b"PWPROF\x00\x01"
+PROFILE_VERSION = 1  # Versão do algoritmo de ConfigGenerator._generate_subst_dict
+
+FINGERPRINT_SIZE = 16
+SALT_SIZE = 16
+ALPHABET = string.ascii_lowercase
+
+_HEADER = struct.Struct("<8sIII16s36x")    # 72 bytes
+_RECORD = struct.Struct("<16sHH26I4x")      # 128 bytes
+_TARGETS_OFFSET = FINGERPRINT_SIZE + 4      # Início dos 26 code points dentro do registro
+_EMPTY = bytes(FINGERPRINT_SIZE)
+
+
+def _fingerprint(salt: bytes, key_phrase: str) -> bytes:
+    """Impressão digital da frase chave normalizada (nunca é só zeros: zeros marcam posição livre)."""
+    digest = hashlib.blake2b(normalize_cached(key_phrase).encode("utf-8"),
+                             digest_size=FINGERPRINT_SIZE, key=salt).digest()
+    return digest if digest != _EMPTY else b"\x01" + digest[1:]
+
+
+def _home_slot(fingerprint: bytes, slots: int) -> int:
+    """Posição inicial na tabela: os primeiros 8 bytes da impressão digital, sem hash extra."""
+    return int.from_bytes(fingerprint[:8], "little") % slots
+
+
+def _profile_offset(config: ConfigGenerator) -> int:
+    """Deslocamento usado por ConfigGenerator (posição de 'a' na ordem das letras da frase)."""
+    key_chars = list(dict.fromkeys(config.key_phrase)) + [c for c in ALPHABET if c not in config.key_phrase]
+    return key_chars.index(config.subst_dict["a"])
+
+
+def _pack_profile(fingerprint: bytes, config: ConfigGenerator) -> bytes:
+    """Monta o registro binário de um perfil."""
+    targets = [ord(config.subst_dict[char]) for char in ALPHABET]
+    return _RECORD.pack(fingerprint, PROFILE_VERSION, _profile_offset(config), *targets)
+
+
+def build_profile_store(key_phrases, path: str) -> int:
+    """
+    Grava os perfis das frases chave no arquivo. Se o arquivo já existe, os perfis dele
+    são mantidos (com o mesmo salt) e os novos são acrescentados.
+    Retorna a quantidade de perfis do arquivo.
+    """
+    records = {}
+    if os.path.exists(path):
+        store = ProfileStore(path)
+        try:
+            salt = store.salt
+            for record in store.records():
+                records[record[:FINGERPRINT_SIZE]] = record
+        finally:
+            store.close()
+    else:
+        salt = os.urandom(SALT_SIZE)
+
+    for key_phrase in key_phrases:
+        if not normalize_cached(key_phrase):
+            raise ValueError("A frase chave não pode ficar vazia após a normalização.")
+        fingerprint = _fingerprint(salt, key_phrase)
+        records[fingerprint] = _pack_profile(fingerprint, ConfigGenerator(key_phrase))
+
+    # Potência de 2 com pelo menos o dobro de posições: sondagens curtas
+    slots = 8
+    while slots < 2 * len(records):
+        slots *= 2
+    table = bytearray(slots * _RECORD.size)
+    for fingerprint, record in records.items():
+        slot = _home_slot(fingerprint, slots)
+        while table[slot * _RECORD.size:slot * _RECORD.size + FINGERPRINT_SIZE] != _EMPTY:
+            slot = (slot + 1) % slots
+        table[slot * _RECORD.size:(slot + 1) * _RECORD.size] = record
+
+    # Grava em um arquivo temporário e renomeia: um arquivo pela metade nunca é lido
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(STORE_MAGIC, PROFILE_VERSION, slots, len(records), salt))
+        f.write(table)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def build_profile_store_from_file(key_phrases_path: str, path: str) -> int:
+    """Grava no arquivo de perfis as frases chave de um arquivo texto (uma por linha)."""
+    with open(key_phrases_path, "r", encoding="utf-8") as f:
+        return build_profile_store((line.rstrip("\r\n") for line in f if line.strip()), path)
+
+
+class ProfileStore:
+    '''
+    Leitor do arquivo de perfis via mmap.
+
+    get() devolve um ConfigGenerator pronto, sem recalcular a tabela de substituição,
+    ou None se a frase chave não está no arquivo.
+    '''
+
+    def __init__(self, path: str):
+        """Abre e valida o arquivo de perfis."""
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Arquivo de perfis vazio: {path}.")
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"Arquivo de perfis inválido: {path}.")
+        magic, version, self.slots, self.count, self.salt = _HEADER.unpack_from(self._mmap)
+        if (magic != STORE_MAGIC or version != PROFILE_VERSION or self.slots < 1
+                or len(self._mmap) != _HEADER.size + self.slots * _RECORD.size):
+            self._mmap.close()
+            raise ValueError(f"Arquivo de perfis inválido ou de outra versão: {path}.")
+        self._view = memoryview(self._mmap)
+
+
+    def __len__(self) -> int:
+        """Quantidade de perfis no arquivo."""
+        return self.count
+
+
+    def close(self):
+        """Libera o mapeamento do arquivo."""
+        self._view.release()
+        self._mmap.close()
+
+
+    def records(self):
+        """Gera os registros binários ocupados (usado para reescrever o arquivo)."""
+        for slot in range(self.slots):
+            start = _HEADER.size + slot * _RECORD.size
+            if self._view[start:start + FINGERPRINT_SIZE] != _EMPTY:
+                yield bytes(self._view[start:start + _RECORD.size])
+
+
+    def _find(self, fingerprint: bytes) -> int:
+        """Offset do registro com a impressão digital (ou -1)."""
+        view = self._view
+        slot = _home_slot(fingerprint, self.slots)
+        for _ in range(self.slots):
+            start = _HEADER.size + slot * _RECORD.size
+            stored = view[start:start + FINGERPRINT_SIZE]
+            if stored == fingerprint:
+                return start
+            if stored == _EMPTY:
+                return -1
+            slot = (slot + 1) % self.slots
+        return -1
+
+
+    def get(self, key_phrase: str):
+        """Retorna o ConfigGenerator da frase chave a partir do arquivo, ou None se ela não está nele."""
+        start = self._find(_fingerprint(self.salt, key_phrase))
+        if start == -1:
+            return None
+
+        targets = self._view[start + _TARGETS_OFFSET:start + _TARGETS_OFFSET + 4 * len(ALPHABET)]
+        if sys.byteorder == "little":
+            targets = targets.cast("I")
+        else:
+            targets = array("I", targets)
+            targets.byteswap()
+        subst_dict = {char: chr(code) for char, code in zip(ALPHABET, targets)}
+        return ConfigGenerator.from_subst_dict(key_phrase, subst_dict)
+
+
+@lru_cache(maxsize=8)
+def open_store(path: str) -> ProfileStore:
+    """Abre (uma vez por processo) o arquivo de perfis."""
+    return ProfileStore(path)
@@ -0,0 +1,351 @@
+# O que faz?
+# Rotação incremental: gera de novo só as senhas cujos dados de derivação mudaram.
+# 1 - Mantém em disco um índice conta → impressão digital das últimas entradas usadas
+#   - A conta é o campo "id" de cada registro do inventário (o mesmo JSONL/CSV do modo em lote).
+#   - A impressão digital é um BLAKE2b de 16 bytes sobre frase base, frase chave, salt,
+#     comprimento, caracteres especiais, política e opções do gerador (KDF, modo de saída, alfabeto).
+#   - Políticas entram pelo conteúdo, não pelo nome: mudar as regras de um site gera de novo as contas dele.
+#   - O índice guarda as impressões digitais, nunca as frases nem as senhas.
+#   - A chave do BLAKE2b fica fora do índice, em um arquivo separado (padrão: <índice>.key, modo 0600).
+#     Sem a chave, o índice não permite testar palpites das frases; com ela, um palpite custa só
+#     um BLAKE2b (sem o KDF), então o arquivo da chave deve ser protegido como as próprias frases.
+# 2 - A cada rotação, só os registros novos ou alterados passam pelo gerador
+#   - A saída contém apenas a diferença: senhas novas, alteradas e contas removidas.
+# 3 - O índice é append-only: cada rotação acrescenta só as linhas das contas que mudaram
+#   - As linhas de um bloco são acrescentadas depois que os resultados dele já estão na saída.
+#   - Uma linha incompleta no fim do arquivo (rotação interrompida) é ignorada e descartada.
+# 4 - Compactação periódica
+#   - Quando as linhas obsoletas passam das vivas, o índice é reescrito (arquivo temporário + rename).
+
+import hashlib
+import json
+import os
+from collections import deque
+
+from modules.batch_processor import parse_record, read_records
+from modules.password_policy import get_policy
+
+
+INDEX_MAGIC = b"PWROT2"
+LEGACY_MAGIC = b"PWROT1"  # Formato antigo, com a chave no cabeçalho: migrado ao abrir
+FINGERPRINT_SIZE = 16
+KEY_SIZE = 16
+CHECK_SIZE = 8
+
+# Compacta quando há mais que COMPACT_RATIO linhas por conta viva (e pelo menos COMPACT_MIN_LINES)
+COMPACT_RATIO = 2
+COMPACT_MIN_LINES = 1024
+
+_REMOVED = b"-"  # Marca de conta removida no lugar da impressão digital
+
+
+class RotationIndex:
+    '''
+    Índice append-only de impressões digitais por conta.
+
+    Formato (texto, uma entrada por linha):
+      - Cabeçalho: PWROT2 <verificador da chave em hexadecimal> (BLAKE2b de 8 bytes, só confere a chave)
+      - Entrada: <impressão digital em hexadecimal> <conta em JSON>
+      - Remoção: - <conta em JSON>
+    A última linha de cada conta vale; as anteriores são removidas na compactação.
+    '''
+
+    def __init__(self, path: str, key_path: str = None):
+        """
+        Abre o índice (ou cria um vazio se o arquivo não existe).
+        key_path: arquivo da chave (padrão: <índice>.key), criado com uma chave aleatória se não existir.
+        """
+        self.path = path
+        self.key_path = key_path or path + ".key"
+        self._fingerprints = {}
+        self._lines = 0
+        self.key = self._load_key()
+        if os.path.exists(path):
+            self._load()
+        else:
+            if self.key is None:
+                self.key = self._create_key()
+            self.compact()
+
+
+    def _load_key(self):
+        """Lê a chave do arquivo separado (None se ele não existe)."""
+        try:
+            with open(self.key_path, "rb") as f:
+                key = bytes.fromhex(f.read().decode("ascii").strip())
+        except FileNotFoundError:
+            return None
+        except (UnicodeDecodeError, ValueError):
+            key = b""
+        if len(key) != KEY_SIZE:
+            raise ValueError(f"Chave do índice de rotação inválida: {self.key_path}.")
+        return key
+
+
+    def _create_key(self, key: bytes = None) -> bytes:
+        """Grava a chave (nova, se não for informada) no arquivo separado, só com permissão do dono."""
+        key = key or os.urandom(KEY_SIZE)
+        tmp_path = self.key_path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key.hex().encode("ascii") + b"\n")
+        os.replace(tmp_path, self.key_path)
+        return key
+
+
+    def _key_check(self) -> bytes:
+        """Verificador da chave gravado no cabeçalho (não revela a chave)."""
+        return hashlib.blake2b(INDEX_MAGIC, digest_size=CHECK_SIZE, key=self.key).digest()
+
+
+    def _load(self):
+        """Lê o índice inteiro, aplicando as entradas na ordem em que foram escritas."""
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            magic, _, value_hex = header.strip().partition(b" ")
+            try:
+                value = bytes.fromhex(value_hex.decode("ascii"))
+            except (UnicodeDecodeError, ValueError):
+                value = b""
+            if not header.endswith(b"\n") or magic not in (INDEX_MAGIC, LEGACY_MAGIC):
+                raise ValueError(f"Índice de rotação inválido: {self.path}.")
+
+            legacy = magic == LEGACY_MAGIC
+            if legacy:
+                # A chave estava no próprio índice: passa para o arquivo separado e reescreve o índice
+                if len(value) != KEY_SIZE or (self.key is not None and self.key != value):
+                    raise ValueError(f"Índice de rotação inválido: {self.path}.")
+                if self.key is None:
+                    self.key = self._create_key(value)
+            elif self.key is None:
+                raise ValueError(f"Chave do índice de rotação não encontrada: {self.key_path}.")
+            elif value != self._key_check():
+                raise ValueError(f"A chave {self.key_path} não é a do índice de rotação {self.path}.")
+            self._size = len(header)
+
+            for line_no, line in enumerate(f, start=2):
+                if not line.endswith(b"\n"):
+                    break  # Linha incompleta: a escrita foi interrompida, ela é descartada no próximo append
+                fingerprint, _, account = line[:-1].partition(b" ")
+                try:
+                    account = json.loads(account)
+                    fingerprint = None if fingerprint == _REMOVED else bytes.fromhex(fingerprint.decode("ascii"))
+                except (UnicodeDecodeError, ValueError):
+                    raise ValueError(f"Índice de rotação inválido: {self.path} (linha {line_no}).")
+
+                if fingerprint is None:
+                    self._fingerprints.pop(account, None)
+                else:
+                    self._fingerprints[account] = fingerprint
+                self._lines += 1
+                self._size += len(line)
+
+        if legacy:
+            self.compact()
+
+
+    def __len__(self) -> int:
+        """Quantidade de contas no índice."""
+        return len(self._fingerprints)
+
+
+    def accounts(self):
+        """Retorna as contas do índice."""
+        return self._fingerprints.keys()
+
+
+    def get(self, account: str):
+        """Retorna a impressão digital salva da conta (ou None)."""
+        return self._fingerprints.get(account)
+
+
+    def fingerprint(self, record: dict, generator_options: dict = None, policies: dict = None) -> bytes:
+        """Impressão digital das entradas de derivação de um registro já validado (parse_record)."""
+        options = {key: value for key, value in (generator_options or {}).items() if value is not None}
+        if "policy" in options:
+            options["policy"] = get_policy(options["policy"]).to_dict()
+        inputs = [record["base_phrase"], record["key_phrase"], record["salt"],
+                  record["pwd_length"], record["extended_chars"], options]
+        if record.get("policy") is not None:
+            inputs.append(get_policy(record["policy"], policies).to_dict())
+        data = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=FINGERPRINT_SIZE, key=self.key).digest()
+
+
+    @staticmethod
+    def _line(account: str, fingerprint) -> bytes:
+        """Monta a linha de uma entrada (fingerprint None = remoção)."""
+        marker = _REMOVED if fingerprint is None else fingerprint.hex().encode("ascii")
+        return marker + b" " + json.dumps(account, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+    def append(self, updates):
+        """
+        Acrescenta ao fim do arquivo as alterações: pares (conta, impressão digital ou None para remover).
+        Só as contas informadas são escritas; o restante do arquivo não é tocado.
+        """
+        data = bytearray()
+        for account, fingerprint in updates:
+            data += self._line(account, fingerprint)
+            if fingerprint is None:
+                self._fingerprints.pop(account, None)
+            else:
+                self._fingerprints[account] = fingerprint
+            self._lines += 1
+        if not data:
+            return
+
+        with open(self.path, "ab") as f:
+            if f.tell() != self._size:
+                f.truncate(self._size)  # Descarta uma linha incompleta de uma rotação interrompida
+            f.write(data)
+        self._size += len(data)
+
+
+    def needs_compaction(self) -> bool:
+        """True se as linhas obsoletas já ocupam mais que as vivas."""
+        return self._lines >= COMPACT_MIN_LINES and self._lines > COMPACT_RATIO * len(self._fingerprints)
+
+
+    def compact(self):
+        """Reescreve o índice só com a última entrada de cada conta (arquivo temporário + rename)."""
+        header = INDEX_MAGIC + b" " + self._key_check().hex().encode("ascii") + b"\n"
+        tmp_path = self.path + ".tmp"
+        size = len(header)
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            for account, fingerprint in self._fingerprints.items():
+                line = self._line(account, fingerprint)
+                f.write(line)
+                size += len(line)
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._fingerprints)
+        self._size = size
+
+
+class IncrementalRotation:
+    '''
+    Rotação de um inventário de contas com um RotationIndex.
+
+    Usa o mesmo processador do modo em lote (BatchProcessor ou ParallelDeriver),
+    mas entrega a ele só os registros cuja impressão digital mudou.
+    '''
+
+    def __init__(self, index: RotationIndex, processor, chunk_size: int = 1000):
+        """Inicializa a rotação com o índice e o processador que gera as senhas."""
+        if chunk_size < 1:
+            raise ValueError("O tamanho do bloco deve ser pelo menos 1.")
+        self.index = index
+        self.processor = processor
+        self.generator_options = getattr(processor, "generator_options", None) or {}
+        self.policies = getattr(processor, "policies", None)
+        self.chunk_size = chunk_size
+
+        self.total = 0
+        self.unchanged = 0
+        self.created = 0
+        self.changed = 0
+        self.removed = 0
+        self.errors = 0
+        self.unknown_accounts = 0
+
+
+    def _select(self, records, seen: set, pending: deque):
+        """
+        Filtra o inventário: gera só os registros novos, alterados ou inválidos.
+        Para cada registro gerado, guarda em pending (conta, impressão digital, situação).
+        """
+        for line_no, raw in records:
+            self.total += 1
+            account = raw.get("id") if isinstance(raw, dict) else None
+            if account in (None, ""):
+                # Sem conta não dá para saber o que foi removido: a rotação não marca remoções
+                self.unknown_accounts += 1
+                pending.append((None, None, None))
+                yield line_no, raw if isinstance(raw, Exception) else ValueError("Campo obrigatório ausente: id.")
+                continue
+
+            account = str(account)
+            if account in seen:
+                pending.append((None, None, None))
+                yield line_no, ValueError(f"Conta repetida no inventário: '{account}'.")
+                continue
+            seen.add(account)
+
+            try:
+                fingerprint = self.index.fingerprint(parse_record(raw), self.generator_options, self.policies)
+            except ValueError:
+                pending.append((None, None, None))
+                yield line_no, raw  # O processador registra o erro na saída
+                continue
+
+            previous = self.index.get(account)
+            if previous == fingerprint:
+                self.unchanged += 1
+                continue
+            pending.append((account, fingerprint, "new" if previous is None else "changed"))
+            yield line_no, raw
+
+
+    def _flush(self, output_stream, lines: list, updates: list):
+        """Escreve um bloco na saída e só depois registra as alterações no índice."""
+        output_stream.write("".join(lines))
+        output_stream.flush()
+        self.index.append(updates)
+        lines.clear()
+        updates.clear()
+
+
+    def run(self, input_stream, output_stream, fmt: str = "jsonl") -> dict:
+        """
+        Lê o inventário, gera as senhas que mudaram e escreve só a diferença em JSONL.
+        Retorna o resumo da rotação.
+        """
+        seen = set()
+        pending = deque()
+        lines = []
+        updates = []
+
+        for result in self.processor.process(self._select(read_records(input_stream, fmt), seen, pending)):
+            account, fingerprint, status = pending.popleft()
+            if "error" in result:
+                self.errors += 1  # A conta mantém a impressão digital anterior e é tentada de novo na próxima rotação
+            else:
+                result["status"] = status
+                updates.append((account, fingerprint))
+                if status == "new":
+                    self.created += 1
+                else:
+                    self.changed += 1
+            lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+            if len(lines) >= self.chunk_size:
+                self._flush(output_stream, lines, updates)
+
+        if not self.unknown_accounts:
+            for account in [account for account in self.index.accounts() if account not in seen]:
+                lines.append(json.dumps({"id": account, "status": "removed"}, ensure_ascii=False) + "\n")
+                updates.append((account, None))
+                self.removed += 1
+                if len(lines) >= self.chunk_size:
+                    self._flush(output_stream, lines, updates)
+        self._flush(output_stream, lines, updates)
+
+        compacted = self.index.needs_compaction()
+        if compacted:
+            self.index.compact()
+        return self.summary(compacted)
+
+
+    def summary(self, compacted: bool = False) -> dict:
+        """Retorna as contagens da rotação."""
+        return {
+            "records": self.total,
+            "unchanged": self.unchanged,
+            "new": self.created,
+            "changed": self.changed,
+            "removed": self.removed,
+            "errors": self.errors,
+            "removals_skipped": self.unknown_accounts > 0,
+            "index_accounts": len(self.index),
+            "compacted": compacted
+        }
@@ -0,0 +1,177 @@
+# O que faz?
+# Pipeline alternativo do PasswordGenerator (modo "hex") sobre buffers mutáveis (bytearray),
+# que são zerados ao final: os segredos ficam na memória só enquanto são usados.
+# 1 - Normalização e substituição em uma única chamada de bytes.translate
+#   - Uma tabela de 256 bytes já converte maiúsculas em minúsculas e aplica a substituição;
+#     a remoção de pontuação e espaços acontece na mesma passada.
+#   - Frases não ASCII passam pelo normalizador de texto (unicodedata), que trabalha com str:
+#     nesse caso sobra uma cópia temporária em str que não pode ser apagada.
+# 2 - O hashlib recebe os próprios buffers (protocolo de buffer), sem montar texto + salt
+#   - Com KDF, PBKDF2/scrypt também recebem os buffers (key_stretching.derive_key).
+# 3 - A senha é escrita direto em um bytearray: hexadecimal e caracteres especiais sem str intermediária
+#   - O resultado é idêntico ao de PasswordGenerator.generate_password() no modo "hex".
+# 4 - Gerenciador de contexto: ao sair do "with" (ou em wipe()), todos os buffers criados,
+#   inclusive as senhas devolvidas, são zerados.
+# Limites: os digests devolvidos pelo hashlib são bytes imutáveis e o estado interno do hash
+# não é apagado; modos "dense" e políticas continuam no PasswordGenerator.
+
+import hashlib
+import string
+
+from modules.dense_output import SPECIAL_CHARS
+from modules.key_stretching import derive_key, validate_params
+from modules.text_normalizer import _ASCII_NON_ALNUM, normalize_text
+
+# Só minúsculas (usada no salt, que não passa pela substituição)
+_LOWER_TABLE = bytes.maketrans(string.ascii_uppercase.encode("ascii"), string.ascii_lowercase.encode("ascii"))
+
+_HEX_DIGITS = b"0123456789abcdef"
+
+
+def _nibble(digest: bytes, i: int) -> int:
+    """i-ésimo dígito hexadecimal do digest, como inteiro (equivale a int(hexdigest[i], 16))."""
+    byte = digest[i >> 1]
+    return byte >> 4 if i % 2 == 0 else byte & 0x0F
+
+
+def wipe(buffer: bytearray):
+    """Zera um bytearray no lugar (sem realocar)."""
+    buffer[:] = bytes(len(buffer))
+
+
+class SecureDerivation:
+    '''
+    Gera senhas (modo "hex") em buffers que são zerados ao sair do contexto.
+
+    Uso:
+        with SecureDerivation(config.get_subst_dict(), pwd_length=16) as derivation:
+            password = derivation.derive(bytearray(b"frase base"), b"salt")
+            ... usa a senha (bytearray) ...
+        # aqui a senha e os intermediários já foram zerados
+
+    O mesmo objeto pode ser usado para várias derivações; wipe() zera as anteriores.
+    '''
+
+    def __init__(self, subst_dict: dict, pwd_length: int = 16, extended_chars: bool = False,
+                 kdf_params: dict = None):
+        """Pré-calcula as tabelas de tradução a partir do dicionário de substituições."""
+        self.pwd_length = pwd_length
+        self.extended_chars = extended_chars
+        self.kdf_params = validate_params(kdf_params) if kdf_params is not None else None
+        self._buffers = []
+
+        # Destinos da substituição em UTF-8 (podem ser dígitos ou letras não ASCII da frase chave)
+        self._targets = {ord(char): new.encode("utf-8") for char, new in subst_dict.items()
+                         if len(char) == 1 and char.isascii()}
+        self._ascii_targets = all(len(target) == 1 for target in self._targets.values())
+
+        # Tabela única: maiúscula → minúscula → substituição
+        table = bytearray(_LOWER_TABLE)
+        if self._ascii_targets:
+            for byte in range(256):
+                target = self._targets.get(table[byte])
+                if target is not None:
+                    table[byte] = target[0]
+        self._table = bytes(table)
+
+
+    def __enter__(self):
+        """Entra no contexto."""
+        return self
+
+
+    def __exit__(self, exc_type, exc, traceback):
+        """Zera todos os buffers ao sair do contexto (inclusive em caso de erro)."""
+        self.wipe()
+        return False
+
+
+    def wipe(self):
+        """Zera todos os buffers criados até agora, inclusive as senhas devolvidas."""
+        for buffer in self._buffers:
+            wipe(buffer)
+        self._buffers.clear()
+
+
+    def _track(self, buffer: bytearray) -> bytearray:
+        """Registra um buffer para ser zerado em wipe()."""
+        self._buffers.append(buffer)
+        return buffer
+
+
+    def _to_buffer(self, data) -> bytearray:
+        """Converte a entrada (bytes-like em UTF-8 ou str) em um bytearray. O bytearray do chamador é usado como está."""
+        if isinstance(data, bytearray):
+            return data
+        if isinstance(data, str):
+            return self._track(bytearray(data, "utf-8"))  # O str original continua na memória do chamador
+        return self._track(bytearray(data))
+
+
+    def _map_targets(self, normalized: bytearray) -> bytearray:
+        """Aplica substituições com destinos de vários bytes (UTF-8), já no tamanho final."""
+        targets = self._targets
+        size = sum(len(targets[byte]) if byte in targets else 1 for byte in normalized)
+        out = self._track(bytearray(size))  # Pré-alocado: crescer o buffer deixaria cópias soltas
+        pos = 0
+        for byte in normalized:
+            target = targets.get(byte)
+            if target is None:
+                out[pos] = byte
+                pos += 1
+            else:
+                out[pos:pos + len(target)] = target
+                pos += len(target)
+        return out
+
+
+    def _normalize(self, data: bytearray, substitute: bool) -> bytearray:
+        """Normaliza (minúsculas, só letras e números) e, se pedido, aplica a substituição."""
+        if data.isascii():
+            if not substitute:
+                return self._track(data.translate(_LOWER_TABLE, _ASCII_NON_ALNUM))
+            if self._ascii_targets:
+                return self._track(data.translate(self._table, _ASCII_NON_ALNUM))
+            return self._map_targets(self._track(data.translate(_LOWER_TABLE, _ASCII_NON_ALNUM)))
+
+        # Caminho Unicode: mesmo resultado de text_normalizer.normalize_text
+        normalized = self._track(bytearray(normalize_text(data.decode("utf-8")), "utf-8"))
+        if not substitute:
+            return normalized
+        if self._ascii_targets:
+            return self._track(normalized.translate(self._table))
+        return self._map_targets(normalized)
+
+
+    def derive(self, base_phrase, salt=b"") -> bytearray:
+        """
+        Gera a senha no mesmo formato de PasswordGenerator.generate_password() (modo "hex").
+        base_phrase e salt: bytes-like em UTF-8 (de preferência bytearray) ou str.
+        A senha devolvida (bytearray ASCII) é zerada em wipe() ou ao sair do contexto.
+        """
+        transformed = self._normalize(self._to_buffer(base_phrase), substitute=True)
+        salt_buffer = self._normalize(self._to_buffer(salt), substitute=False)
+
+        if self.kdf_params is not None:
+            digest = derive_key(transformed, salt_buffer, self.kdf_params)
+        else:
+            hasher = hashlib.sha256(transformed)
+            hasher.update(salt_buffer)
+            digest = hasher.digest()
+
+        # Os primeiros pwd_length dígitos hexadecimais, escritos direto no buffer da senha
+        length = min(self.pwd_length, 2 * len(digest))
+        password = self._track(bytearray(length))
+        for i in range(length):
+            password[i] = _HEX_DIGITS[_nibble(digest, i)]
+
+        if self.extended_chars:
+            # Mesmas posições e caracteres de PasswordGenerator._inject_special_chars
+            positions = hashlib.md5(password).digest()
+            for i in range(min(length // 4, len(SPECIAL_CHARS))):
+                password[_nibble(positions, i) % length] = ord(SPECIAL_CHARS[i])
+
+        # Os intermediários não são mais necessários: zera já, sem esperar o fim do contexto
+        wipe(transformed)
+        wipe(salt_buffer)
+        return password
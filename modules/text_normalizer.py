@@ -0,0 +1,36 @@
+# O que faz?
+# Normalizador de texto compartilhado por ConfigGenerator e PasswordGenerator.
+# 1 - Remove acentos (NFKD + remoção de caracteres combinantes)
+# 2 - Converte para minúsculas
+# 3 - Mantém apenas letras e números
+#   - Exemplo: "Máximo Segurança!!" → "maximoseguranca"
+# Caminho rápido: texto puramente ASCII (a maioria das frases) não passa pelo
+# unicodedata; usa bytes.lower() e uma tabela de remoção pré-calculada.
+# O resultado é idêntico ao do caminho completo, então as senhas não mudam.
+# normalize_cached memoriza frases repetidas (salts e frases chave) em um cache limitado.
+
+import string
+import unicodedata
+from functools import lru_cache
+
+
+# Bytes ASCII que não são letras nem números (removidos no caminho rápido)
+_ASCII_NON_ALNUM = bytes(b for b in range(128) if chr(b) not in string.ascii_letters + string.digits)
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza o texto removendo acentos e pontuações, deixando apenas letras e números minúsculos."""
+    if text.isascii():
+        # Em ASCII o NFKD não altera nada e isalnum() equivale a [A-Za-z0-9]
+        return text.encode("ascii").lower().translate(None, _ASCII_NON_ALNUM).decode("ascii")
+
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    text = text.lower()
+    text = ''.join(c for c in text if c.isalnum())  # Remove pontuação
+    return text
+
+
+@lru_cache(maxsize=1024)
+def normalize_cached(text: str) -> str:
+    """Igual a normalize_text, mas memoriza o resultado (para salts e frases chave repetidos)."""
+    return normalize_text(text)
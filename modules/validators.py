@@ -0,0 +1,26 @@
+# O que faz?
+# Centraliza a validação dos parâmetros de geração de senha.
+#   - Usado pela CLI (main.py) e pelo modo em lote (batch_processor.py).
+#   - Levanta ValueError com uma mensagem explicativa quando algo está errado.
+
+
+def validar_entrada(base_phrase, key_phrase, salt, pwd_length):
+    """Verifica se os parâmetros fornecidos são válidos."""
+
+    if not base_phrase.strip():
+        raise ValueError("A frase base não pode estar vazia.")
+
+    if not key_phrase.strip():
+        raise ValueError("A frase chave não pode estar vazia.")
+
+    if pwd_length < 8:
+        raise ValueError("O comprimento da senha deve ser pelo menos 8 caracteres.")
+
+    if len(base_phrase) < 4:
+        raise ValueError("A frase base deve ter pelo menos 4 caracteres.")
+
+    if len(key_phrase) < 4:
+        raise ValueError("A frase chave deve ter pelo menos 4 caracteres.")
+
+    if len(salt) < 2:
+        raise ValueError("O salt deve ter pelo menos 2 caracteres.")
@@ -0,0 +1,179 @@
+# O que faz?
+# Índice de palavras em disco para a detecção de palavras de dicionário (pattern_analyzer.py).
+# 1 - Compila uma lista de palavras (uma por linha, da mais comum para a menos comum) uma única vez
+#   - As palavras são convertidas para minúsculas e ordenadas (em bytes UTF-8).
+#   - A posição na lista original vira o "rank" da palavra (1 = mais comum).
+# 2 - Formato do arquivo (inteiros de 32 bits little-endian):
+#   - Cabeçalho: MAGIC, quantidade de palavras, maior palavra (em bytes).
+#   - Offsets: início de cada palavra no bloco de texto (quantidade + 1 valores).
+#   - Ranks: rank de cada palavra, na ordem ordenada.
+#   - Texto: as palavras concatenadas, sem separador.
+# 3 - O arquivo é aberto via mmap: abrir é instantâneo e só as páginas usadas vão para a memória
+#   - Nada é carregado nem reconstruído ao iniciar o processo.
+# 4 - Busca como em uma trie: o intervalo de palavras com o mesmo prefixo é estreitado byte a byte
+#   - Todas as palavras que começam em uma posição do texto saem de uma única passada.
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+
+MAGIC = b"PWIDX\x00\x01\x00"
+_HEADER = struct.Struct("<8sII")
+
+
+def _little_endian(values: array) -> bytes:
+    """Retorna os bytes de um array('I') em little-endian (o formato do arquivo)."""
+    if sys.byteorder != "little":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def build_word_index(words, path: str) -> int:
+    """
+    Compila as palavras (iterável, da mais comum para a menos comum) no arquivo de índice.
+    Palavras repetidas mantêm o primeiro rank. Retorna a quantidade de palavras do índice.
+    """
+    ranks = {}
+    for word in words:
+        word = word.strip().lower()
+        if word and word not in ranks:
+            ranks[word] = len(ranks) + 1
+
+    encoded = sorted((word.encode("utf-8"), rank) for word, rank in ranks.items())
+
+    offsets = array("I", [0])
+    sorted_ranks = array("I")
+    for word, rank in encoded:
+        offsets.append(offsets[-1] + len(word))
+        sorted_ranks.append(rank)
+    max_length = max((len(word) for word, _ in encoded), default=0)
+
+    # Grava em um arquivo temporário e renomeia: um índice pela metade nunca é lido
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded), max_length))
+        f.write(_little_endian(offsets))
+        f.write(_little_endian(sorted_ranks))
+        for word, _ in encoded:
+            f.write(word)
+    os.replace(tmp_path, path)
+    return len(encoded)
+
+
+def build_word_index_from_file(wordlist_path: str, path: str) -> int:
+    """Compila um arquivo de palavras (uma por linha; colunas extras são ignoradas) no índice."""
+    with open(wordlist_path, "r", encoding="utf-8", errors="replace") as f:
+        return build_word_index((line.split(maxsplit=1)[0] for line in f if line.strip()), path)
+
+
+class WordIndex:
+    '''
+    Leitor do índice de palavras via mmap.
+
+    As buscas não copiam o arquivo: offsets, ranks e texto são lidos direto
+    das páginas mapeadas.
+    '''
+
+    def __init__(self, path: str):
+        """Abre e valida o arquivo de índice."""
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Índice de palavras vazio: {path}.")
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"Índice de palavras inválido: {path}.")
+        magic, self.count, self.max_length = _HEADER.unpack_from(self._mmap)
+        ranks_start = _HEADER.size + 4 * (self.count + 1)
+        blob_start = ranks_start + 4 * self.count
+        if magic != MAGIC or len(self._mmap) < blob_start:
+            self._mmap.close()
+            raise ValueError(f"Índice de palavras inválido: {path}.")
+
+        view = memoryview(self._mmap)
+        if sys.byteorder == "little":
+            self._offsets = view[_HEADER.size:ranks_start].cast("I")
+            self._ranks = view[ranks_start:blob_start].cast("I")
+        else:
+            # Máquinas big-endian: converte as tabelas uma vez (o texto continua mapeado)
+            self._offsets = array("I", view[_HEADER.size:ranks_start])
+            self._offsets.byteswap()
+            self._ranks = array("I", view[ranks_start:blob_start])
+            self._ranks.byteswap()
+        self._blob = view[blob_start:]
+        self._view = view
+
+        # Intervalo de palavras por primeiro byte: o primeiro passo da busca vira uma consulta à tabela
+        bounds = [self._lower_bound(0, self.count, 0, byte) for byte in range(257)]
+        self._first_byte = [(bounds[byte], bounds[byte + 1]) for byte in range(256)]
+
+
+    def close(self):
+        """Libera o mapeamento do arquivo."""
+        for view in (self._offsets, self._ranks, self._blob, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+
+    def _lower_bound(self, lo: int, hi: int, depth: int, value: int) -> int:
+        """
+        Primeira palavra em [lo, hi) cujo byte na posição depth é >= value.
+        Palavras mais curtas que depth + 1 contam como -1 (vêm antes na ordenação).
+        """
+        offsets = self._offsets
+        blob = self._blob
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = offsets[mid] + depth
+            byte = blob[pos] if pos < offsets[mid + 1] else -1
+            if byte < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+    def matches_from(self, text: str, start: int) -> list:
+        """
+        Retorna (fim, rank) de cada palavra do índice igual a text[start:fim].
+        O texto deve estar em minúsculas. Custo proporcional ao comprimento da maior palavra encontrada.
+        """
+        matches = []
+        if start >= len(text):
+            return matches
+        encoded = text[start].encode("utf-8")
+        lo, hi = self._first_byte[encoded[0]]
+        if lo >= hi:
+            return matches  # Nenhuma palavra começa com este byte
+        depth = 1
+        offsets = self._offsets
+
+        for end in range(start, len(text)):
+            for byte in (encoded[1:] if end == start else text[end].encode("utf-8")):
+                lo = self._lower_bound(lo, hi, depth, byte)
+                hi = self._lower_bound(lo, hi, depth, byte + 1)
+                if lo >= hi:
+                    return matches  # Nenhuma palavra continua com este prefixo
+                depth += 1
+
+            # A palavra exatamente igual ao prefixo, se existir, é a primeira do intervalo
+            if offsets[lo + 1] - offsets[lo] == depth:
+                matches.append((end + 1, self._ranks[lo]))
+        return matches
+
+
+    def rank(self, word: str):
+        """Retorna o rank da palavra (1 = mais comum) ou None se ela não está no índice."""
+        word = word.lower()
+        for end, rank in self.matches_from(word, 0):
+            if end == len(word):
+                return rank
+        return None
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from modules.async_api import TIMEOUT_ERROR, AsyncDeriver
+from modules.batch_processor import BatchProcessor
+from modules.pattern_analyzer import PatternAnalyzer
+from modules.password_strenght import PasswordStrength
+
+
+RECORDS = [
+    {"id": f"conta{i}", "base_phrase": f"frase {i}", "key_phrase": f"chave {i % 3}", "salt": f"sal{i}",
+     "pwd_length": 8 + i % 20, "extended_chars": i % 2 == 0}
+    for i in range(40)
+] + [{"id": "ruim", "base_phrase": "frase", "key_phrase": "chave", "pwd_length": "abc"}]
+
+
+class BlockingAnalyzer(PatternAnalyzer):
+    """Detector de padrões que espera um sinal e anota a thread de cada chamada."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.threads = []
+
+    def analyze(self, password, charset):
+        self.threads.append(threading.current_thread())
+        self.release.wait(5)
+        return super().analyze(password, charset)
+
+
+def test_derive_many_matches_batch_mode():
+    expected = list(BatchProcessor().process(enumerate(RECORDS, start=1)))
+    results = asyncio.run(AsyncDeriver(max_concurrency=4).derive_many(RECORDS))
+    for result, batch in zip(results, expected):
+        del batch["line"]
+        assert result == batch
+
+
+def test_derive_applies_strength_options_in_the_executor():
+    analyzer = BlockingAnalyzer()
+    analyzer.release.set()
+    options = {"attacker_profile": "gpu_cluster_md5", "pattern_analyzer": analyzer}
+    deriver = AsyncDeriver(strength_options=options)
+    result = asyncio.run(deriver.derive(RECORDS[0]))
+    assert analyzer.threads and threading.main_thread() not in analyzer.threads
+
+    password = result["password"]
+    assert result == PasswordStrength(password, **options).get_password_analysis()
+    assert result["crack_time"] != PasswordStrength(password).get_password_analysis()["crack_time"]
+
+
+def test_timeout_keeps_the_slot_until_the_work_finishes():
+    analyzer = BlockingAnalyzer()
+    deriver = AsyncDeriver(max_concurrency=1, timeout=0.05, strength_options={"pattern_analyzer": analyzer})
+
+    async def scenario():
+        first = await deriver._guarded(deriver.analyze("Senha@123"))
+        second = asyncio.ensure_future(deriver._guarded(deriver.analyze("Outra#456")))
+        await asyncio.sleep(0.2)
+        started_while_busy = len(analyzer.threads)
+        deriver.timeout = None
+        analyzer.release.set()
+        return first, started_while_busy, await second
+
+    first, started_while_busy, second = asyncio.run(scenario())
+    assert first == {"error": TIMEOUT_ERROR}
+    assert started_while_busy == 1  # A segunda análise esperou a primeira terminar de fato
+    assert second["score"] == PasswordStrength("Outra#456", pattern_analyzer=PatternAnalyzer()).score
@@ -0,0 +1,61 @@
+import io
+import json
+
+import pytest
+
+from modules.batch_processor import BatchProcessor, parse_record
+from modules.breach_check import sha1_hex
+from modules.parallel_engine import ParallelDeriver, open_strength_options
+from modules.password_strenght import PasswordStrength
+from modules.word_index import build_word_index
+
+
+VALID = {"base_phrase": "minha frase", "key_phrase": "segredo", "salt": "sal", "pwd_length": 16}
+
+
+def run_batch(lines):
+    output = io.StringIO()
+    processed, errors = BatchProcessor().run(io.StringIO("".join(lines)), output)
+    return processed, errors, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("raw_length", ["1e400", "-1e400", "16.9", "NaN"])
+def test_non_integer_length_is_a_record_error(raw_length):
+    bad = json.dumps(VALID)[:-1].replace('"pwd_length": 16', f'"pwd_length": {raw_length}') + "}"
+    processed, errors, results = run_batch([bad + "\n", json.dumps(VALID) + "\n"])
+
+    assert (processed, errors) == (1, 1)
+    assert results[0]["error"].startswith("Valor inválido para pwd_length")
+    assert "password" in results[1]
+
+
+def test_integral_float_length_is_accepted():
+    assert parse_record({**VALID, "pwd_length": 16.0})["pwd_length"] == 16
+
+
+def strength_spec(tmp_path, breached_password):
+    """Opções da análise de força em caminhos: perfil, dicionário e um vazamento com uma das senhas."""
+    index_path = str(tmp_path / "palavras.idx")
+    build_word_index(["password", "senha"], index_path)
+    corpus_path = tmp_path / "vazamentos.txt"
+    corpus_path.write_text(f"{sha1_hex(breached_password).decode('ascii')}:5\n", encoding="ascii")
+    return {"attacker_profile": "gpu_cluster_md5", "pattern_check": True, "dictionary_index": index_path,
+            "breach_corpus": str(corpus_path), "breach_bloom": None}
+
+
+def test_strength_options_apply_in_serial_and_parallel_batches(tmp_path):
+    records = [(i, {**VALID, "base_phrase": f"frase {i}"}) for i in range(1, 13)]
+    passwords = [result["password"] for result in BatchProcessor(metrics=()).process(records)]
+    spec = strength_spec(tmp_path, passwords[3])
+    options = open_strength_options(spec)
+
+    serial = list(BatchProcessor(strength_options=options).process(records))
+    for result, password in zip(serial, passwords):
+        assert {key: value for key, value in result.items() if key != "line"} == \
+            PasswordStrength(password, **options).get_password_analysis()
+    assert [result["breached"] for result in serial] == [0, 0, 0, 5] + [0] * 8
+    assert serial[3]["score"] == 0
+    assert all("patterns" in result for result in serial)
+
+    parallel = list(ParallelDeriver(workers=2, chunk_size=5, strength_options=spec).process(records))
+    assert parallel == serial
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from modules.breach_check import BloomFilter, BreachCorpus, build_bloom_filter, sha1_hex
+from modules.password_strenght import PasswordStrength
+
+
+@pytest.fixture(params=["upper", "lower"])
+def corpus(tmp_path, request):
+    rng = random.Random(3)
+    leaked = {f"vazada{i}": rng.choice([1, 7, 42, 1234, 987654]) for i in range(2000)}
+    lines = sorted((sha1_hex(password).decode("ascii"), count) for password, count in leaked.items())
+    if request.param == "lower":
+        lines = sorted((hash_hex.lower(), count) for hash_hex, count in lines)
+    path = tmp_path / "corpus.txt"
+    path.write_text("".join(f"{hash_hex}:{count}\n" for hash_hex, count in lines), encoding="ascii")
+    return str(path), leaked
+
+
+def queries(leaked):
+    return list(leaked) + [f"segura{i}" for i in range(2000)] + ["", "ç€"]
+
+
+@pytest.mark.parametrize("with_bloom", [False, True])
+def test_lookups_return_the_leak_counts(corpus, tmp_path, with_bloom):
+    path, leaked = corpus
+    bloom_path = None
+    if with_bloom:
+        bloom_path = str(tmp_path / "corpus.bloom")
+        build_bloom_filter(path, bloom_path)
+
+    breach = BreachCorpus(path, bloom_path)
+    try:
+        passwords = queries(leaked)
+        expected = [leaked.get(password, 0) for password in passwords]
+        assert [breach.count(password) for password in passwords] == expected
+        assert breach.count_many(passwords) == expected
+    finally:
+        breach.close()
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives(corpus, tmp_path):
+    path, leaked = corpus
+    bloom_path = str(tmp_path / "corpus.bloom")
+    build_bloom_filter(path, bloom_path, false_positive_rate=0.01)
+    bloom = BloomFilter(bloom_path)
+    try:
+        assert all(bloom.might_contain(sha1_hex(password)) for password in leaked)
+        false_positives = sum(bloom.might_contain(sha1_hex(f"segura{i}")) for i in range(5000))
+        assert false_positives < 5000 * 0.03
+    finally:
+        bloom.close()
+
+
+def test_breached_password_scores_zero(corpus):
+    path, leaked = corpus
+    breach = BreachCorpus(path)
+    try:
+        analysis = PasswordStrength("vazada1", breach_corpus=breach).get_password_analysis()
+        assert analysis["breached"] == leaked["vazada1"]
+        assert analysis["score"] == 0
+        assert PasswordStrength("segura1", breach_corpus=breach).get_password_analysis()["breached"] == 0
+    finally:
+        breach.close()
+
+
+def test_invalid_corpus_is_rejected(tmp_path):
+    path = tmp_path / "invalido.txt"
+    path.write_text("isto não é um hash\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        BreachCorpus(str(path))
@@ -0,0 +1,32 @@
+import random
+import string
+
+import pytest
+
+from modules.bulk_strength import BulkPasswordStrength
+from modules.password_strenght import ATTACKER_PROFILES, PasswordStrength
+from modules.pattern_analyzer import PatternAnalyzer
+
+
+def sample_passwords(count=400):
+    rng = random.Random(5)
+    alphabet = string.ascii_letters + string.digits + "!@#$%&*-_ çÁé€"
+    passwords = ["", "a", "aaaaaaaa", "123456", "qwerty123", "Senha@2024", "01/02/1999", "ÇÇÇ"]
+    passwords += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+    return passwords
+
+
+@pytest.mark.parametrize("profile", list(ATTACKER_PROFILES))
+def test_bulk_matches_scalar(profile):
+    passwords = sample_passwords()
+    bulk = list(BulkPasswordStrength(profile).iter_analyses(passwords, chunk_size=64))
+    scalar = [PasswordStrength(password, profile).get_password_analysis() for password in passwords]
+    assert bulk == scalar
+
+
+def test_bulk_matches_scalar_with_pattern_analyzer():
+    analyzer = PatternAnalyzer()
+    passwords = sample_passwords(100)
+    bulk = list(BulkPasswordStrength(pattern_analyzer=analyzer).iter_analyses(passwords))
+    scalar = [PasswordStrength(password, pattern_analyzer=analyzer).get_password_analysis() for password in passwords]
+    assert bulk == scalar
@@ -0,0 +1,134 @@
+import io
+import json
+
+from modules.batch_processor import BatchProcessor
+from modules.collision_audit import CollisionAuditor
+from modules.parallel_engine import ParallelDeriver
+
+
+def inventory():
+    """Inventário com colisões de verdade: entradas repetidas, pontuação e um corte do hash."""
+    records = []
+    for i in range(600):
+        records.append({"id": f"conta{i}", "base_phrase": f"frase {i % 500}", "key_phrase": "segredo",
+                        "salt": "sal", "pwd_length": 8 + i % 500 % 2})
+    records.append({"id": "pontuada", "base_phrase": "Frase, 7!", "key_phrase": "segredo", "salt": "sal", "pwd_length": 9})
+    # Entradas diferentes cujas senhas de 8 caracteres coincidem (a7f5eac6)
+    for phrase in ("colisao 26810", "colisao 40132"):
+        records.append({"id": phrase, "base_phrase": phrase, "key_phrase": "segredo", "salt": "sal", "pwd_length": 8})
+    records.append({"base_phrase": "sem chave"})
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def brute_force(text):
+    groups = {}
+    for result in BatchProcessor(metrics=()).process(enumerate(map(json.loads, text.splitlines()), start=1)):
+        if "error" not in result:
+            groups.setdefault(result["password"], []).append(result["line"])
+    return sorted(lines for lines in groups.values() if len(lines) > 1)
+
+
+def audit(text, processor=None, stream=None, **options):
+    output = io.StringIO()
+    auditor = CollisionAuditor(processor or BatchProcessor(metrics=()), **options)
+    summary = auditor.run(stream or io.StringIO(text), output)
+    return summary, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class PipeStream(io.StringIO):
+    def seekable(self):
+        return False
+
+
+def test_groups_match_brute_force_in_memory_and_external_sort(tmp_path, monkeypatch):
+    text = inventory()
+    expected = brute_force(text)
+    assert expected
+
+    summary, reports = audit(text)
+    assert not summary["external_sort"]
+    assert [report["lines"] for report in reports] == expected
+    assert summary["errors"] == 1
+    assert summary["collision_groups"] == len(expected)
+
+    # Blocos pequenos e ordenação externa desde o início: várias passadas de intercalação
+    monkeypatch.setattr("modules.collision_audit.MERGE_FANIN", 4)
+    auditor = CollisionAuditor(BatchProcessor(metrics=()), memory_mb=1, tmp_dir=str(tmp_path))
+    auditor.run_entries = 64
+    auditor._spill()
+    output = io.StringIO()
+    spilled_summary = auditor.run(io.StringIO(text), output)
+    assert spilled_summary["external_sort"]
+    assert spilled_summary["sort_runs"] > 4
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == reports
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_same_input_and_ids_are_reported():
+    _, reports = audit(inventory())
+    punctuated = next(report for report in reports if "pontuada" in report.get("ids", []))
+    assert punctuated["same_input"]
+    assert "conta7" in punctuated["ids"]
+    truncated = next(report for report in reports if "colisao 26810" in report.get("ids", []))
+    assert truncated["ids"] == ["colisao 26810", "colisao 40132"]
+    assert not truncated["same_input"]
+
+
+def test_fingerprint_collisions_are_not_reported(monkeypatch):
+    text = "".join(json.dumps({"base_phrase": f"frase única {i}", "key_phrase": "segredo", "pwd_length": 32}) + "\n"
+                   for i in range(50))
+    monkeypatch.setattr(CollisionAuditor, "_fingerprint", lambda self, password: 42)
+    summary, reports = audit(text)
+    assert reports == []
+    assert summary["collision_groups"] == 0
+
+
+def test_non_seekable_input_is_confirmed(tmp_path):
+    text = inventory()
+    _, expected = audit(text)
+    summary, reports = audit(text, stream=PipeStream(text), tmp_dir=str(tmp_path))
+    assert reports == expected
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parallel_processor_gives_the_same_groups():
+    text = inventory()
+    _, expected = audit(text)
+    _, reports = audit(text, processor=ParallelDeriver(workers=2, metrics=()))
+    assert reports == expected
+
+
+def test_heavy_duplication_spills_and_confirms_in_batches(tmp_path, monkeypatch):
+    # Muitos pares repetidos e um grupo grande: a memória não cresce com as linhas repetidas
+    records = [{"id": f"conta{i}", "base_phrase": f"frase {i % 400}", "key_phrase": "segredo", "salt": "sal"} for i in range(1000)]
+    records += [{"id": f"igual{i}", "base_phrase": "mesma frase", "key_phrase": "segredo", "salt": "sal"} for i in range(300)]
+    text = "".join(json.dumps(record) + "\n" for record in records)
+    expected = brute_force(text)
+
+    summary, reports = audit(text)
+    assert not summary["external_sort"]
+    assert [report["lines"] for report in reports] == expected
+
+    monkeypatch.setattr("modules.collision_audit.MERGE_FANIN", 4)
+    auditor = CollisionAuditor(BatchProcessor(metrics=()), memory_mb=1, tmp_dir=str(tmp_path))
+    auditor.confirm_lines = 50
+    batches = []
+    confirm_batch = auditor._confirm_batch
+
+    def record_batch(groups, input_stream, fmt):
+        batches.append(sum(map(len, groups)))
+        return confirm_batch(groups, input_stream, fmt)
+
+    auditor._confirm_batch = record_batch
+    output = io.StringIO()
+    bounded_summary = auditor.run(io.StringIO(text), output)
+    assert bounded_summary["external_sort"]
+    assert auditor._report_count > 4
+    # Cada lote fecha ao passar de confirm_lines: só o grupo grande ultrapassa o limite
+    assert len(batches) > 4
+    assert sorted(batches)[-2] < auditor.confirm_lines + 3
+    assert max(batches) < auditor.confirm_lines + 300
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == reports
+    assert {key: bounded_summary[key] for key in ("collision_groups", "colliding_records")} == \
+        {key: summary[key] for key in ("collision_groups", "colliding_records")}
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,36 @@
+from modules.config_generator import ConfigCache, ConfigGenerator
+from modules.password_generator import PasswordGenerator
+
+
+def test_variants_of_the_same_key_phrase_share_one_config():
+    cache = ConfigCache()
+    first = cache.get("Segurança Máxima")
+    assert cache.get("seguranca, maxima!") is first
+    assert cache.info()["hits"] == 1 and cache.info()["misses"] == 1
+
+
+def test_least_recently_used_config_is_evicted():
+    cache = ConfigCache(maxsize=2)
+    cache.get("alfa")
+    cache.get("beta")
+    cache.get("alfa")
+    cache.get("gama")  # Descarta "beta"
+    cache.get("alfa")
+    cache.get("beta")
+    info = cache.info()
+    assert (info["hits"], info["misses"], info["currsize"]) == (2, 4, 2)
+
+
+def test_translation_table_matches_substitution_dict():
+    config = ConfigGenerator("Segurança Máxima")
+    text = "abcdefghijklmnopqrstuvwxyz0123456789"
+    expected = "".join(config.get_subst_dict().get(char, char) for char in text)
+    assert text.translate(config.get_translation_table()) == expected
+
+
+def test_cached_table_gives_the_same_password():
+    config = ConfigCache().get("Segurança Máxima")
+    with_table = PasswordGenerator("Minha frase", config.get_subst_dict(), "sal", 16, True,
+                                   translation_table=config.get_translation_table())
+    without_table = PasswordGenerator("Minha frase", config.get_subst_dict(), "sal", 16, True)
+    assert with_table.generate_password() == without_table.generate_password()
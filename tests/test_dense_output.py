@@ -0,0 +1,73 @@
+import hashlib
+from collections import Counter
+
+import pytest
+
+from modules.dense_output import ALPHABETS, map_to_alphabet, validate_alphabet
+
+
+class FixedXof:
+    """XOF de teste: sempre os mesmos bytes (repetidos até o tamanho pedido)."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def digest(self, size: int) -> bytes:
+        return (self.data * (size // len(self.data) + 1))[:size]
+
+
+def reference(data: bytes, length: int, alphabet: str) -> str:
+    """Amostragem por rejeição byte a byte."""
+    limit = 256 - 256 % len(alphabet)
+    return "".join(alphabet[byte % len(alphabet)] for byte in data if byte < limit)[:length]
+
+
+@pytest.mark.parametrize("alphabet", [ALPHABETS["full"], ALPHABETS["alnum"], "abc", "01", "áéíóúçãõ€"])
+def test_every_character_is_equally_likely(alphabet):
+    # Cada byte 0..255 aparece uma vez: sem rejeição, os primeiros 256 % tamanho caracteres sairiam mais vezes
+    mapped = map_to_alphabet(FixedXof(bytes(range(256))), 256 - 256 % len(alphabet), alphabet)
+    counts = Counter(mapped)
+    assert set(counts) == set(alphabet)
+    assert len(set(counts.values())) == 1
+
+
+@pytest.mark.parametrize("alphabet", [ALPHABETS["full"], "abc", "áéíóúçãõ€"])
+def test_matches_byte_by_byte_rejection(alphabet):
+    xof = hashlib.shake_256(b"semente")
+    expected = reference(xof.digest(4096), 500, alphabet)
+    assert map_to_alphabet(hashlib.shake_256(b"semente"), 500, alphabet) == expected
+
+
+def test_rejected_runs_read_more_bytes():
+    # 255 é sempre rejeitado com 3 símbolos: a primeira leitura não basta e o tamanho dobra
+    data = bytes([255] * 300 + [0, 1, 2])
+    assert map_to_alphabet(FixedXof(data), 6, "abc") == "abcabc"
+
+
+@pytest.mark.parametrize("alphabet", [ALPHABETS["full"], ALPHABETS["alnum"], "áéíóúçãõ€"])
+def test_shorter_output_is_prefix_of_longer(alphabet):
+    longest = map_to_alphabet(hashlib.shake_256(b"frase"), 300, alphabet)
+    assert len(longest) == 300  # Bem mais que os 64 caracteres do hexdigest
+    for length in (1, 8, 16, 64, 65, 200):
+        assert map_to_alphabet(hashlib.shake_256(b"frase"), length, alphabet) == longest[:length]
+
+
+def test_named_alphabets():
+    assert validate_alphabet("full") == ALPHABETS["full"]
+    assert validate_alphabet("alnum") == ALPHABETS["alnum"]
+    assert validate_alphabet("ab€") == "ab€"
+
+
+@pytest.mark.parametrize("alphabet", [
+    "aab",                      # Repetido
+    "a",                        # Curto demais
+    "".join(map(chr, range(0x100, 0x100 + 257))),  # Longo demais
+    "abc def",                  # Espaço
+    "abc\tdef",                 # Tabulação
+    "abc\x00",                  # Controle
+    "abc\u200b",               # Invisível (espaço de largura zero)
+    "abc\u00a0",               # Espaço não separável
+])
+def test_invalid_alphabets(alphabet):
+    with pytest.raises(ValueError):
+        validate_alphabet(alphabet)
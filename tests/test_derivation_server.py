@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+from modules.batch_processor import BatchProcessor
+from modules.derivation_server import DerivationService
+from modules.password_policy import SITE_POLICIES, PasswordPolicy
+
+
+RECORD = {"base_phrase": "minha frase", "key_phrase": "segredo", "salt": "sal", "pwd_length": 16}
+
+
+def run_service(coroutine_factory, **options):
+    async def main():
+        service = DerivationService(workers=1, **options)
+        await service.start()
+        try:
+            return await coroutine_factory(service)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_lone_request_is_not_held_for_max_wait():
+    async def lone_requests(service):
+        await service.derive(RECORD)  # Aquece o pool de processos
+        start = time.perf_counter()
+        result = await service.derive(RECORD)
+        return result, time.perf_counter() - start
+
+    result, elapsed = run_service(lone_requests, max_wait_ms=2000)
+    assert result == BatchProcessor().derive_record(RECORD)
+    assert elapsed < 1.0
+
+
+def test_concurrent_requests_match_batch_mode():
+    records = [{**RECORD, "base_phrase": f"frase {i}"} for i in range(50)]
+
+    async def many(service):
+        return await asyncio.gather(*(service.derive(record) for record in records))
+
+    assert run_service(many, batch_size=8) == [BatchProcessor().derive_record(record) for record in records]
+
+
+def test_named_policies_from_policy_file_are_served():
+    policies = {**SITE_POLICIES, "pin6": PasswordPolicy("pin6", 6, 6, {"digits": 6},
+                                                        allowed_classes=("digits",))}
+
+    async def derive(service):
+        return await service.derive({**RECORD, "policy": "pin6"})
+
+    result = run_service(derive, policies=policies)
+    assert "error" not in result
+    assert result["password"].isdigit() and len(result["password"]) == 6
@@ -0,0 +1,36 @@
+import pytest
+
+from modules import instrumentation
+from modules.config_generator import ConfigGenerator
+from modules.instrumentation import CallbackSink, HistogramSink, Sink
+from modules.password_generator import PasswordGenerator
+
+
+def test_incomplete_sink_fails_on_creation():
+    class OnlyRecord(Sink):
+        def record(self, stage, nanoseconds):
+            pass
+
+    with pytest.raises(TypeError):
+        OnlyRecord()
+
+
+def test_stages_reach_the_installed_sink():
+    events = []
+    previous = instrumentation.install(CallbackSink(lambda kind, name, value: events.append((kind, name))))
+    try:
+        config = ConfigGenerator("segredo")
+        PasswordGenerator("minha frase", config.get_subst_dict(), "sal", 16, True).generate_password()
+    finally:
+        instrumentation.install(previous)
+    stages = {name for kind, name in events if kind == "time"}
+    assert {"generator.normalize", "generator.substitute", "generator.hash", "generator.special_chars"} <= stages
+
+
+def test_histogram_percentiles_never_exceed_the_maximum():
+    sink = HistogramSink()
+    for nanoseconds in (1_000, 2_000, 3_000, 1_000_000):
+        sink.record("etapa", nanoseconds)
+    stage = sink.summary()["stages"]["etapa"]
+    assert stage["count"] == 4
+    assert stage["p50_us"] <= stage["p90_us"] <= stage["p99_us"] <= stage["max_us"] == 1000.0
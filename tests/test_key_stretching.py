@@ -0,0 +1,45 @@
+import hashlib
+
+import pytest
+
+from modules.config_generator import ConfigGenerator
+from modules.key_stretching import load_params, save_params, stretch, validate_params
+from modules.password_generator import PasswordGenerator
+
+
+PBKDF2 = {"algorithm": "pbkdf2_sha256", "iterations": 1000}
+SCRYPT = {"algorithm": "scrypt", "n": 16, "r": 8, "p": 1}
+
+
+def test_stretch_matches_hashlib():
+    assert stretch("texto", "sal", PBKDF2) == hashlib.pbkdf2_hmac("sha256", b"texto", b"sal", 1000, 32).hex()
+    assert stretch("texto", "sal", SCRYPT) == hashlib.scrypt(b"texto", salt=b"sal", n=16, r=8, p=1, dklen=32).hex()
+
+
+def test_kdf_is_opt_in():
+    subst = ConfigGenerator("segredo").get_subst_dict()
+    plain = PasswordGenerator("minha frase", subst, "sal", 16)
+    transformed = plain.base_phrase.translate(plain.translation_table)
+    assert plain.generate_password() == hashlib.sha256((transformed + "sal").encode()).hexdigest()[:16]
+
+    stretched = PasswordGenerator("minha frase", subst, "sal", 16, kdf_params=PBKDF2)
+    assert stretched.generate_password() == stretch(transformed, "sal", PBKDF2)[:16]
+
+
+@pytest.mark.parametrize("params", [
+    {"algorithm": "md5"},
+    {"algorithm": "pbkdf2_sha256"},
+    {"algorithm": "pbkdf2_sha256", "iterations": 0},
+    {"algorithm": "pbkdf2_sha256", "iterations": True},
+    {"algorithm": "scrypt", "n": 1000, "r": 8, "p": 1},
+    {"algorithm": "scrypt", "n": 16, "r": 0, "p": 1},
+])
+def test_invalid_params_are_rejected(params):
+    with pytest.raises(ValueError):
+        validate_params(params)
+
+
+def test_params_round_trip(tmp_path):
+    path = str(tmp_path / "kdf.json")
+    save_params(path, SCRYPT)
+    assert load_params(path) == SCRYPT
@@ -0,0 +1,66 @@
+from modules.config_generator import get_config
+from modules.live_preview import DerivationWorker, PreviewPipeline
+from modules.password_generator import PasswordGenerator
+from modules.password_strenght import PasswordStrength
+
+
+def expected_password(base_phrase, key_phrase, salt, pwd_length, extended_chars):
+    config = get_config(key_phrase)
+    return PasswordGenerator(base_phrase, config.get_subst_dict(), salt, pwd_length, extended_chars,
+                             translation_table=config.get_translation_table()).generate_password()
+
+
+# Uma alteração de campo por vez, como na digitação
+EDITS = [
+    ("Minha frase", "Chave de segurança", "sal", 16, False),
+    ("Minha frase", "Chave de segurança", "sal", 16, True),
+    ("Minha frase", "Chave de segurança", "sal", 24, True),
+    ("Minha frase", "Chave de segurança", "outro sal", 24, True),
+    ("Minha frase!", "Chave de segurança", "outro sal", 24, True),
+    ("Minha frase!", "Outra chave", "outro sal", 24, True),
+    ("Minha frase!", "Outra chave", "", 8, False),
+    ("Máximo Segurança", "Outra chave", "", 64, True),
+    ("Minha frase", "Chave de segurança", "sal", 16, False),
+]
+
+
+def test_staged_preview_equals_generate_password(monkeypatch):
+    hashes = []
+    original = PasswordGenerator._hash_with_salt
+    monkeypatch.setattr(PasswordGenerator, "_hash_with_salt",
+                        lambda self, text: hashes.append(text) or original(self, text))
+
+    pipeline = PreviewPipeline()
+    previous = None
+    for params in EDITS:
+        before = len(hashes)
+        password = pipeline.compute(*params)
+        pipeline_hashed = len(hashes) > before
+        assert password == expected_password(*params), params
+        if previous is not None and previous[:3] == params[:3]:
+            # Só comprimento ou caracteres especiais mudaram: o hash é reaproveitado
+            assert not pipeline_hashed
+        previous = params
+
+
+def test_worker_returns_the_latest_analysis():
+    worker = DerivationWorker()
+    for request_id, params in enumerate(EDITS, start=1):
+        worker.submit(request_id, params)
+
+    results = {}
+    while len(EDITS) not in results:
+        request_id, analysis, error = worker.results.get(timeout=10)
+        assert error is None
+        results[request_id] = analysis
+    assert results[len(EDITS)] == PasswordStrength(expected_password(*EDITS[-1])).get_password_analysis()
+
+
+def test_worker_reports_errors():
+    worker = DerivationWorker()
+    worker.submit(1, ("frase", "chave", "sal", "dezesseis", False))
+    request_id, analysis, error = worker.results.get(timeout=10)
+    assert (request_id, analysis) == (1, None)
+    assert isinstance(error, Exception)
+    worker.submit(2, EDITS[0])
+    assert worker.results.get(timeout=10)[1]["password"] == expected_password(*EDITS[0])
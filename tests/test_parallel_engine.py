@@ -0,0 +1,30 @@
+import io
+import json
+
+from modules.batch_processor import BatchProcessor
+from modules.parallel_engine import ParallelDeriver
+
+
+def make_batch(count=60):
+    lines = []
+    for i in range(count):
+        record = {"id": f"conta{i}", "base_phrase": f"frase número {i}", "key_phrase": f"chave {i % 7}",
+                  "salt": f"sal{i % 5}", "pwd_length": 8 + i % 24, "extended_chars": i % 2 == 0}
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+    lines.insert(10, "{json inválido\n")
+    lines.insert(20, json.dumps({"base_phrase": "sem chave"}) + "\n")
+    return "".join(lines)
+
+
+def run(processor, text):
+    output = io.StringIO()
+    counts = processor.run(io.StringIO(text), output)
+    return counts, output.getvalue()
+
+
+def test_parallel_output_matches_serial_byte_for_byte():
+    text = make_batch()
+    serial = run(BatchProcessor(), text)
+    parallel = run(ParallelDeriver(workers=2, chunk_size=7, key_phrases=["chave 0"]), text)
+    assert parallel == serial
+    assert serial[0] == (60, 2)
@@ -0,0 +1,61 @@
+import random
+import string
+
+import pytest
+
+from modules.password_audit import PasswordAudit
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def dump(tmp_path):
+    rng = random.Random(7)
+    lines = ["".join(rng.choice(string.printable[:94]) for _ in range(rng.randint(1, 24))) for _ in range(3000)]
+    lines[100:100] = ["", "   senha com espaços", "çãé€"]
+    path = tmp_path / "dump.txt"
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    return str(path)
+
+
+def full_audit(path, report_path):
+    with open(report_path, "w", encoding="utf-8") as report:
+        summary = PasswordAudit(path, report, chunk_size=64).run()
+    with open(report_path, encoding="utf-8") as f:
+        return summary, f.read()
+
+
+def test_resumed_audit_matches_uninterrupted_audit(dump, tmp_path):
+    expected_summary, expected_report = full_audit(dump, tmp_path / "full.jsonl")
+    report_path = tmp_path / "report.jsonl"
+    checkpoint = str(tmp_path / "audit.ckpt")
+
+    # Primeira execução: para no meio, depois de alguns checkpoints e com linhas a mais no relatório
+    with open(report_path, "w", encoding="utf-8") as report:
+        audit = PasswordAudit(dump, report, checkpoint, chunk_size=64, checkpoint_every=500)
+        analyze = audit.analyzer.analyze
+        calls = []
+
+        def failing_analyze(passwords):
+            calls.append(1)
+            if len(calls) == 20:
+                raise Interrupted()
+            return analyze(passwords)
+
+        audit.analyzer.analyze = failing_analyze
+        with pytest.raises(Interrupted):
+            audit.run()
+
+    # Retomada como em main.py: descarta o relatório escrito depois do checkpoint
+    resumed = PasswordAudit(dump, None, checkpoint, chunk_size=64, checkpoint_every=500)
+    assert resumed.load_checkpoint()
+    assert 0 < resumed.offset
+    with open(report_path, "a", encoding="utf-8") as report:
+        report.truncate(resumed.report_offset)
+        resumed.report_stream = report
+        summary = resumed.run()
+
+    assert summary == expected_summary
+    assert report_path.read_text(encoding="utf-8") == expected_report
@@ -0,0 +1,53 @@
+import hashlib
+import random
+
+import pytest
+
+from modules.config_generator import ConfigGenerator
+from modules.password_generator import PasswordGenerator
+from modules.password_policy import SITE_POLICIES, PasswordPolicy, _XofReader
+
+
+CUSTOM = PasswordPolicy("custom", 10, 14, {"digits": 2, "special": 1}, ("lowercase", "digits", "special"),
+                        specials="!@#", forbidden="0l")
+
+
+@pytest.mark.parametrize("policy", list(SITE_POLICIES.values()) + [CUSTOM], ids=lambda policy: policy.name)
+def test_generated_passwords_never_violate_the_policy(policy):
+    rng = random.Random(policy.name)
+    subst = ConfigGenerator("segredo").get_subst_dict()
+    for i in range(500):
+        generator = PasswordGenerator(f"frase {rng.random()}", subst, f"sal{i}", rng.randint(8, 64), policy=policy)
+        password = generator.generate_password()
+        assert policy.check(password) == [], password
+        assert not set(password) & set(policy.forbidden)
+
+
+def test_generation_is_deterministic():
+    subst = ConfigGenerator("segredo").get_subst_dict()
+    first = PasswordGenerator("minha frase", subst, "sal", 16, policy="strict").generate_password()
+    assert PasswordGenerator("minha frase", subst, "sal", 16, policy="strict").generate_password() == first
+
+
+def test_large_ranges_are_sampled_without_hanging():
+    reader = _XofReader(hashlib.shake_256(b"semente"))
+    values = [reader.below(1_000_000) for _ in range(1000)]
+    assert all(0 <= value < 1_000_000 for value in values)
+    assert max(values) > 65536
+
+    policy = PasswordPolicy("longa", 70000, 70000, {"digits": 3})
+    assert policy.check(policy.generate(hashlib.shake_256(b"semente"), 16)) == []
+
+
+@pytest.mark.parametrize("spec", [
+    {"min_length": 0},
+    {"min_length": 20, "max_length": 10},
+    {"required": {"emoji": 1}},
+    {"required": {"digits": -1}},
+    {"allowed_classes": ["digits"], "required": {"uppercase": 1}},
+    {"specials": "ab"},
+    {"max_length": 4, "required": {"digits": 3, "uppercase": 2}},
+])
+def test_invalid_policies_are_rejected(spec):
+    with pytest.raises(ValueError):
+        PasswordPolicy.from_dict("invalida", spec)
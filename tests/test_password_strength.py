@@ -0,0 +1,102 @@
+import math
+import random
+
+import pytest
+
+from modules.password_strenght import METRICS, PasswordStrength, format_crack_time
+
+
+def baseline_format(crack_seconds: float) -> str:
+    """Formatação original (antes do cálculo logarítmico)."""
+    if crack_seconds < 60:
+        return "Menos de 1 minuto"
+    elif crack_seconds < 3600:
+        return f"{int(crack_seconds // 60)} minutos"
+    elif crack_seconds < 86400:
+        return f"{int(crack_seconds // 3600)} horas"
+    elif crack_seconds < 31536000:
+        return f"{int(crack_seconds // 86400)} dias"
+    elif crack_seconds < 3.154e+8:
+        return f"{int(crack_seconds // 31536000)} anos"
+    else:
+        return f"Aproximadamente {int(crack_seconds // 3.154e+8)} séculos"
+
+
+def test_crack_time_labels_keep_the_baseline_cutoffs():
+    rng = random.Random(11)
+    samples = [10 ** rng.uniform(0, 18) for _ in range(5000)]
+    samples += [3.15e8, 3.16e8, 5e8, 3.2e9, 31536000 * 99.5]
+    for seconds in samples:
+        assert format_crack_time(math.log10(seconds)) == baseline_format(seconds), seconds
+
+
+def test_huge_crack_times_do_not_overflow():
+    analysis = PasswordStrength("Aa1!" * 500).get_password_analysis()
+    assert analysis["crack_time"].startswith("Aproximadamente 10^")
+    assert analysis["crack_seconds"] is None
+
+
+def test_default_analysis_fields():
+    assert list(PasswordStrength("Senha@2024").get_password_analysis()) == [
+        "password", "length", "score", "security_level", "crack_time", "crack_seconds"]
+
+
+class CountingAnalyzer:
+    """Detector de padrões falso que conta as chamadas."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, password, charset):
+        self.calls += 1
+        return 12.0, []
+
+
+def test_selected_metrics_match_the_full_analysis():
+    analyzer = CountingAnalyzer()
+    full = PasswordStrength("Senha@2024", pattern_analyzer=analyzer).get_password_analysis(METRICS)
+    assert list(full) == ["password"] + list(METRICS)
+    for metric in METRICS:
+        selected = PasswordStrength("Senha@2024", pattern_analyzer=analyzer).get_password_analysis([metric])
+        assert selected == {"password": "Senha@2024", metric: full[metric]}
+
+
+def test_unrequested_metrics_are_not_computed():
+    strength = PasswordStrength("Senha@2024")
+    assert strength.get_password_analysis(("length",)) == {"password": "Senha@2024", "length": 10}
+    assert strength._char_types is None and strength._score is None and strength._crack_time_log10 is None
+
+    strength.get_password_analysis(("score",))
+    assert strength._score is not None
+    assert strength._crack_time_log10 is None and strength._crack_time is None and strength._security_level is None
+
+    strength.get_password_analysis(("crack_seconds",))
+    assert strength._crack_time_log10 is not None and strength._crack_time is None
+
+
+def test_empty_metrics_return_only_the_password():
+    analyzer = CountingAnalyzer()
+    strength = PasswordStrength("Senha@2024", pattern_analyzer=analyzer)
+    assert strength.get_password_analysis(()) == {"password": "Senha@2024"}
+    assert analyzer.calls == 0
+    assert all(getattr(strength, slot) is None for slot in ("_char_types", "_score", "_security_level",
+                                                             "_crack_time_log10", "_crack_time", "_pattern_analysis"))
+
+
+def test_metrics_are_computed_once():
+    analyzer = CountingAnalyzer()
+    strength = PasswordStrength("Senha@2024", pattern_analyzer=analyzer)
+    strength.get_password_analysis()
+    strength.get_password_analysis(("score", "crack_time", "patterns"))
+    assert analyzer.calls == 1
+
+
+def test_no_instance_dict():
+    with pytest.raises(AttributeError):
+        PasswordStrength("Senha@2024").extra = 1
+
+
+@pytest.mark.parametrize("metrics", [("entropy",), ("score", "Score"), ["password"]])
+def test_unknown_metric_is_rejected(metrics):
+    with pytest.raises(ValueError, match="Métrica desconhecida"):
+        PasswordStrength("Senha@2024").get_password_analysis(metrics)
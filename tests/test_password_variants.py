@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from modules.config_generator import ConfigGenerator
+from modules.password_generator import PasswordGenerator
+
+
+SUBST = ConfigGenerator("Chave de segurança").get_subst_dict()
+VARIANTS = [(8, False), (12, True), (16, False), (16, True), (33, True), (64, False), (64, True), (100, True)]
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"kdf_params": {"algorithm": "pbkdf2_sha256", "iterations": 1000}},
+    {"output_mode": "dense"},
+    {"output_mode": "dense", "alphabet": "abcdef0123456789!?"},
+    {"policy": "strict"},
+    {"policy": "web_max20"},
+], ids=["hex", "hex-kdf", "dense", "dense-alphabet", "policy-strict", "policy-web_max20"])
+def test_each_variant_equals_a_single_generation(options):
+    rng = random.Random(str(options))
+    for _ in range(20):
+        base_phrase = f"frase {rng.random()}"
+        salt = f"sal{rng.randint(0, 999)}"
+        variants = rng.sample(VARIANTS, 5)
+        if "policy" in options:
+            variants = [(min(pwd_length, 20), extended_chars) for pwd_length, extended_chars in variants]
+        passwords = PasswordGenerator(base_phrase, SUBST, salt, **options).generate_variants(variants)
+        expected = [PasswordGenerator(base_phrase, SUBST, salt, pwd_length, extended_chars, **options).generate_password()
+                    for pwd_length, extended_chars in variants]
+        assert passwords == expected
+
+
+def test_policy_ignores_extended_chars():
+    generator = PasswordGenerator("minha frase", SUBST, "sal", policy="strict")
+    plain, extended = generator.generate_variants([(16, False), (16, True)])
+    assert plain == extended
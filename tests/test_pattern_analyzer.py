@@ -0,0 +1,79 @@
+import pytest
+
+from modules.pattern_analyzer import PatternAnalyzer, cap_score
+from modules.password_strenght import PasswordStrength
+from modules.word_index import WordIndex, build_word_index
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("indice") / "palavras.idx")
+    build_word_index(["password", "dragon", "monkey", "senha"], path)
+    index = WordIndex(path)
+    yield PatternAnalyzer(index)
+    index.close()
+
+
+def tokens(matches, pattern):
+    return [(match["token"], match["start"], match["end"]) for match in matches if match["pattern"] == pattern]
+
+
+def test_dictionary_and_l33t(analyzer):
+    matches = analyzer.find_patterns("xDragon!", 62)
+    assert tokens(matches, "dictionary") == [("Dragon", 1, 7)]
+
+    leet = [match for match in analyzer.find_patterns("p@ssw0rd", 62) if match["pattern"] == "dictionary"]
+    assert [(match["word"], match["l33t"], match["rank"]) for match in leet] == [("password", True, 1)]
+    assert PatternAnalyzer()._dictionary_matches("password") == []  # Sem índice não há dicionário
+
+
+def test_keyboard_sequence_and_date():
+    analyzer = PatternAnalyzer()
+    assert tokens(analyzer._keyboard_matches("xqwertyx"), "keyboard") == [("qwerty", 1, 7)]
+    assert tokens(analyzer._keyboard_matches("1qaz2wsx"), "keyboard") == [("1qaz", 0, 4), ("2wsx", 4, 8)]
+    assert tokens(analyzer._sequence_matches("abcd9876"), "sequence") == [("abcd", 0, 4), ("9876", 4, 8)]
+    assert analyzer._sequence_matches("a1b2c3") == []
+
+    dates = tokens(analyzer._date_matches("x25/12/1990"), "date")
+    assert ("25/12/1990", 1, 11) in dates
+    assert ("19900101", 0, 8) in tokens(analyzer._date_matches("19900101"), "date")
+    assert ("1987", 2, 6) in tokens(analyzer._date_matches("ab1987"), "date")
+    assert all("/" not in token for token, _, _ in tokens(analyzer._date_matches("31/13/1990"), "date"))
+
+
+@pytest.mark.parametrize("password, token, base, count", [
+    ("aaaa", "aaaa", "a", 4),
+    ("aaaaa", "aaaaa", "a", 5),
+    ("abcabc", "abcabc", "abc", 2),
+    ("aabcabc", "abcabc", "abc", 2),   # A repetição curta "aa" no começo não esconde a longa
+    ("x!ab!ab!ab", "!ab!ab!ab", "!ab", 3),
+])
+def test_repeats_found_at_any_start(password, token, base, count):
+    repeats = [match for match in PatternAnalyzer()._repeat_matches(password, 62) if match["token"] == token]
+    assert [(match["base"], match["count"]) for match in repeats] == [(base, count)]
+    assert repeats[0]["start"] == password.index(token)
+
+
+def test_best_cover_uses_the_cheapest_patterns(analyzer):
+    guesses, patterns = analyzer.analyze("dragon1990", 36)
+    assert [(match["pattern"], match["token"]) for match in patterns] == [("dictionary", "dragon"), ("date", "1990")]
+    assert guesses == pytest.approx(sum(match["guesses_log10"] for match in patterns))
+
+    guesses_random, patterns_random = PatternAnalyzer().analyze("q8#Lm2!zWv", 94)
+    assert patterns_random == []
+    assert guesses_random > 2 * guesses
+
+
+def test_score_cap(analyzer):
+    assert cap_score(100, 2.5) == 19
+    assert cap_score(100, 5) == 39
+    assert cap_score(100, 7) == 59
+    assert cap_score(100, 9) == 79
+    assert cap_score(100, 12) == 100
+    assert cap_score(10, 2) == 10
+
+    plain = PasswordStrength("Password123!")
+    checked = PasswordStrength("Password123!", pattern_analyzer=analyzer)
+    assert plain.score > checked.score
+    assert checked.score == cap_score(plain.score, checked.pattern_analysis[0])
+    assert [match["pattern"] for match in checked.patterns][:1] == ["dictionary"]
@@ -0,0 +1,43 @@
+import os
+
+from modules.config_generator import ConfigCache, ConfigGenerator
+from modules.profile_store import ProfileStore, _HEADER, _RECORD, build_profile_store
+
+
+KEY_PHRASES = ["segredo", "Segurança Máxima", "ßæø chave", "zyxw", "123 abc"]
+
+
+def test_store_returns_the_same_tables(tmp_path):
+    path = str(tmp_path / "perfis.bin")
+    assert build_profile_store(KEY_PHRASES, path) == len(KEY_PHRASES)
+    assert _HEADER.size == 72 and _RECORD.size == 128
+
+    store = ProfileStore(path)
+    try:
+        assert os.path.getsize(path) == _HEADER.size + store.slots * _RECORD.size
+        for key_phrase in KEY_PHRASES:
+            expected = ConfigGenerator(key_phrase)
+            stored = store.get(key_phrase)
+            assert stored.get_subst_dict() == expected.get_subst_dict()
+            assert stored.get_translation_table() == expected.get_translation_table()
+        assert store.get("outra frase") is None
+    finally:
+        store.close()
+
+    with open(path, "rb") as f:
+        assert b"segredo" not in f.read()
+
+
+def test_cache_resolves_misses_from_the_store(tmp_path):
+    path = str(tmp_path / "perfis.bin")
+    build_profile_store(KEY_PHRASES[:2], path)
+    build_profile_store(KEY_PHRASES[2:], path)  # Acrescenta mantendo os perfis anteriores
+    store = ProfileStore(path)
+    try:
+        assert len(store) == len(KEY_PHRASES)
+        cache = ConfigCache(store=store)
+        for key_phrase in KEY_PHRASES + ["fora do arquivo"]:
+            cache.get(key_phrase)
+        assert cache.info()["store_hits"] == len(KEY_PHRASES)
+    finally:
+        store.close()
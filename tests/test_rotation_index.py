@@ -0,0 +1,119 @@
+import io
+import json
+import os
+
+import pytest
+
+from modules import rotation_index
+from modules.batch_processor import BatchProcessor
+from modules.rotation_index import IncrementalRotation, RotationIndex
+
+
+def inventory(records):
+    return io.StringIO("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+
+def accounts(count, salt="site-1"):
+    return [{"id": f"conta{i}", "base_phrase": f"frase {i}", "key_phrase": "segredo", "salt": salt}
+            for i in range(count)]
+
+
+def rotate(index_path, records, chunk_size=3):
+    output = io.StringIO()
+    summary = IncrementalRotation(RotationIndex(index_path), BatchProcessor(), chunk_size).run(
+        inventory(records), output)
+    return summary, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def batch_output(records):
+    output = io.StringIO()
+    BatchProcessor().run(inventory(records), output)
+    return output.getvalue().splitlines()
+
+
+def test_only_changed_accounts_are_derived(tmp_path):
+    index_path = str(tmp_path / "rotacao.idx")
+    records = accounts(10)
+
+    summary, results = rotate(index_path, records)
+    batch = [json.loads(line) for line in batch_output(records)]
+    assert summary["new"] == 10 and summary["errors"] == 0
+    assert [result.pop("status") for result in results] == ["new"] * 10
+    assert results == batch
+
+    summary, results = rotate(index_path, records)
+    assert (summary["unchanged"], results) == (10, [])
+
+    changed = records[:8]
+    changed[2] = {**changed[2], "salt": "site-2"}
+    summary, results = rotate(index_path, changed)
+    assert [(result["id"], result["status"]) for result in results] == [
+        ("conta2", "changed"), ("conta8", "removed"), ("conta9", "removed")]
+    assert len(RotationIndex(index_path)) == 8
+
+
+def test_torn_trailing_line_is_discarded(tmp_path):
+    index_path = str(tmp_path / "rotacao.idx")
+    records = accounts(5)
+    rotate(index_path, records)
+    with open(index_path, "ab") as f:
+        f.write(b"0123456789abcdef")  # Rotação interrompida no meio de uma linha
+
+    summary, results = rotate(index_path, records + accounts(6)[5:])
+    assert [(result["id"], result["status"]) for result in results] == [("conta5", "new")]
+    assert len(RotationIndex(index_path)) == 6
+
+
+def test_index_is_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(rotation_index, "COMPACT_MIN_LINES", 10)
+    index_path = str(tmp_path / "rotacao.idx")
+    for round_no in range(3):
+        summary, _ = rotate(index_path, accounts(10, salt=f"site-{round_no}"))
+    assert summary["compacted"]
+    with open(index_path, "rb") as f:
+        assert len(f.read().splitlines()) == 1 + 10
+
+
+def test_key_is_kept_out_of_the_index(tmp_path):
+    index_path = str(tmp_path / "rotacao.idx")
+    rotate(index_path, accounts(5))
+    index = RotationIndex(index_path)
+
+    with open(index_path, "rb") as f:
+        contents = f.read()
+    assert index.key.hex().encode("ascii") not in contents
+    assert index.key not in contents
+    assert oct(os.stat(index.key_path).st_mode & 0o777) == oct(0o600)
+
+    summary, results = rotate(index_path, accounts(5))
+    assert (summary["unchanged"], results) == (5, [])
+
+
+def test_missing_or_wrong_key_is_rejected(tmp_path):
+    index_path = str(tmp_path / "rotacao.idx")
+    rotate(index_path, accounts(3))
+    other_key = str(tmp_path / "outra.key")
+    RotationIndex(str(tmp_path / "outro.idx"), other_key)
+
+    with pytest.raises(ValueError):
+        RotationIndex(index_path, other_key)
+    os.remove(index_path + ".key")
+    with pytest.raises(ValueError):
+        RotationIndex(index_path)
+
+
+def test_legacy_index_is_migrated(tmp_path):
+    index_path = str(tmp_path / "rotacao.idx")
+    rotate(index_path, accounts(4))
+    key = RotationIndex(index_path).key
+    with open(index_path, "rb") as f:
+        entries = f.read().split(b"\n", 1)[1]
+    with open(index_path, "wb") as f:
+        f.write(b"PWROT1 " + key.hex().encode("ascii") + b"\n" + entries)
+    os.remove(index_path + ".key")
+
+    summary, results = rotate(index_path, accounts(4))
+    assert (summary["unchanged"], results) == (4, [])
+    assert RotationIndex(index_path).key == key
+    with open(index_path, "rb") as f:
+        assert key.hex().encode("ascii") not in f.read()
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from modules.config_generator import ConfigGenerator
+from modules.password_generator import PasswordGenerator
+from modules.secure_derivation import SecureDerivation
+
+
+PBKDF2 = {"algorithm": "pbkdf2_sha256", "iterations": 1000}
+SCRYPT = {"algorithm": "scrypt", "n": 16, "r": 8, "p": 1}
+
+KEY_PHRASES = ["segredo", "Chave de segurança", "coração ñandú 123", "ÀÉÎõü ß"]
+ALPHABET = "abcXYZ019 .,!-_áéíçãõÁÇñß€😀\t"
+
+
+def random_text(rng, size):
+    return "".join(rng.choice(ALPHABET) for _ in range(size))
+
+
+@pytest.mark.parametrize("key_phrase", KEY_PHRASES)
+@pytest.mark.parametrize("kdf_params", [None, PBKDF2, SCRYPT], ids=["sha256", "pbkdf2", "scrypt"])
+def test_matches_password_generator(key_phrase, kdf_params):
+    rng = random.Random(f"{key_phrase}-{kdf_params}")
+    subst = ConfigGenerator(key_phrase).get_subst_dict()
+    for _ in range(40 if kdf_params is None else 8):
+        base_phrase = random_text(rng, rng.randint(1, 30))
+        salt = random_text(rng, rng.randint(0, 10))
+        pwd_length = rng.choice([4, 8, 16, 33, 64, 100])
+        extended_chars = rng.random() < 0.5
+
+        expected = PasswordGenerator(base_phrase, subst, salt, pwd_length, extended_chars,
+                                     kdf_params=kdf_params).generate_password()
+        with SecureDerivation(subst, pwd_length, extended_chars, kdf_params) as derivation:
+            assert derivation.derive(bytearray(base_phrase, "utf-8"), salt.encode("utf-8")).decode("ascii") == expected
+            assert derivation.derive(base_phrase, salt).decode("ascii") == expected
+
+
+def test_buffers_are_wiped_on_exit():
+    subst = ConfigGenerator("segredo").get_subst_dict()
+    base_phrase = bytearray("Minha frase secreta".encode("utf-8"))
+    with SecureDerivation(subst, 16, extended_chars=True) as derivation:
+        password = derivation.derive(base_phrase, b"sal")
+        tracked = list(derivation._buffers)
+        assert any(password)
+    assert not any(password)
+    assert all(not any(buffer) for buffer in tracked)
+    assert derivation._buffers == []
+    assert base_phrase == bytearray("Minha frase secreta".encode("utf-8"))  # O buffer do chamador é dele
+
+
+def test_buffers_are_wiped_on_error():
+    subst = ConfigGenerator("segredo").get_subst_dict()
+    with pytest.raises(RuntimeError):
+        with SecureDerivation(subst) as derivation:
+            password = derivation.derive("frase", "sal")
+            raise RuntimeError("falha")
+    assert not any(password)
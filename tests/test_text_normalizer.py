@@ -0,0 +1,40 @@
+import random
+import string
+import unicodedata
+
+import pytest
+
+from modules.text_normalizer import normalize_cached, normalize_text
+
+
+def original_normalize(text: str) -> str:
+    """Normalização original (NFKD em todo texto), da qual as senhas existentes dependem."""
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    text = text.lower()
+    text = ''.join(c for c in text if c.isalnum())
+    return text
+
+
+ASCII = string.printable + "\x00\x7f"
+UNICODE = "áàâãäéêíóôõúüçñÁÀÂÃÉÊÍÓÔÕÚÇÑßøÆœİﬁ²½①Ａｂ٣€—“”¿¡  ́😀中"
+
+
+@pytest.mark.parametrize("text", [
+    "", "Máximo Segurança!!", "Password123!", "ÇÃO", "São Paulo, 25/12/1990", "İstanbul", "Straße", "ﬁnal ²",
+])
+def test_known_phrases(text):
+    assert normalize_text(text) == original_normalize(text)
+    assert normalize_cached(text) == original_normalize(text)
+
+
+@pytest.mark.parametrize("alphabet", [ASCII, ASCII + UNICODE], ids=["ascii", "unicode"])
+def test_matches_original_on_random_text(alphabet):
+    rng = random.Random(alphabet)
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        assert normalize_text(text) == original_normalize(text), repr(text)
+
+
+def test_ascii_fast_path_covers_every_ascii_character():
+    for code in range(128):
+        assert normalize_text(chr(code) * 2) == original_normalize(chr(code) * 2)
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from modules.word_index import WordIndex, build_word_index, build_word_index_from_file
+
+
+WORDS = ["password", "pass", "dragon", "Senha", "coração", "passport", "a", "dragon", "zz", "ação"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "palavras.idx")
+    assert build_word_index(WORDS, path) == 9  # "dragon" repetida conta uma vez
+    index = WordIndex(path)
+    yield index
+    index.close()
+
+
+def test_rank_lookup(index):
+    assert index.rank("password") == 1
+    assert index.rank("PASS") == 2
+    assert index.rank("dragon") == 3  # A repetição mantém o primeiro rank
+    assert index.rank("senha") == 4
+    assert index.rank("coração") == 5
+    assert index.rank("ação") == 9
+    for missing in ("passwor", "passwords", "dragons", "b", "coraçao", ""):
+        assert index.rank(missing) is None
+
+
+def test_matches_from_returns_every_prefix_word(index):
+    assert index.matches_from("xpassports", 1) == [(5, 2), (9, 6)]
+    assert index.matches_from("password1", 0) == [(4, 2), (8, 1)]
+    assert index.matches_from("abc", 0) == [(1, 7)]
+    assert index.matches_from("abc", 3) == []
+
+
+def test_lookup_matches_a_linear_scan(tmp_path):
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcçé") for _ in range(rng.randint(1, 6))) for _ in range(2000)]
+    path = str(tmp_path / "aleatorio.idx")
+    build_word_index(words, path)
+    ranks = {}
+    for word in words:
+        ranks.setdefault(word, len(ranks) + 1)
+
+    index = WordIndex(path)
+    for _ in range(300):
+        text = "".join(rng.choice("abcçéx") for _ in range(10))
+        start = rng.randrange(len(text))
+        expected = [(end, ranks[text[start:end]]) for end in range(start + 1, len(text) + 1) if text[start:end] in ranks]
+        assert index.matches_from(text, start) == expected
+    index.close()
+
+
+def test_build_from_wordlist_file(tmp_path):
+    wordlist = tmp_path / "lista.txt"
+    wordlist.write_text("123456 1000\nsenha 900\n\nqwerty\n", encoding="utf-8")
+    path = str(tmp_path / "lista.idx")
+    assert build_word_index_from_file(str(wordlist), path) == 3
+    index = WordIndex(path)
+    assert [index.rank(word) for word in ("123456", "senha", "qwerty", "1000")] == [1, 2, 3, None]
+    index.close()
+
+
+def test_invalid_index_is_rejected(tmp_path):
+    empty = tmp_path / "vazio.idx"
+    empty.write_bytes(b"")
+    garbage = tmp_path / "lixo.idx"
+    garbage.write_bytes(b"isto nao e um indice de palavras")
+    for path in (empty, garbage):
+        with pytest.raises(ValueError):
+            WordIndex(str(path))